@@ -4,6 +4,8 @@ import os
 import json
 from datetime import datetime, timedelta
 
+from backend.scoring import COMPONENTS as SCORE_COMPONENTS
+
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 DB_PATH = os.path.join(BASE_DIR, "recruitment.db")
 UPLOADS_DIR = os.path.join(BASE_DIR, "uploads")
@@ -24,6 +26,12 @@ def get_conn():
     return conn
 
 
+def _ensure_column(cur, table, column, decl):
+    cur.execute(f"PRAGMA table_info({table})")
+    if column not in {r['name'] for r in cur.fetchall()}:
+        cur.execute(f"ALTER TABLE {table} ADD COLUMN {column} {decl}")
+
+
 def init_db():
     """
     Initialize database schema. Safe to call multiple times.
@@ -119,6 +127,62 @@ def init_db():
     )
     """)
 
+    # skill synonyms (canonical skill -> variants), see backend/synonyms.py
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS skill_synonyms (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        canonical TEXT NOT NULL,
+        variant TEXT NOT NULL UNIQUE,
+        updated_at TEXT
+    )
+    """)
+
+    # content-addressed resume files (see backend/uploads_store.py); refcount
+    # is the number of applications pointing at the blob
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS blobs (
+        sha256 TEXT PRIMARY KEY,
+        size INTEGER,
+        refcount INTEGER DEFAULT 0,
+        created_at TEXT
+    )
+    """)
+
+    # every version of a job's criteria (see update_job_criteria); summary is
+    # the before/after eligibility counts of re-screening under that version
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS job_criteria_history (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        job_id INTEGER,
+        version INTEGER,
+        criteria TEXT,
+        changed_by TEXT,
+        changed_at TEXT,
+        summary TEXT,
+        UNIQUE(job_id, version),
+        FOREIGN KEY(job_id) REFERENCES jobs(id) ON DELETE CASCADE
+    )
+    """)
+
+    # columns added after the first release
+    # criteria_version: jobs -> current version; applications -> version the
+    # stored screening was computed against (NULL = 1, the original criteria)
+    _ensure_column(cur, "jobs", "criteria_version", "INTEGER DEFAULT 1")
+    _ensure_column(cur, "applications", "criteria_version", "INTEGER")
+    _ensure_column(cur, "applications", "resume_sha256", "TEXT")
+    _ensure_column(cur, "applications", "resume_name", "TEXT")
+    # score weights per job ({component: weight} JSON, NULL = scoring.DEFAULT_WEIGHTS)
+    # and the stored score's component percentages per application
+    _ensure_column(cur, "jobs", "score_weights", "TEXT")
+    for c in SCORE_COMPONENTS:
+        _ensure_column(cur, "applications", f"score_{c}", "REAL")
+    # storage tier of a blob: codec NULL = plain file not yet considered,
+    # 'raw' = kept plain (didn't compress), otherwise the compression codec
+    _ensure_column(cur, "blobs", "codec", "TEXT")
+    _ensure_column(cur, "blobs", "stored_size", "INTEGER")
+    _ensure_column(cur, "blobs", "last_used_at", "TEXT")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_applications_resume_sha256 ON applications(resume_sha256)")
+
     conn.commit()
 
     # Normalize any pre-existing role values to lowercase/trim
@@ -220,6 +284,71 @@ def get_job(job_id):
     return dict(r) if r else None
 
 
+def update_job_criteria(job_id, criteria_dict, changed_by="Admin"):
+    """
+    Replace a job's criteria, bumping its criteria_version; every version is
+    kept in job_criteria_history. Returns (old_version, new_version).
+    """
+    now = datetime.utcnow().isoformat()
+    conn = get_conn()
+    cur = conn.cursor()
+    try:
+        cur.execute("SELECT * FROM jobs WHERE id=?", (job_id,))
+        job = cur.fetchone()
+        if not job or job['status'] == 'archived':
+            raise ValueError("Job not found or archived")
+        old_version = job['criteria_version'] or 1
+        # the version in use until now (the original criteria have no history row yet)
+        cur.execute("""INSERT OR IGNORE INTO job_criteria_history (job_id, version, criteria, changed_by, changed_at)
+                       VALUES (?, ?, ?, NULL, ?)""", (job_id, old_version, job['criteria'], job['created_at']))
+        new_version = old_version + 1
+        cur.execute("UPDATE jobs SET criteria=?, criteria_version=? WHERE id=?",
+                    (json.dumps(criteria_dict), new_version, job_id))
+        cur.execute("""INSERT INTO job_criteria_history (job_id, version, criteria, changed_by, changed_at)
+                       VALUES (?, ?, ?, ?, ?)""", (job_id, new_version, json.dumps(criteria_dict), changed_by, now))
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+    return old_version, new_version
+
+
+def get_job_criteria_history(job_id):
+    """All recorded criteria versions of a job, newest first."""
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute("SELECT * FROM job_criteria_history WHERE job_id=? ORDER BY version DESC", (job_id,))
+    rows = cur.fetchall()
+    conn.close()
+    return [dict(r) for r in rows]
+
+
+def set_criteria_change_summary(job_id, version, summary):
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute("UPDATE job_criteria_history SET summary=? WHERE job_id=? AND version=?",
+                (json.dumps(summary), job_id, version))
+    conn.commit()
+    conn.close()
+
+
+def get_outdated_criteria_applications(job_id, version, after_id=0, limit=100):
+    """
+    Screened, non-archived applications of a job (ascending id, > after_id)
+    whose result was computed against a criteria version other than `version`.
+    """
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute("""SELECT * FROM applications WHERE job_id=? AND status!='archived' AND id > ?
+                   AND parsed_json IS NOT NULL AND parsed_json != 'null' AND COALESCE(criteria_version, 1) != ?
+                   ORDER BY id LIMIT ?""", (job_id, after_id, version, limit))
+    rows = cur.fetchall()
+    conn.close()
+    return [dict(r) for r in rows]
+
+
 def update_job_status(job_id, status):
     conn = get_conn()
     cur = conn.cursor()
@@ -228,7 +357,7 @@ def update_job_status(job_id, status):
     conn.close()
 
 
-def insert_application(candidate_name, email, phone, job_id, resume_path):
+def insert_application(candidate_name, email, phone, job_id, resume_path, resume_sha256=None, resume_name=None):
     # check job capacity first
     job = get_job(job_id)
     if not job or job.get('status') == 'archived':
@@ -241,15 +370,63 @@ def insert_application(candidate_name, email, phone, job_id, resume_path):
     conn = get_conn()
     cur = conn.cursor()
     cur.execute("""INSERT INTO applications
-                   (candidate_name, email, phone, job_id, resume_path, parsed_json, score, eligible, status, created_at)
-                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                (candidate_name, email, phone, job_id, resume_path, json.dumps(None), None, 0, 'received', datetime.utcnow().isoformat()))
+                   (candidate_name, email, phone, job_id, resume_path, resume_sha256, resume_name, parsed_json, score, eligible, status, created_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                (candidate_name, email, phone, job_id, resume_path, resume_sha256, resume_name, json.dumps(None), None, 0, 'received', datetime.utcnow().isoformat()))
+    if resume_sha256:
+        _add_blob_ref(cur, resume_sha256)
     conn.commit()
     app_id = cur.lastrowid
     conn.close()
     return app_id
 
 
+def insert_applications_bulk(job_id, rows):
+    """
+    Insert already screened applications in one transaction (bulk ingestion).
+    rows: list of dicts with candidate_name, email, phone, resume_path, parsed, eligible, score
+    (and optionally resume_sha256, resume_name for files in the uploads store, and
+    criteria_version, the job criteria version they were screened against).
+    Rows beyond the job's max_applicants are not inserted.
+    Returns the list of new application ids (same order as the inserted rows).
+    """
+    if not rows:
+        return []
+    job = get_job(job_id)
+    if not job or job.get('status') == 'archived':
+        raise ValueError("Job not found or archived")
+    max_app = job.get('max_applicants')
+    if max_app not in (None, 0):
+        room = max(0, int(max_app) - int(count_active_applications(job_id)))
+        rows = rows[:room]
+    now = datetime.utcnow().isoformat()
+    conn = get_conn()
+    cur = conn.cursor()
+    ids = []
+    try:
+        for r in rows:
+            eligible = bool(r.get('eligible'))
+            score = r.get('score')
+            cur.execute(f"""INSERT INTO applications
+                           (candidate_name, email, phone, job_id, resume_path, resume_sha256, resume_name, parsed_json, score, eligible, status, criteria_version, created_at, {_SCORE_COLUMNS})
+                           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, {_SCORE_PLACEHOLDERS})""",
+                        (r.get('candidate_name'), r.get('email'), r.get('phone'), job_id, r.get('resume_path'),
+                         r.get('resume_sha256'), r.get('resume_name'),
+                         json.dumps(r.get('parsed')), float(score) if score is not None else None,
+                         1 if eligible else 0, 'shortlisted' if eligible else 'rejected', r.get('criteria_version'), now,
+                         *_score_components(r.get('parsed'))))
+            if r.get('resume_sha256'):
+                _add_blob_ref(cur, r['resume_sha256'])
+            ids.append(cur.lastrowid)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+    return ids
+
+
 def get_applications_by_job(job_id, include_archived=False):
     conn = get_conn()
     cur = conn.cursor()
@@ -271,14 +448,207 @@ def get_application(app_id):
     return dict(r) if r else None
 
 
-def update_application_parsed(app_id, parsed_dict, eligible, score, status=None):
+_SCORE_COLUMNS = ", ".join(f"score_{c}" for c in SCORE_COMPONENTS)
+_SCORE_PLACEHOLDERS = ", ".join("?" * len(SCORE_COMPONENTS))
+
+
+def _score_components(parsed_dict):
+    """Column values of parsed['score_components'] (NULLs when the parse has none)."""
+    comps = (parsed_dict or {}).get('score_components') or {}
+    return tuple(comps.get(c) for c in SCORE_COMPONENTS)
+
+
+def update_application_parsed(app_id, parsed_dict, eligible, score, status=None, criteria_version=None):
+    """criteria_version: job criteria version the result was computed against (None keeps the stored one)."""
+    update_applications_parsed_bulk([(app_id, parsed_dict, eligible, score, status, criteria_version)])
+
+
+def update_applications_parsed_bulk(rows):
+    """
+    Write several screening results in one transaction.
+    rows: (app_id, parsed_dict, eligible, score, status, criteria_version) tuples,
+    with the same meaning as update_application_parsed's arguments.
+    """
+    conn = get_conn()
+    cur = conn.cursor()
+    try:
+        cur.executemany("UPDATE applications SET parsed_json=?, eligible=?, score=?, status=?, "
+                        "criteria_version=COALESCE(?, criteria_version), "
+                        + ", ".join(f"score_{c}=?" for c in SCORE_COMPONENTS) + " WHERE id=?",
+                        [(json.dumps(parsed_dict), 1 if eligible else 0, float(score) if score is not None else None,
+                          status or ('shortlisted' if eligible else 'rejected'), criteria_version,
+                          *_score_components(parsed_dict), app_id)
+                         for app_id, parsed_dict, eligible, score, status, criteria_version in rows])
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+# ----------------------------
+# Resume blobs (content-addressed uploads store)
+# ----------------------------
+def _add_blob_ref(cur, sha256, n=1):
+    cur.execute("""INSERT INTO blobs (sha256, size, refcount, created_at) VALUES (?, NULL, ?, ?)
+                   ON CONFLICT(sha256) DO UPDATE SET refcount = refcount + excluded.refcount""",
+                (sha256, n, datetime.utcnow().isoformat()))
+
+
+def register_blob(sha256, size):
+    """Record a stored blob (refcount unchanged if it is already known) and mark it used now."""
+    now = datetime.utcnow().isoformat()
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute("""INSERT INTO blobs (sha256, size, refcount, created_at, last_used_at) VALUES (?, ?, 0, ?, ?)
+                   ON CONFLICT(sha256) DO UPDATE SET size = excluded.size, last_used_at = excluded.last_used_at""",
+                (sha256, int(size), now, now))
+    conn.commit()
+    conn.close()
+
+
+def set_blob_storage(sha256, codec, stored_size):
+    """Record how a blob is stored on disk (codec None = plain file, eligible for compression again)."""
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute("UPDATE blobs SET codec=?, stored_size=? WHERE sha256=?", (codec, stored_size, sha256))
+    conn.commit()
+    conn.close()
+
+
+def get_blobs_to_compress(used_before, after_sha="", limit=100):
+    """
+    Plain blobs that are cold: not used since `used_before` (ISO time), or
+    referenced only by archived applications. Ordered by sha256, > after_sha.
+    """
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute("""SELECT b.* FROM blobs b WHERE b.codec IS NULL AND b.refcount > 0 AND b.sha256 > ? AND (
+                       COALESCE(b.last_used_at, b.created_at) < ?
+                       OR NOT EXISTS (SELECT 1 FROM applications a
+                                      WHERE a.resume_sha256 = b.sha256 AND a.status != 'archived'))
+                   ORDER BY b.sha256 LIMIT ?""", (after_sha, used_before, limit))
+    rows = cur.fetchall()
+    conn.close()
+    return [dict(r) for r in rows]
+
+
+def get_blob(sha256):
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute("SELECT * FROM blobs WHERE sha256=?", (sha256,))
+    r = cur.fetchone()
+    conn.close()
+    return dict(r) if r else None
+
+
+def get_unreferenced_blobs(used_before):
+    """Blobs no application points at, last stored or re-uploaded before `used_before` (ISO time)."""
     conn = get_conn()
     cur = conn.cursor()
-    new_status = status or ('shortlisted' if eligible else 'rejected')
-    cur.execute("UPDATE applications SET parsed_json=?, eligible=?, score=?, status=? WHERE id=?",
-                (json.dumps(parsed_dict), 1 if eligible else 0, float(score) if score is not None else None, new_status, app_id))
+    cur.execute("SELECT * FROM blobs WHERE refcount <= 0 AND COALESCE(last_used_at, created_at) < ?", (used_before,))
+    rows = cur.fetchall()
+    conn.close()
+    return [dict(r) for r in rows]
+
+
+def delete_blob_if_unreferenced(sha256, used_before=None):
+    """
+    Drop the blob row if it is still unreferenced (and, with used_before, not
+    re-uploaded since); returns True if it was dropped.
+    """
+    conn = get_conn()
+    cur = conn.cursor()
+    if used_before is None:
+        cur.execute("DELETE FROM blobs WHERE sha256=? AND refcount <= 0", (sha256,))
+    else:
+        cur.execute("DELETE FROM blobs WHERE sha256=? AND refcount <= 0 AND COALESCE(last_used_at, created_at) < ?",
+                    (sha256, used_before))
+    dropped = cur.rowcount > 0
     conn.commit()
     conn.close()
+    return dropped
+
+
+def get_blob_stats():
+    """
+    Stored blobs: original bytes, bytes on disk, bytes saved by compression
+    and by deduplication.
+    """
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute("""SELECT COUNT(*) AS blobs, COALESCE(SUM(size), 0) AS bytes,
+                          COALESCE(SUM(COALESCE(stored_size, size)), 0) AS stored_bytes,
+                          COALESCE(SUM(CASE WHEN codec IS NOT NULL AND codec != 'raw' THEN 1 ELSE 0 END), 0) AS compressed,
+                          COALESCE(SUM(CASE WHEN codec IS NOT NULL AND codec != 'raw' THEN size - stored_size ELSE 0 END), 0) AS compression_saved_bytes,
+                          COALESCE(SUM(CASE WHEN refcount > 1 THEN (refcount - 1) * size ELSE 0 END), 0) AS dedup_bytes,
+                          COALESCE(SUM(CASE WHEN refcount <= 0 THEN 1 ELSE 0 END), 0) AS unreferenced
+                   FROM blobs""")
+    r = dict(cur.fetchone())
+    conn.close()
+    return r
+
+
+def get_legacy_upload_applications():
+    """Applications whose resume is still a plain file path (saved before the uploads store)."""
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute("SELECT * FROM applications WHERE resume_sha256 IS NULL AND resume_path IS NOT NULL ORDER BY id")
+    rows = cur.fetchall()
+    conn.close()
+    return [dict(r) for r in rows]
+
+
+def set_application_blob(app_id, resume_path, resume_sha256, resume_name):
+    """Point an application at a stored blob (takes a reference on it)."""
+    conn = get_conn()
+    cur = conn.cursor()
+    try:
+        cur.execute("UPDATE applications SET resume_path=?, resume_sha256=?, resume_name=? WHERE id=? AND resume_sha256 IS NULL",
+                    (resume_path, resume_sha256, resume_name, app_id))
+        if cur.rowcount:
+            _add_blob_ref(cur, resume_sha256)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+def get_partial_application_ids():
+    """Applications whose screening was cut short by the submit latency budget."""
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute("""SELECT id FROM applications WHERE status!='archived'
+                   AND json_extract(parsed_json, '$.partial') = 1 ORDER BY id""")
+    rows = cur.fetchall()
+    conn.close()
+    return [r['id'] for r in rows]
+
+
+def get_stale_application_ids(versions, after_id=0, limit=100, job_id=None):
+    """
+    Ids (ascending, > after_id) of non-archived applications whose
+    parsed_json['_versions'] differs from `versions` in any key, or that are
+    partial. Rows never screened (no parsed_json) are skipped.
+    """
+    conn = get_conn()
+    cur = conn.cursor()
+    conds = " OR ".join(f"json_extract(parsed_json, '$._versions.{k}') IS NOT ?" for k in versions)
+    sql = (f"SELECT id FROM applications WHERE status!='archived' AND parsed_json IS NOT NULL AND id > ? "
+           f"AND ({conds} OR json_extract(parsed_json, '$.partial') = 1)")
+    params = [after_id] + list(versions.values())
+    if job_id is not None:
+        sql += " AND job_id=?"
+        params.append(job_id)
+    sql += " ORDER BY id LIMIT ?"
+    params.append(limit)
+    cur.execute(sql, params)
+    rows = cur.fetchall()
+    conn.close()
+    return [r['id'] for r in rows]
 
 
 def count_active_applications(job_id):
@@ -291,6 +661,78 @@ def count_active_applications(job_id):
     return r['c'] if r else 0
 
 
+def set_job_score_weights(job_id, weights):
+    """Store a job's score weights ({component: weight}; None restores the defaults)."""
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute("UPDATE jobs SET score_weights=? WHERE id=?",
+                (json.dumps(weights) if weights is not None else None, job_id))
+    conn.commit()
+    conn.close()
+
+
+def get_score_components(job_id):
+    """
+    (ids, rows) for a job's non-archived applications with stored score
+    components: rows are tuples of the component percentages in
+    scoring.COMPONENTS order.
+    """
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute(f"""SELECT id, {_SCORE_COLUMNS} FROM applications
+                    WHERE job_id=? AND status!='archived' AND score_{SCORE_COMPONENTS[0]} IS NOT NULL""", (job_id,))
+    rows = cur.fetchall()
+    conn.close()
+    return [r[0] for r in rows], [tuple(r)[1:] for r in rows]
+
+
+def update_scores_bulk(rows):
+    """Write (app_id, score) pairs in one transaction."""
+    conn = get_conn()
+    cur = conn.cursor()
+    try:
+        cur.executemany("UPDATE applications SET score=? WHERE id=?", [(score, app_id) for app_id, score in rows])
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+def get_screening_fingerprints(job_id):
+    """
+    {app id: fingerprint} for a job's non-archived, screened applications, without
+    loading parsed_json. The fingerprint (criteria version, _versions, partial)
+    changes whenever the application is re-screened.
+    """
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute("""SELECT id, criteria_version, json_extract(parsed_json, '$._versions') AS versions,
+                          json_extract(parsed_json, '$.partial') AS partial
+                   FROM applications WHERE job_id=? AND status!='archived' AND parsed_json IS NOT NULL
+                   ORDER BY id""", (job_id,))
+    rows = cur.fetchall()
+    conn.close()
+    return {r['id']: (r['criteria_version'], r['versions'], r['partial']) for r in rows}
+
+
+def get_parsed_by_ids(app_ids, chunk_size=500):
+    """{app id: parsed dict} for the given applications (unscreened ones are left out)."""
+    out = {}
+    app_ids = list(app_ids)
+    conn = get_conn()
+    cur = conn.cursor()
+    for i in range(0, len(app_ids), chunk_size):
+        chunk = app_ids[i:i + chunk_size]
+        cur.execute(f"SELECT id, parsed_json FROM applications WHERE parsed_json IS NOT NULL "
+                    f"AND id IN ({','.join('?' * len(chunk))})", chunk)
+        for r in cur.fetchall():
+            out[r['id']] = json.loads(r['parsed_json'])
+    conn.close()
+    return out
+
+
 # ----------------------------
 # Archive (soft-delete) operations
 # ----------------------------
@@ -484,4 +926,73 @@ def get_setting(key):
 def delete_setting(key):
     conn = get_conn(); cur = conn.cursor()
     cur.execute("DELETE FROM settings WHERE key=?", (key,))
-    conn.commit(); conn.close()
\ No newline at end of file
+    conn.commit(); conn.close()
+
+
+# ----------------------------
+# Skill synonyms
+# ----------------------------
+SYNONYMS_VERSION_KEY = "skill_synonyms_version"
+
+
+def _bump_synonyms_version(cur):
+    now = datetime.utcnow().isoformat()
+    cur.execute("""
+        INSERT INTO settings (key, value, updated_at) VALUES (?, '1', ?)
+        ON CONFLICT(key) DO UPDATE SET value=CAST(CAST(value AS INTEGER) + 1 AS TEXT), updated_at=excluded.updated_at
+    """, (SYNONYMS_VERSION_KEY, now))
+
+
+def get_synonyms_version():
+    """Current synonym table version, or None if the table was never populated."""
+    v = get_setting(SYNONYMS_VERSION_KEY)
+    return int(v) if v is not None else None
+
+
+def get_skill_synonyms():
+    """Return ({canonical: [variants]}, version) read in one transaction."""
+    conn = get_conn(); cur = conn.cursor()
+    cur.execute("SELECT canonical, variant FROM skill_synonyms ORDER BY canonical, id")
+    rows = cur.fetchall()
+    cur.execute("SELECT value FROM settings WHERE key=?", (SYNONYMS_VERSION_KEY,))
+    v = cur.fetchone()
+    conn.close()
+    out = {}
+    for r in rows:
+        out.setdefault(r['canonical'], []).append(r['variant'])
+    return out, (int(v['value']) if v else None)
+
+
+def replace_skill_synonyms(groups):
+    """
+    Insert or replace synonym groups {canonical: [variants]} and bump the
+    version. A variant that already belongs to another canonical skill raises
+    ValueError (nothing is written).
+    """
+    conn = get_conn(); cur = conn.cursor()
+    now = datetime.utcnow().isoformat()
+    try:
+        for canonical, variants in groups.items():
+            cur.execute("DELETE FROM skill_synonyms WHERE canonical=?", (canonical,))
+            for v in dict.fromkeys(variants):
+                cur.execute("SELECT canonical FROM skill_synonyms WHERE variant=?", (v,))
+                other = cur.fetchone()
+                if other:
+                    raise ValueError(f"'{v}' is already a synonym of '{other['canonical']}'")
+                cur.execute("INSERT INTO skill_synonyms (canonical, variant, updated_at) VALUES (?, ?, ?)",
+                            (canonical, v, now))
+        _bump_synonyms_version(cur)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+def delete_skill_synonyms(canonical):
+    conn = get_conn(); cur = conn.cursor()
+    cur.execute("DELETE FROM skill_synonyms WHERE canonical=?", (canonical,))
+    _bump_synonyms_version(cur)
+    conn.commit(); conn.close()
+
@@ -0,0 +1,38 @@
+# backend/deadline.py
+"""
+Latency budget shared by the screening stages.
+
+A Deadline is created once per request (e.g. a candidate submit) and handed to
+parse_resume / check_eligibility. Stages run in order of cost, and the expensive
+ones (spaCy phrase matching, fuzzy matching) check expired() first: when the
+budget is spent they are skipped and the result is marked partial, to be
+completed later in the background.
+"""
+import time
+
+
+class Deadline:
+    __slots__ = ("budget_s", "expires_at")
+
+    def __init__(self, budget_s=None):
+        self.budget_s = budget_s
+        self.expires_at = None if budget_s is None else time.monotonic() + float(budget_s)
+
+    @classmethod
+    def coerce(cls, budget):
+        """Accept a Deadline, a budget in seconds, or None (no limit)."""
+        if isinstance(budget, Deadline):
+            return budget
+        return cls(budget)
+
+    def remaining(self):
+        if self.expires_at is None:
+            return float("inf")
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self):
+        return self.expires_at is not None and time.monotonic() >= self.expires_at
+
+
+# no budget; never expires
+UNLIMITED = Deadline()
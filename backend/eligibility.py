@@ -1,7 +1,16 @@
 # backend/eligibility.py
 import re
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+import numpy as np
 from rapidfuzz import process, fuzz
 
+from backend.deadline import Deadline, UNLIMITED
+from backend import synonyms
+
 # Conservative degree equivalence by level (we do NOT equate Bachelor -> Master)
 DEGREE_LEVELS = {
     "phd": 3,
@@ -20,57 +29,85 @@ DEGREE_EQUIVALENCE = {
     # add more domain mappings as required
 }
 
-# Skill synonyms (canonical -> variants)
-SKILL_SYNONYMS = {
-    "javascript": ["js", "java script"],
-    "react": ["react.js", "reactjs", "react js"],
-    "tailwindcss": ["tailwind", "tailwind css", "tailwind.css"],
-    "pocketbase": ["pocket base"],
-    "firebase": ["google firebase"],
-    "git": ["github", "gitlab", "version control"],
-    "python": ["py"]
-}
+# Skill synonyms come from the shared registry (backend/synonyms.py)
+
+# bump whenever eligibility rules/thresholds change
+ELIGIBILITY_VERSION = "1"
 
 # Minimums/thresholds
 FUZZY_THRESHOLD = 82           # Slightly stricter fuzzy threshold
 MIN_TOKEN_LEN_FOR_FUZZY = 4   # tokens shorter than this require exact/phrase match
 BLACKLIST_TOKENS = {"icse","cbse","class","school","all","grade","section","board","roll"}  # obvious non-skill tokens
 
+# check_eligibility modes: "full" explains every requirement (detail views,
+# scoring); "triage" stops at the first unmet hard requirement (bulk screening)
+MODES = ("full", "triage")
+
+# compiled criteria kept per job (LRU)
+CRITERIA_CACHE_SIZE = 64
+# candidates per score matrix in check_eligibility_batch (bounds its memory)
+BATCH_CHUNK = 1000
+
+_NON_TOKEN_RE = re.compile(r'[^a-z0-9\.\+\# ]')
+_SPACES_RE = re.compile(r'\s+')
+_COMPACT_RE = re.compile(r'[\s\.]+')
+# Degree level patterns in priority order: the DEGREE_LEVELS keys (dict order),
+# then the master / bachelor / doctor heuristics. A string's level is that of
+# the first pattern in this list that matches anywhere in it.
+_DEGREE_LEVEL_PATTERNS = [(re.escape(key), lvl) for key, lvl in DEGREE_LEVELS.items()] + [
+    (r'm\.?tech|master|ms|m.sc|m\.?e', 2),
+    (r'b\.?tech|btech|bachelor|b\.?des|bdes|b\.?sc', 1),
+    (r'ph\.?|phd|doctor', 3),
+]
+# ...compiled into one alternation (one capturing group per pattern, in that
+# order) inside a lookahead, so every word boundary is tried without consuming
+# text: at each position the first matching pattern is reported and the lowest
+# group number over all positions is the winner.
+_DEGREE_LEVEL_RE = re.compile(r'\b(?=' + '|'.join(f'({p})\\b' for p, _ in _DEGREE_LEVEL_PATTERNS) + ')')
+_DEGREE_LEVEL_BY_GROUP = [0] + [lvl for _, lvl in _DEGREE_LEVEL_PATTERNS]
+# distinct degree strings remembered by the classifier
+DEGREE_CACHE_SIZE = 4096
+
 def _normalize_text(s):
     if not s:
         return ""
     s = s.lower().strip()
-    s = re.sub(r'[^a-z0-9\.\+\# ]', ' ', s)
-    s = re.sub(r'\s+', ' ', s)
+    s = _NON_TOKEN_RE.sub(' ', s)
+    s = _SPACES_RE.sub(' ', s)
     return s
 
 def _compact(s):
-    return re.sub(r'[\s\.]+', '', _normalize_text(s))
+    return _COMPACT_RE.sub('', _normalize_text(s))
+
+@lru_cache(maxsize=DEGREE_CACHE_SIZE)
+def _classify_degree(s):
+    """
+    (normalized text, level) of a degree string in one scan; memoized, degree
+    strings repeat a lot. The subject side is not classified here: a required
+    degree's canonical subject tokens (_degree_subtokens) are computed once
+    per job in CompiledCriteria and matched against the normalized text.
+    """
+    t = _normalize_text(s)
+    best = None
+    for m in _DEGREE_LEVEL_RE.finditer(t):
+        if best is None or m.lastindex < best:
+            best = m.lastindex
+            if best == 1:
+                break
+    return t, _DEGREE_LEVEL_BY_GROUP[best or 0]
 
 def _get_degree_level_from_string(s):
     """Return numeric level (0 none, 1 bachelor, 2 master, 3 phd)"""
     if not s:
         return 0
-    t = _normalize_text(s)
-    for key, lvl in DEGREE_LEVELS.items():
-        if re.search(r'\b' + re.escape(key) + r'\b', t):
-            return lvl
-    # heuristics: if contains 'm' and 'tech' assume master
-    if re.search(r'\b(m(\.?)tech|master|ms|m.sc|m\.?e)\b', t):
-        return 2
-    if re.search(r'\b(b(\.?)tech|btech|bachelor|b\.?des|bdes|b\.?sc)\b', t):
-        return 1
-    if re.search(r'\b(ph\.?|phd|doctor)\b', t):
-        return 3
-    return 0
-
-def _subject_matches(req_subject, parsed_degrees_list):
-    """
-    Conservative subject matching for degrees.
-    req_subject: string (e.g. 'M.tech Mechanical Engineering')
-    parsed_degrees_list: list of parsed degree phrases from the resume
-    Returns: (matched_bool, matched_phrase, score, method)
-    """
+    return _classify_degree(s)[1]
+
+@lru_cache(maxsize=DEGREE_CACHE_SIZE)
+def _subject_score(req_sub, d_norm):
+    return fuzz.partial_ratio(req_sub, d_norm)
+
+def _degree_subtokens(req_subject):
+    """Subject tokens of a required degree (e.g. 'M.tech Mechanical Engineering' -> ['mechanical'])."""
     req_norm = _normalize_text(req_subject or "")
     # try to extract required subject token (e.g., 'mechanical engineering' -> 'mechanical')
     # look for known equivalences first
@@ -90,40 +127,49 @@ def _subject_matches(req_subject, parsed_degrees_list):
         if parts:
             # take first substantive token
             req_subtokens.append(parts[0])
+    return req_subtokens
+
+def _subject_matches(req_subject, parsed_degrees_list, allow_fuzzy=True, req_subtokens=None):
+    """
+    Conservative subject matching for degrees.
+    req_subject: string (e.g. 'M.tech Mechanical Engineering')
+    parsed_degrees_list: list of parsed degree phrases from the resume
+    allow_fuzzy: False skips the fuzzy step (method "deadline" if it would have run)
+    req_subtokens: precomputed _degree_subtokens(req_subject) (see CompiledCriteria)
+    Returns: (matched_bool, matched_phrase, score, method)
+    """
+    if req_subtokens is None:
+        req_subtokens = _degree_subtokens(req_subject)
 
-    parsed_norm = [_normalize_text(d) for d in (parsed_degrees_list or [])]
+    parsed_norm = [_classify_degree(d)[0] if d else "" for d in (parsed_degrees_list or [])]
     # exact/substring match first
     for d_orig, d_norm in zip(parsed_degrees_list or [], parsed_norm):
         for req_sub in req_subtokens:
             if req_sub and (req_sub in d_norm or d_norm in req_sub):
                 return True, d_orig, 100.0, "exact"
     # fuzzy match if parsed degrees exist and required subject token not too short
-    if parsed_norm and req_subtokens:
+    if parsed_norm and req_subtokens and not allow_fuzzy:
+        if any(len(req_sub) >= 3 for req_sub in req_subtokens):
+            return False, None, 0.0, "deadline"
+    elif parsed_norm and req_subtokens:
         for req_sub in req_subtokens:
             if len(req_sub) < 3:
                 continue
-            # use partial ratio
-            best = process.extractOne(req_sub, parsed_norm, scorer=fuzz.partial_ratio)
-            if best and best[1] >= FUZZY_THRESHOLD:
+            # use partial ratio (pairs memoized; the first best wins, as with extractOne)
+            scores = [_subject_score(req_sub, d_norm) for d_norm in parsed_norm]
+            best = max(scores)
+            if best >= FUZZY_THRESHOLD:
                 # find the original phrase
+                best_norm = parsed_norm[scores.index(best)]
                 for d_orig, d_norm in zip(parsed_degrees_list or [], parsed_norm):
-                    if d_norm == best[0]:
-                        return True, d_orig, float(best[1]), "fuzzy"
+                    if d_norm == best_norm:
+                        return True, d_orig, float(best), "fuzzy"
     return False, None, 0.0, "none"
 
-def _variants_for_skill(skill):
+def _variants_for_skill(skill, index=None):
     """List of normalized variants for a required skill (canonical + synonyms)."""
-    k = _normalize_text(skill)
-    variants = [k]
-    if k in SKILL_SYNONYMS:
-        variants += SKILL_SYNONYMS[k]
-    # compact and normalized unique
-    seen = []
-    for v in variants:
-        nv = _normalize_text(v)
-        if nv not in seen:
-            seen.append(nv)
-    return seen
+    index = index or synonyms.get_index()
+    return list(index.variants_for(skill)) or [_normalize_text(skill)]
 
 def _is_blacklisted(token):
     if not token:
@@ -131,42 +177,361 @@ def _is_blacklisted(token):
     t = _normalize_text(token)
     return any(t == b or b in t for b in BLACKLIST_TOKENS)
 
-def _fuzzy_match_skill(variants, parsed_skills):
+# ---------- Fuzzy prefilter ----------
+# partial_ratio aligns the shorter string (length m) with windows w of the
+# longer one and scores each as 200*LCS/(m+|w|). The LCS can't exceed C, the
+# characters the two strings share (counted with multiplicity), so no window
+# beats 200*C/(m+C): a pair can only reach FUZZY_THRESHOLD T if
+# C*(200-T) >= T*m. Tokens failing that are never sent to rapidfuzz. Setting
+# up the counts costs about as much as scanning a short list, so candidates
+# with fewer than PREFILTER_MIN_TOKENS skill tokens are simply scanned.
+PREFILTER_MIN_TOKENS = 16
+_CHAR_ALPHABET = "abcdefghijklmnopqrstuvwxyz0123456789+#"
+_N_CHAR_COLS = len(_CHAR_ALPHABET) + 1
+
+
+class _CharColumns(dict):
+    """str.translate table: character -> count column. Every other character
+    shares the last column, which can only overestimate C."""
+
+    def __missing__(self, code):
+        return _N_CHAR_COLS - 1
+
+
+_CHAR_COLS = _CharColumns((ord(c), i) for i, c in enumerate(_CHAR_ALPHABET))
+
+
+def _char_counts(tokens):
+    """Character count matrix (one row per token) and token lengths."""
+    lens = np.fromiter(map(len, tokens), dtype=np.intp, count=len(tokens))
+    cols = np.frombuffer("".join(tokens).translate(_CHAR_COLS).encode("latin-1"), dtype=np.uint8)
+    rows = np.repeat(np.arange(len(tokens)) * _N_CHAR_COLS, lens)
+    counts = np.bincount(rows + cols, minlength=len(tokens) * _N_CHAR_COLS)
+    return counts.reshape(len(tokens), _N_CHAR_COLS), lens
+
+
+class _FuzzyVariants:
+    """Fuzzy variants with their character counts (a job's are built once, in CompiledCriteria)."""
+    __slots__ = ("row", "counts", "lens")
+
+    def __init__(self, variants):
+        variants = list(dict.fromkeys(variants))
+        self.row = {v: i for i, v in enumerate(variants)}
+        self.counts, self.lens = _char_counts(variants)
+
+
+class _FuzzyIndex:
+    """
+    A candidate's compact tokens with, for every fuzzy variant of the job, the
+    tokens that pass the bound above. The bound is worked out for all variants
+    in one step on the first fuzzy lookup; most skills match exactly and never
+    need it.
+    """
+    __slots__ = ("tokens", "variants", "_bound")
+
+    def __init__(self, tokens, variants):
+        self.tokens = tokens
+        self.variants = variants
+        self._bound = None
+
+    def candidates(self, variant):
+        """Positions of the tokens that can reach FUZZY_THRESHOLD against variant, in order."""
+        if self._bound is None:
+            counts, lens = _char_counts(self.tokens)
+            common = np.minimum(counts[None, :, :], self.variants.counts[:, None, :]).sum(axis=2)
+            self._bound = common * (200 - FUZZY_THRESHOLD) >= FUZZY_THRESHOLD * np.minimum(
+                lens[None, :], self.variants.lens[:, None])
+        return np.flatnonzero(self._bound[self.variants.row[variant]]).tolist()
+
+    def best(self, variant):
+        """extractOne(variant, tokens, partial_ratio), skipping tokens that can't reach FUZZY_THRESHOLD."""
+        keep = self.candidates(variant)
+        if not keep:
+            return None
+        try:
+            match = process.extractOne(variant, [self.tokens[i] for i in keep], scorer=fuzz.partial_ratio)
+        except Exception:
+            return None
+        # order is kept, so ties still resolve to the first token like a full scan
+        return (match[0], match[1], keep[match[2]]) if match else None
+
+
+def _fuzzy_match_skill(variants, parsed_skills, allow_fuzzy=True):
     """
     Return matched_token, score (0-100) or (None,0).
     Variants: list of normalized variant strings for required skill.
     parsed_skills: list of normalized skill tokens extracted from resume.
+    allow_fuzzy: False stops after the exact step (method "deadline").
     """
     parsed = parsed_skills or []
     parsed_compact = [_compact(p) for p in parsed]
+    fuzzy_variants = [v for v in (_COMPACT_RE.sub('', v) for v in variants) if len(v) >= MIN_TOKEN_LEN_FOR_FUZZY]
+    best_fuzzy = None
+    if len(parsed_compact) >= PREFILTER_MIN_TOKENS:
+        best_fuzzy = _FuzzyIndex(parsed_compact, _FuzzyVariants(fuzzy_variants)).best
+    return _match_variants([_compact(v) for v in variants], fuzzy_variants, parsed_compact, set(parsed_compact),
+                           allow_fuzzy, best_fuzzy)
 
+def _match_variants(variants_compact, fuzzy_variants, parsed_compact, parsed_compact_set, allow_fuzzy=True,
+                    best_fuzzy=None):
+    """
+    _fuzzy_match_skill on precomputed forms (per job: variants; per candidate: parsed tokens).
+    best_fuzzy(variant) -> extractOne-style (token, score, index) or None, e.g. a
+    lookup into a precomputed score matrix or _FuzzyIndex.best; default runs extractOne.
+    """
     # exact/compact match first
-    for v in variants:
-        v_comp = _compact(v)
-        if v_comp in parsed_compact:
+    for v_comp in variants_compact:
+        if v_comp in parsed_compact_set:
             return v_comp, 100.0, "exact"
+    if not allow_fuzzy:
+        return None, 0.0, "deadline"
 
     # try fuzzy only if variant length sufficient (> min)
-    for v in variants:
-        v_clean = re.sub(r'[\s\.]+', '', v)
-        if len(v_clean) < MIN_TOKEN_LEN_FOR_FUZZY:
-            continue
+    for v_clean in fuzzy_variants:
         # attempt fuzzy against parsed_compact
-        try:
-            match = process.extractOne(v_clean, parsed_compact, scorer=fuzz.partial_ratio)
-        except Exception:
-            match = None
+        if best_fuzzy is not None:
+            match = best_fuzzy(v_clean)
+        else:
+            try:
+                match = process.extractOne(v_clean, parsed_compact, scorer=fuzz.partial_ratio)
+            except Exception:
+                match = None
         if match and match[1] >= FUZZY_THRESHOLD:
             return match[0], float(match[1]), "fuzzy"
 
     return None, 0.0, "none"
 
-def check_eligibility(parsed_resume, criteria, debug=False):
+# ---------- Compiled criteria (cached per job) ----------
+class CompiledSkill:
+    """A job skill with everything the matcher needs precomputed."""
+    __slots__ = ("skill", "variants", "variants_compact", "fuzzy_variants", "compact")
+
+    def __init__(self, skill, index):
+        self.skill = skill
+        self.variants = tuple(_variants_for_skill(skill, index))
+        self.variants_compact = tuple(_compact(v) for v in self.variants)
+        # variants long enough for fuzzy matching, in variant order
+        self.fuzzy_variants = tuple(v for v in (_COMPACT_RE.sub('', v) for v in self.variants)
+                                    if len(v) >= MIN_TOKEN_LEN_FOR_FUZZY)
+        # for the loose substring fallback
+        self.compact = _compact(skill)
+
+
+class CompiledCriteria:
+    """
+    A job's criteria in matcher-ready form: thresholds, the required degree's
+    level and subject tokens, and every skill's variants and compact forms.
+    Depends only on the criteria and the synonym table, so it is built once per
+    job and shared by every candidate checked against it.
+    """
+    __slots__ = ("key", "min_experience", "min_publications", "required_degree", "degree_level",
+                 "degree_subtokens", "required", "optional", "fuzzy")
+
+    def __init__(self, key, criteria, index):
+        self.key = key
+        self.min_experience = criteria.get("min_experience", 0) or 0
+        self.min_publications = criteria.get("min_publications", 0) or 0
+        self.required_degree = criteria.get("required_degree")
+        self.degree_level = _get_degree_level_from_string(self.required_degree)
+        self.degree_subtokens = tuple(_degree_subtokens(self.required_degree or ""))
+        self.required = tuple(CompiledSkill(s, index) for s in (criteria.get("required_skills", []) or []))
+        self.optional = tuple(CompiledSkill(s, index) for s in (criteria.get("optional_skills", []) or []))
+        self.fuzzy = _FuzzyVariants(v for cs in self.required + self.optional for v in cs.fuzzy_variants)
+
+
+_criteria_cache = OrderedDict()
+_criteria_lock = threading.Lock()
+_criteria_stats = {"hits": 0, "misses": 0}
+
+
+def _criteria_key(criteria, synonyms_version):
+    payload = json.dumps([criteria, synonyms_version, ELIGIBILITY_VERSION], sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def compile_criteria(criteria):
+    """
+    Return the cached CompiledCriteria for a job's criteria (dict or its JSON
+    string), building it on first use (LRU). A synonym edit changes the key.
+    """
+    if isinstance(criteria, CompiledCriteria):
+        return criteria
+    if isinstance(criteria, str):
+        criteria = json.loads(criteria) if criteria else {}
+    criteria = criteria or {}
+    index = synonyms.get_index()
+    key = _criteria_key(criteria, index.version)
+    with _criteria_lock:
+        cached = _criteria_cache.get(key)
+        if cached is not None:
+            _criteria_cache.move_to_end(key)
+            _criteria_stats["hits"] += 1
+            return cached
+        _criteria_stats["misses"] += 1
+    compiled = CompiledCriteria(key, criteria, index)
+    with _criteria_lock:
+        _criteria_cache[key] = compiled
+        while len(_criteria_cache) > CRITERIA_CACHE_SIZE:
+            _criteria_cache.popitem(last=False)
+    return compiled
+
+
+def criteria_cache_info():
+    with _criteria_lock:
+        return {**_criteria_stats, "size": len(_criteria_cache), "max_size": CRITERIA_CACHE_SIZE}
+
+
+def check_eligibility(parsed_resume, criteria, debug=False, budget_s=None, mode="full"):
     """
     parsed_resume: dict from resume_parser.parse_resume
     criteria: dict with min_experience, min_publications, required_degree, required_skills, optional_skills
+              (or its JSON string, or a CompiledCriteria from compile_criteria)
+    budget_s: optional latency budget (seconds or a Deadline shared with the parse). Cheap
+              checks always run; once it has run out fuzzy matching is skipped and
+              match_info gets partial=True (a later unbudgeted run completes it).
+    mode: "full" (default) evaluates and explains every requirement; "triage"
+          checks hard requirements cheapest first and stops at the first failure
+          (same eligible decision, one reason, match_info marked triage=True).
     Returns: eligible(bool), reasons(list), match_info(dict)
     """
+    return _evaluate(parsed_resume, compile_criteria(criteria), Deadline.coerce(budget_s), debug, mode=mode)
+
+
+def check_eligibility_batch(parsed_resumes, criteria, debug=False, workers=-1, mode="full"):
+    """
+    check_eligibility for many candidates against one job, returning the same
+    (eligible, reasons, match_info) per candidate. Fuzzy skill matching is one
+    rapidfuzz cdist per BATCH_CHUNK candidates (every fuzzy-eligible job variant
+    x every distinct candidate token, on `workers` threads) instead of an
+    extractOne per skill variant per candidate; each candidate then reads its
+    best match off the matrix with the same first-best tie rule as extractOne.
+    No latency budget: meant for bulk and background screening. A candidate
+    whose check raises gets the exception in its slot instead of the tuple, so
+    one bad parse doesn't fail the batch.
+    """
+    _check_mode(mode)
+    cc = compile_criteria(criteria)
+    rows = list(dict.fromkeys(v for cs in cc.required + cc.optional for v in cs.fuzzy_variants))
+    row_of = {v: i for i, v in enumerate(rows)}
+    results = []
+    for start in range(0, len(parsed_resumes), BATCH_CHUNK):
+        chunk = parsed_resumes[start:start + BATCH_CHUNK]
+        compacts = []
+        for p in chunk:
+            try:
+                compacts.append([_compact(x) for x in (p.get("skills", []) or [])])
+            except Exception as e:
+                compacts.append(e)
+        col_of = {}
+        for tokens in compacts:
+            if isinstance(tokens, Exception):
+                continue
+            for t in tokens:
+                if t not in col_of:
+                    col_of[t] = len(col_of)
+        scores = None
+        if rows and col_of:
+            scores = process.cdist(rows, list(col_of), scorer=fuzz.partial_ratio, score_cutoff=FUZZY_THRESHOLD,
+                                   dtype=np.float64, workers=workers)
+        for p, tokens in zip(chunk, compacts):
+            try:
+                if isinstance(tokens, Exception):
+                    # unusable skills: check it on its own, which raises the same
+                    # way (or, in triage mode, may stop before reaching the skills)
+                    results.append(_evaluate(p, cc, UNLIMITED, debug, mode=mode))
+                    continue
+                best = None
+                if scores is not None and tokens:
+                    best = _matrix_lookup(scores, row_of, [col_of[t] for t in tokens], tokens)
+                results.append(_evaluate(p, cc, UNLIMITED, debug, parsed_compact=tokens, best_fuzzy=best, mode=mode))
+            except Exception as e:
+                results.append(e)
+    return results
+
+
+def _matrix_lookup(scores, row_of, cols, tokens):
+    """best_fuzzy for one candidate: its columns of the batch score matrix."""
+    def best(variant):
+        row = scores[row_of[variant], cols]
+        j = int(row.argmax())  # first best, like extractOne
+        return tokens[j], float(row[j]), j
+    return best
+
+
+def check_eligibility_incremental(parsed_resume, match_info, old_criteria, criteria, debug=False):
+    """
+    check_eligibility(parsed_resume, criteria) for a candidate whose stored
+    match_info came from a full, complete check against old_criteria with the
+    current synonyms and eligibility version (the caller checks the version
+    stamp). The degree-subject match and per-skill results whose inputs didn't
+    change are reused; only new skills, skills moved between required and
+    optional and a changed degree subject are matched again, and the
+    thresholds are re-compared. Falls back to a full check when match_info
+    can't be reused (triage or partial results). No latency budget.
+    """
+    cc = compile_criteria(criteria)
+    prior = _reusable_results(match_info, compile_criteria(old_criteria))
+    return _evaluate(parsed_resume, cc, UNLIMITED, debug, prior=prior)
+
+
+def _reusable_results(match_info, old_cc):
+    """Previous results keyed by what they depend on, for _evaluate(prior=...)."""
+    if not match_info or match_info.get("triage") or match_info.get("partial"):
+        return None
+    prior = {"required": {}, "optional": {}}
+    deg = match_info.get("degree") or {}
+    if deg:
+        # the subject match depends only on the subject tokens; "matched" is
+        # forced False when the level check failed, the method is not
+        prior["degree"] = (old_cc.degree_subtokens, (deg.get("method") in ("exact", "fuzzy"), deg.get("matched_with"),
+                                                     deg.get("score"), deg.get("method")))
+    matched = match_info.get("matched_required") or {}
+    missing = set(match_info.get("missing_required") or [])
+    for cs in old_cc.required:
+        if cs.skill in matched:
+            prior["required"][cs.skill] = matched[cs.skill]
+        elif cs.skill in missing:
+            prior["required"][cs.skill] = None
+    matched = match_info.get("matched_optional") or {}
+    for cs in old_cc.optional:
+        prior["optional"][cs.skill] = matched.get(cs.skill)
+    return prior
+
+
+def _check_mode(mode):
+    if mode not in MODES:
+        raise ValueError(f"Unknown eligibility mode: {mode!r} (expected one of {', '.join(MODES)})")
+
+
+def _loose_match(r_comp, parsed_compact, min_len=0):
+    """Last-ditch substring match of a skill's compact form against the candidate's tokens."""
+    for p in parsed_compact:
+        if p and (r_comp in p or p in r_comp) and not _is_blacklisted(p) and len(p) >= min_len:
+            return p
+    return None
+
+
+def _filter_match(matched_token, score, method):
+    """Drop blacklisted matches and fuzzy matches on too-short tokens (required skills)."""
+    if matched_token:
+        if _is_blacklisted(matched_token):
+            return None, 0.0, "blacklisted"
+        # ensure token length reasonable for fuzzy matches
+        if method == "fuzzy" and len(matched_token) < MIN_TOKEN_LEN_FOR_FUZZY:
+            return None, 0.0, "too_short"
+    return matched_token, score, method
+
+
+def _evaluate(parsed_resume, cc, deadline, debug=False, parsed_compact=None, best_fuzzy=None, mode="full",
+              prior=None):
+    """
+    check_eligibility body on compiled criteria (shared by the single, batch and
+    incremental paths). prior: reusable earlier results (see _reusable_results).
+    """
+    _check_mode(mode)
+    if mode == "triage":
+        return _triage(parsed_resume, cc, deadline, debug, parsed_compact, best_fuzzy)
+    partial_stages = []
     reasons = []
     eligible = True
     match_info = {
@@ -178,7 +543,7 @@ def check_eligibility(parsed_resume, criteria, debug=False):
     }
 
     # Experience check
-    min_exp = criteria.get("min_experience", 0) or 0
+    min_exp = cc.min_experience
     found_exp = parsed_resume.get("experience_years", 0) or 0
     if found_exp < min_exp:
         eligible = False
@@ -186,7 +551,7 @@ def check_eligibility(parsed_resume, criteria, debug=False):
     match_info["experience"] = {"required": min_exp, "found": found_exp}
 
     # Publications
-    min_pubs = criteria.get("min_publications", 0) or 0
+    min_pubs = cc.min_publications
     found_pubs = parsed_resume.get("publications", 0) or 0
     if found_pubs < min_pubs:
         eligible = False
@@ -194,80 +559,83 @@ def check_eligibility(parsed_resume, criteria, debug=False):
     match_info["publications"] = {"required": min_pubs, "found": found_pubs}
 
     # Degree: enforce level before subject
-    req_deg = criteria.get("required_degree")
-    deg_required_level = _get_degree_level_from_string(req_deg)
+    req_deg = cc.required_degree
+    deg_required_level = cc.degree_level
     parsed_degrees = parsed_resume.get("degrees", []) or []
-    parsed_levels = [_get_degree_level_from_string(d) for d in parsed_degrees]
+    # subject match is needed in every case (for the decision, or for debug)
+    if prior and prior.get("degree") and prior["degree"][0] == cc.degree_subtokens:
+        deg_matched, deg_phrase, deg_score, deg_method = prior["degree"][1]
+    else:
+        deg_matched, deg_phrase, deg_score, deg_method = _subject_matches(
+            req_deg or "", parsed_degrees, not deadline.expired(), req_subtokens=cc.degree_subtokens)
     # If no req level explicit, require only subject match
     if deg_required_level == 0:
-        # only subject match
-        deg_matched, deg_phrase, deg_score, deg_method = _subject_matches(req_deg or "", parsed_degrees)
         match_info["degree"] = {"required": req_deg, "matched": deg_matched, "matched_with": deg_phrase, "score": deg_score, "method": deg_method}
         if not deg_matched:
             eligible = False
             reasons.append(f"Missing required degree: {req_deg}")
-    else:
+    elif not any(_get_degree_level_from_string(d) >= deg_required_level for d in parsed_degrees):
         # require candidate to have at least the required level
-        has_level = any(lvl >= deg_required_level for lvl in parsed_levels)
-        if not has_level:
+        eligible = False
+        reasons.append(f"Required degree level not met: {req_deg} (need level {deg_required_level})")
+        match_info["degree"] = {"required": req_deg, "matched": False, "matched_with": deg_phrase, "score": deg_score, "method": deg_method}
+    else:
+        # if level satisfied, require subject match (conservative)
+        match_info["degree"] = {"required": req_deg, "matched": deg_matched, "matched_with": deg_phrase, "score": deg_score, "method": deg_method}
+        if not deg_matched:
             eligible = False
-            reasons.append(f"Required degree level not met: {req_deg} (need level {deg_required_level})")
-            # still attempt subject fuzzy match for debug
-            deg_matched, deg_phrase, deg_score, deg_method = _subject_matches(req_deg or "", parsed_degrees)
-            match_info["degree"] = {"required": req_deg, "matched": False, "matched_with": deg_phrase, "score": deg_score, "method": deg_method}
-        else:
-            # if level satisfied, require subject match (conservative)
-            deg_matched, deg_phrase, deg_score, deg_method = _subject_matches(req_deg or "", parsed_degrees)
-            match_info["degree"] = {"required": req_deg, "matched": deg_matched, "matched_with": deg_phrase, "score": deg_score, "method": deg_method}
-            if not deg_matched:
-                eligible = False
-                reasons.append(f"Degree level OK but subject mismatch for required degree: {req_deg}")
+            reasons.append(f"Degree level OK but subject mismatch for required degree: {req_deg}")
 
-    # Skill matching
-    parsed_skills = parsed_resume.get("skills", []) or []
-    # normalize parsed skills
-    parsed_skills_norm = [_normalize_text(s) for s in parsed_skills]
+    if match_info["degree"].get("method") == "deadline":
+        partial_stages.append("degree_fuzzy")
 
-    required_skills = criteria.get("required_skills", []) or []
-    optional_skills = criteria.get("optional_skills", []) or []
+    # Skill matching: the candidate's tokens are normalized/compacted once
+    parsed_skills = parsed_resume.get("skills", []) or []
+    if parsed_compact is None:
+        parsed_compact = [_compact(s) for s in parsed_skills]
+    if best_fuzzy is None and len(parsed_compact) >= PREFILTER_MIN_TOKENS:
+        best_fuzzy = _FuzzyIndex(parsed_compact, cc.fuzzy).best
+    parsed_compact_set = set(parsed_compact)
 
-    for rs in required_skills:
-        variants = _variants_for_skill(rs)
-        # disallow matching if rs itself is blacklisted or too short? handle normally but variants will protect
-        matched_token, score, method = _fuzzy_match_skill(variants, parsed_skills_norm)
-        # filter out blacklisted results or suspicious short matches
-        if matched_token:
-            if _is_blacklisted(matched_token):
-                matched_token = None
-                score = 0.0
-                method = "blacklisted"
+    for cs in cc.required:
+        rs = cs.skill
+        if prior and rs in prior["required"]:
+            if prior["required"][rs] is not None:
+                match_info["matched_required"][rs] = prior["required"][rs]
             else:
-                # ensure token length reasonable for fuzzy matches
-                if method == "fuzzy" and len(matched_token) < MIN_TOKEN_LEN_FOR_FUZZY:
-                    matched_token = None
-                    score = 0.0
-                    method = "too_short"
+                match_info["missing_required"].append(rs)
+                eligible = False
+                reasons.append(f"Missing required skill: {rs}")
+            continue
+        # filter out blacklisted results or suspicious short matches
+        matched_token, score, method = _filter_match(*_match_variants(
+            cs.variants_compact, cs.fuzzy_variants, parsed_compact, parsed_compact_set, not deadline.expired(),
+            best_fuzzy))
         if score >= FUZZY_THRESHOLD or (method == "exact" and score >= 60):
             match_info["matched_required"][rs] = {"matched_with": matched_token, "score": float(score), "method": method}
         else:
             # last-ditch loose substring check but only if not blacklisted and reasonable
-            r_comp = _compact(rs)
-            found_loose = False
-            for p in [ _compact(x) for x in parsed_skills_norm ]:
-                if p and (r_comp in p or p in r_comp):
-                    if not _is_blacklisted(p) and len(p) >= 3:
-                        match_info["matched_required"][rs] = {"matched_with": p, "score": 55.0, "method":"loose_substr"}
-                        found_loose = True
-                        break
+            loose = _loose_match(cs.compact, parsed_compact, min_len=3)
+            found_loose = loose is not None
+            if found_loose:
+                match_info["matched_required"][rs] = {"matched_with": loose, "score": 55.0, "method": "loose_substr"}
+            if not found_loose and method == "deadline":
+                partial_stages.append("skill_fuzzy")
             if not found_loose:
                 match_info["missing_required"].append(rs)
                 eligible = False
                 reasons.append(f"Missing required skill: {rs}")
 
     opt_count = 0
-    for osk in optional_skills:
-        variants = _variants_for_skill(osk)
-        matched_token, score, method = _fuzzy_match_skill(variants, parsed_skills_norm)
+    for cs in cc.optional:
+        osk = cs.skill
+        if prior and osk in prior["optional"]:
+            if prior["optional"][osk] is not None:
+                match_info["matched_optional"][osk] = prior["optional"][osk]
+                opt_count += 1
+            continue
+        matched_token, score, method = _match_variants(cs.variants_compact, cs.fuzzy_variants, parsed_compact,
+                                                       parsed_compact_set, not deadline.expired(), best_fuzzy)
         if matched_token and _is_blacklisted(matched_token):
             matched_token = None
             score = 0.0
@@ -276,17 +644,121 @@ def check_eligibility(parsed_resume, criteria, debug=False):
             opt_count += 1
         else:
             # loose substring
-            r_comp = _compact(osk)
-            for p in [ _compact(x) for x in parsed_skills_norm ]:
-                if p and (r_comp in p or p in r_comp) and not _is_blacklisted(p):
-                    match_info["matched_optional"][osk] = {"matched_with": p, "score": 60.0, "method": "loose_substr"}
-                    opt_count += 1
-                    break
+            loose = _loose_match(cs.compact, parsed_compact)
+            if loose is not None:
+                match_info["matched_optional"][osk] = {"matched_with": loose, "score": 60.0, "method": "loose_substr"}
+                opt_count += 1
+            if osk not in match_info["matched_optional"] and method == "deadline":
+                partial_stages.append("skill_fuzzy")
 
     match_info["optional_bonus_count"] = opt_count
+    if partial_stages:
+        match_info["partial"] = True
+        match_info["partial_stages"] = sorted(set(partial_stages))
 
     if debug:
         match_info["debug_parsed_skills"] = parsed_skills
         match_info["debug_parsed_degrees"] = parsed_degrees
 
     return eligible, reasons, match_info
+
+
+def _triage(parsed_resume, cc, deadline, debug=False, parsed_compact=None, best_fuzzy=None):
+    """
+    check_eligibility in "triage" mode: hard requirements are checked cheapest
+    first (experience, publications, degree level, exact/loose skill matches,
+    degree subject, then fuzzy skill matches) and the first one that fails ends
+    the check. The eligible decision is the full mode's; reasons holds only that
+    first failure, optional skills are never looked at, and match_info has what
+    was evaluated up to that point plus triage=True and failed=<requirement>.
+    """
+    partial_stages = []
+    match_info = {
+        "triage": True,
+        "failed": None,
+        "degree": {},
+        "matched_required": {},
+        "missing_required": [],
+        "matched_optional": {},
+        "optional_bonus_count": 0
+    }
+    parsed_skills = parsed_resume.get("skills", []) or []
+    parsed_degrees = parsed_resume.get("degrees", []) or []
+
+    def done(failed=None, reason=None):
+        match_info["failed"] = failed
+        if partial_stages:
+            match_info["partial"] = True
+            match_info["partial_stages"] = sorted(set(partial_stages))
+        if debug:
+            match_info["debug_parsed_skills"] = parsed_skills
+            match_info["debug_parsed_degrees"] = parsed_degrees
+        return failed is None, [reason] if reason else [], match_info
+
+    def missing_skill(rs):
+        match_info["missing_required"].append(rs)
+        return done("required_skills", f"Missing required skill: {rs}")
+
+    found_exp = parsed_resume.get("experience_years", 0) or 0
+    match_info["experience"] = {"required": cc.min_experience, "found": found_exp}
+    if found_exp < cc.min_experience:
+        return done("experience", f"Experience < {cc.min_experience} years")
+
+    found_pubs = parsed_resume.get("publications", 0) or 0
+    match_info["publications"] = {"required": cc.min_publications, "found": found_pubs}
+    if found_pubs < cc.min_publications:
+        return done("publications", f"Publications < {cc.min_publications}")
+
+    req_deg = cc.required_degree
+    if cc.degree_level and not any(_get_degree_level_from_string(d) >= cc.degree_level for d in parsed_degrees):
+        match_info["degree"] = {"required": req_deg, "matched": False, "matched_with": None, "score": 0.0,
+                                "method": "level"}
+        return done("degree", f"Required degree level not met: {req_deg} (need level {cc.degree_level})")
+
+    # required skills, exact and loose matches only; the rest wait for the fuzzy pass
+    if parsed_compact is None:
+        parsed_compact = [_compact(s) for s in parsed_skills]
+    parsed_compact_set = set(parsed_compact)
+    pending = []
+    for cs in cc.required:
+        matched_token, score, method = _filter_match(*_match_variants(
+            cs.variants_compact, (), parsed_compact, parsed_compact_set, allow_fuzzy=False))
+        if method == "exact":
+            match_info["matched_required"][cs.skill] = {"matched_with": matched_token, "score": float(score),
+                                                        "method": method}
+            continue
+        loose = _loose_match(cs.compact, parsed_compact, min_len=3)
+        if loose is not None:
+            match_info["matched_required"][cs.skill] = {"matched_with": loose, "score": 55.0,
+                                                        "method": "loose_substr"}
+        elif method == "blacklisted":
+            # an exact hit on a blacklisted token ends the variant search in full mode too
+            return missing_skill(cs.skill)
+        else:
+            pending.append(cs)
+
+    deg_matched, deg_phrase, deg_score, deg_method = _subject_matches(
+        req_deg or "", parsed_degrees, not deadline.expired(), req_subtokens=cc.degree_subtokens)
+    match_info["degree"] = {"required": req_deg, "matched": deg_matched, "matched_with": deg_phrase,
+                            "score": deg_score, "method": deg_method}
+    if deg_method == "deadline":
+        partial_stages.append("degree_fuzzy")
+    if not deg_matched:
+        if cc.degree_level == 0:
+            return done("degree", f"Missing required degree: {req_deg}")
+        return done("degree", f"Degree level OK but subject mismatch for required degree: {req_deg}")
+
+    if pending and best_fuzzy is None and len(parsed_compact) >= PREFILTER_MIN_TOKENS:
+        best_fuzzy = _FuzzyIndex(parsed_compact, cc.fuzzy).best
+    for cs in pending:
+        matched_token, score, method = _filter_match(*_match_variants(
+            (), cs.fuzzy_variants, parsed_compact, parsed_compact_set, not deadline.expired(), best_fuzzy))
+        if score >= FUZZY_THRESHOLD:
+            match_info["matched_required"][cs.skill] = {"matched_with": matched_token, "score": float(score),
+                                                        "method": method}
+            continue
+        if method == "deadline":
+            partial_stages.append("skill_fuzzy")
+        return missing_skill(cs.skill)
+
+    return done()
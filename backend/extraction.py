@@ -0,0 +1,623 @@
+# backend/extraction.py
+"""
+Sandboxed resume text extraction.
+
+PDF/DOCX parsing runs in a separate process with a wall-clock timeout, an RSS
+limit, a page cap and an output character cap, so one malformed or 300-page
+file can't hang or blow up the Streamlit worker. The format is sniffed from the
+file's magic bytes rather than trusted from its extension, and every failure is
+reported as a structured ExtractionResult instead of falling back to decoding
+raw bytes.
+
+The actual extractor is picked from a per-MIME registry of backends
+(register_extractor / list_backends); the selection can be changed per
+deployment with EXTRACTOR_BACKENDS or configure_backends().
+"""
+import io
+import os
+import time
+import signal
+import multiprocessing
+
+# optional imports (only needed inside the extraction child)
+try:
+    from pdfminer.pdfpage import PDFPage
+    from pdfminer.pdfinterp import PDFResourceManager, PDFPageInterpreter
+    from pdfminer.converter import TextConverter
+    from pdfminer.layout import LAParams
+    HAS_PDFMINER = True
+except Exception:
+    HAS_PDFMINER = False
+
+try:
+    from docx import Document
+except Exception:
+    Document = None
+
+try:
+    import resource
+except Exception:  # not available on Windows
+    resource = None
+
+# ---------- Limits (overridable per deployment via env) ----------
+MAX_PAGES = int(os.environ.get("EXTRACT_MAX_PAGES", 80))
+TIMEOUT_S = float(os.environ.get("EXTRACT_TIMEOUT_S", 30))
+MAX_RSS_MB = int(os.environ.get("EXTRACT_MAX_RSS_MB", 768))
+MAX_CHARS = int(os.environ.get("EXTRACT_MAX_CHARS", 300_000))
+
+# page-parallel PDF extraction: PDFs with at least PARALLEL_MIN_PAGES pages are
+# split into page ranges extracted by PAGE_WORKERS processes (0/1 = off).
+# Only used inside the sandbox child, which is single-threaded and can fork
+# safely; shorter resumes never pay the pool start-up cost.
+PARALLEL_MIN_PAGES = int(os.environ.get("EXTRACT_PARALLEL_MIN_PAGES", 16))
+PARALLEL_MIN_RANGE = 4  # pages per range, at least
+PAGE_WORKERS = int(os.environ.get("EXTRACT_PAGE_WORKERS", min(os.cpu_count() or 1, 8)))
+
+# formats returned by sniff_format
+PDF, DOCX, TEXT, LEGACY_DOC, UNKNOWN = "pdf", "docx", "text", "doc", "unknown"
+
+# failure reasons -> message shown to candidates
+REASON_MESSAGES = {
+    "not_found": "The uploaded file could not be found on the server.",
+    "empty_file": "The uploaded file is empty.",
+    "unsupported_format": "Unsupported file type. Please upload a PDF or DOCX resume.",
+    "legacy_doc": "Old Word (.doc) files are not supported. Please save the resume as DOCX or PDF.",
+    "missing_dependency": "The server cannot read this file type right now.",
+    "encrypted": "The PDF is password protected.",
+    "corrupt": "The file appears to be damaged and could not be read.",
+    "no_text": "No text could be found in the file (is it a scanned image?).",
+    "timeout": "The file took too long to read. Please upload a smaller or simpler PDF.",
+    # not a rejection: the caller's latency budget ran out, extraction is retried without one
+    "deadline": "Reading the file is taking longer than usual; it will be finished in the background.",
+    "memory_limit": "The file is too complex to read. Please upload a smaller or simpler PDF.",
+    "crashed": "The file could not be read.",
+}
+
+
+class ExtractionResult:
+    __slots__ = ("text", "ok", "reason", "detail", "format", "truncated")
+
+    def __init__(self, text="", ok=True, reason=None, detail=None, format=None, truncated=False):
+        self.text = text or ""
+        self.ok = ok
+        self.reason = reason
+        self.detail = detail
+        self.format = format
+        self.truncated = truncated
+
+    @property
+    def message(self):
+        return REASON_MESSAGES.get(self.reason, "") if self.reason else ""
+
+    def to_dict(self):
+        return {"ok": self.ok, "reason": self.reason, "message": self.message, "detail": self.detail,
+                "format": self.format, "truncated": self.truncated, "chars": len(self.text)}
+
+
+def failure(reason, detail=None, fmt=None):
+    return ExtractionResult("", ok=False, reason=reason, detail=detail, format=fmt)
+
+
+# ---------- Format sniffing ----------
+def sniff_format(head: bytes) -> str:
+    """Guess the format from the first few KB of a file."""
+    if not head:
+        return UNKNOWN
+    # PDF readers accept the header anywhere in the first 1024 bytes
+    if b"%PDF-" in head[:1024]:
+        return PDF
+    if head.startswith(b"PK\x03\x04"):
+        return DOCX if b"word/" in head or b"[Content_Types].xml" in head else UNKNOWN
+    if head.startswith(b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"):
+        return LEGACY_DOC
+    sample = head[:4096]
+    if b"\x00" in sample:
+        return UNKNOWN
+    try:
+        sample.decode("utf-8")
+        return TEXT
+    except UnicodeDecodeError as e:
+        # a multi-byte char cut at the end of the sample is still text
+        if e.start >= len(sample) - 3:
+            return TEXT
+    printable = sum(1 for b in sample if b in (9, 10, 13) or 32 <= b < 127 or b >= 160)
+    return TEXT if printable / len(sample) > 0.95 else UNKNOWN
+
+
+# ---------- Extractor backends ----------
+# One registry per MIME type. Each backend declares rough speed/fidelity so an
+# operator can trade layout accuracy for throughput per deployment:
+#   speed:    "fast" | "medium" | "slow"
+#   fidelity: "layout" (reading order + line breaks), "text" (all text, simple
+#             structure) or "plain" (words only, no line structure)
+MIME_PDF = "application/pdf"
+MIME_DOCX = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+MIME_TEXT = "text/plain"
+FORMAT_MIME = {PDF: MIME_PDF, DOCX: MIME_DOCX, TEXT: MIME_TEXT}
+_MIME_FORMAT = {v: k for k, v in FORMAT_MIME.items()}
+
+# default backend per MIME type
+DEFAULT_BACKENDS = {
+    MIME_PDF: "pdfminer-accurate",
+    MIME_DOCX: "docx-xml-stream",
+    MIME_TEXT: "plain-text",
+}
+
+# a docx whose document.xml inflates beyond this is treated as a zip bomb
+MAX_DOCX_XML_BYTES = int(os.environ.get("EXTRACT_MAX_DOCX_XML_MB", 64)) * 1024 * 1024
+
+
+class ExtractorBackend:
+    __slots__ = ("name", "mime", "fn", "speed", "fidelity", "description", "requires")
+
+    def __init__(self, name, mime, fn, speed, fidelity, description="", requires=None):
+        self.name = name
+        self.mime = mime
+        self.fn = fn
+        self.speed = speed
+        self.fidelity = fidelity
+        self.description = description
+        self.requires = requires  # callable -> None if usable, else the missing dependency
+
+    def missing_dependency(self):
+        return self.requires() if self.requires else None
+
+    def to_dict(self):
+        return {"name": self.name, "mime": self.mime, "speed": self.speed, "fidelity": self.fidelity,
+                "description": self.description, "available": self.missing_dependency() is None}
+
+
+_REGISTRY = {}   # mime -> {name: ExtractorBackend}
+_SELECTED = {}   # mime -> backend name overriding DEFAULT_BACKENDS
+
+
+def register_extractor(mime, name, speed, fidelity, description="", requires=None):
+    """
+    Decorator registering fn(src, max_pages, max_chars) -> ExtractionResult as
+    an extractor backend for `mime`; src is a file path or the file's bytes.
+    """
+    def deco(fn):
+        _REGISTRY.setdefault(mime, {})[name] = ExtractorBackend(name, mime, fn, speed, fidelity, description, requires)
+        return fn
+    return deco
+
+
+def list_backends(mime=None):
+    """Registered backends (optionally for one MIME type) as dicts, selected one flagged."""
+    out = []
+    for m, backends in _REGISTRY.items():
+        if mime and m != mime:
+            continue
+        chosen = selected_backend_name(m)
+        for b in backends.values():
+            d = b.to_dict()
+            d["selected"] = b.name == chosen
+            out.append(d)
+    return out
+
+
+def selected_backend_name(mime):
+    return _SELECTED.get(mime) or DEFAULT_BACKENDS.get(mime)
+
+
+def get_backend(mime, name=None):
+    """The named backend for `mime` (default: the selected one), or None."""
+    return _REGISTRY.get(mime, {}).get(name or selected_backend_name(mime))
+
+
+def _resolve_mime(key):
+    # accept short format names ("pdf") as well as MIME types
+    return FORMAT_MIME.get(key, key)
+
+
+def configure_backends(selection):
+    """
+    Select backends per MIME type, e.g. {"pdf": "pdfminer-fast"} or the env
+    string form "pdf=pdfminer-fast;docx=docx-python-docx". Unknown backends
+    raise ValueError. Call before extraction starts: the sandbox children get
+    the selected backend name with each job.
+    """
+    if isinstance(selection, str):
+        pairs = [item.split("=", 1) for item in selection.split(";") if "=" in item]
+        selection = {k.strip(): v.strip() for k, v in pairs}
+    for key, name in (selection or {}).items():
+        mime = _resolve_mime(key)
+        if name not in _REGISTRY.get(mime, {}):
+            raise ValueError(f"Unknown extractor backend {name!r} for {mime}")
+        _SELECTED[mime] = name
+
+
+def backends_signature():
+    """Stable id of the selected backends; part of the extracted-text cache key."""
+    return ",".join(f"{_MIME_FORMAT.get(m, m)}={selected_backend_name(m)}" for m in sorted(DEFAULT_BACKENDS))
+
+
+def _needs_pdfminer():
+    return None if HAS_PDFMINER else "pdfminer.six is not installed"
+
+
+def _needs_python_docx():
+    return None if Document else "python-docx is not installed"
+
+
+# ---------- Extractors (run inside the child) ----------
+# Every extractor takes `src`: a file path, or the file's bytes when the
+# upload is handed over straight from memory (never written and re-read).
+def _is_buffer(src):
+    return isinstance(src, (bytes, bytearray, memoryview))
+
+
+def _open(src):
+    return io.BytesIO(src) if _is_buffer(src) else open(src, "rb")
+
+
+def _pdf_range_text(src, start, stop, laparams, max_chars=None):
+    """Text of pages [start, stop) and whether the document had more (pages or chars)."""
+    out = io.StringIO()
+    cut = False
+    with _open(src) as fp:
+        rsrc = PDFResourceManager(caching=True)
+        device = TextConverter(rsrc, out, codec="utf-8", laparams=laparams)
+        interp = PDFPageInterpreter(rsrc, device)
+        for i, page in enumerate(PDFPage.get_pages(fp, caching=True)):
+            if i < start:
+                continue
+            if i >= stop:
+                cut = True
+                break
+            interp.process_page(page)
+            if max_chars and out.tell() >= max_chars:
+                cut = True
+                break
+    return out.getvalue(), cut
+
+
+# the document being split into ranges; set before the fork pool starts so
+# workers inherit it instead of having an in-memory file pickled per range
+_range_src = None
+
+
+def _pdf_range_worker(args):
+    return _pdf_range_text(_range_src, *args)[0]
+
+
+def _pdf_page_count(src):
+    from pdfminer.pdfparser import PDFParser
+    from pdfminer.pdfdocument import PDFDocument
+    from pdfminer.pdftypes import resolve1
+    with _open(src) as fp:
+        doc = PDFDocument(PDFParser(fp))
+        try:
+            return int(resolve1(doc.catalog["Pages"])["Count"])
+        except Exception:
+            # broken page tree: count by walking it
+            return sum(1 for _ in PDFPage.create_pages(doc))
+
+
+def _pdf_text_parallel(src, n_pages, laparams, workers):
+    """
+    Split pages [0, n_pages) into contiguous ranges, extract them in a fork
+    pool and join the results in page order. Each page's output only depends
+    on that page, so the text is identical to a sequential run.
+    """
+    global _range_src
+    from concurrent.futures import ProcessPoolExecutor
+    # ~2 ranges per worker so one slow range (big tables, figures) doesn't
+    # leave the others idle at the end
+    size = max(PARALLEL_MIN_RANGE, -(-n_pages // (workers * 2)))
+    ranges = [(s, min(s + size, n_pages), laparams) for s in range(0, n_pages, size)]
+    _range_src = src
+    ctx = multiprocessing.get_context("fork")
+    with ProcessPoolExecutor(max_workers=min(workers, len(ranges)), mp_context=ctx) as pool:
+        return "".join(pool.map(_pdf_range_worker, ranges))
+
+
+def _pdf_pages(src, max_pages, max_chars, laparams):
+    from pdfminer.pdfdocument import PDFPasswordIncorrect, PDFEncryptionError
+    try:
+        n_pages = _pdf_page_count(src) if _page_workers > 1 else 0
+        if min(n_pages, max_pages) >= PARALLEL_MIN_PAGES:
+            text = _pdf_text_parallel(src, min(n_pages, max_pages), laparams, _page_workers)
+            truncated = n_pages > max_pages
+        else:
+            text, truncated = _pdf_range_text(src, 0, max_pages, laparams, max_chars)
+    except (PDFPasswordIncorrect, PDFEncryptionError) as e:
+        return failure("encrypted", str(e), PDF)
+    return ExtractionResult(text[:max_chars], format=PDF, truncated=truncated or len(text) > max_chars)
+
+
+@register_extractor(MIME_PDF, "pdfminer-accurate", speed="slow", fidelity="layout",
+                    description="pdfminer with layout analysis (reading order, line breaks)",
+                    requires=_needs_pdfminer)
+def _pdf_accurate(src, max_pages, max_chars):
+    return _pdf_pages(src, max_pages, max_chars, LAParams())
+
+
+@register_extractor(MIME_PDF, "pdfminer-fast", speed="fast", fidelity="plain",
+                    description="pdfminer without layout analysis; text in content-stream order, no line breaks",
+                    requires=_needs_pdfminer)
+def _pdf_fast(src, max_pages, max_chars):
+    return _pdf_pages(src, max_pages, max_chars, None)
+
+
+@register_extractor(MIME_DOCX, "docx-python-docx", speed="medium", fidelity="text",
+                    description="python-docx body paragraphs (tables are skipped)",
+                    requires=_needs_python_docx)
+def _docx_text(src, max_pages, max_chars):
+    doc = Document(io.BytesIO(src) if _is_buffer(src) else src)
+    text = "\n".join([p.text for p in doc.paragraphs])
+    return ExtractionResult(text[:max_chars], format=DOCX, truncated=len(text) > max_chars)
+
+
+_W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_W_P, _W_T, _W_TAB, _W_BR, _W_TC, _W_TR = (_W_NS + t for t in ("p", "t", "tab", "br", "tc", "tr"))
+
+
+@register_extractor(MIME_DOCX, "docx-xml-stream", speed="fast", fidelity="text",
+                    description="streams word/document.xml; paragraphs and tables (one row per line) in document order")
+def _docx_xml_stream(src, max_pages, max_chars):
+    import zipfile
+    from xml.etree.ElementTree import iterparse, ParseError
+    try:
+        zf = zipfile.ZipFile(io.BytesIO(src) if _is_buffer(src) else src)
+    except zipfile.BadZipFile as e:
+        return failure("corrupt", str(e), DOCX)
+    with zf:
+        try:
+            info = zf.getinfo("word/document.xml")
+        except KeyError:
+            return failure("corrupt", "word/document.xml missing", DOCX)
+        if info.file_size > MAX_DOCX_XML_BYTES:
+            return failure("memory_limit", f"document.xml is {info.file_size // (1024 * 1024)} MB", DOCX)
+        lines, size, run = [], 0, []
+        # one entry per open table cell (nested tables push more); a cell
+        # collects its paragraphs and a row is emitted as one tab-separated line
+        cells, rows = [], []
+        truncated = False
+        try:
+            with zf.open(info) as fp:
+                # elements are cleared once emitted, so memory stays flat
+                # regardless of document size
+                for event, el in iterparse(fp, events=("start", "end")):
+                    tag = el.tag
+                    if event == "start":
+                        if tag == _W_TR:
+                            rows.append([])
+                        elif tag == _W_TC:
+                            cells.append([])
+                        continue
+                    if tag == _W_T:
+                        run.append(el.text or "")
+                    elif tag == _W_TAB:
+                        run.append("\t")
+                    elif tag == _W_BR:
+                        run.append("\n")
+                    elif tag == _W_P:
+                        line = "".join(run)
+                        run = []
+                        el.clear()
+                        if cells:
+                            cells[-1].append(line)
+                            continue
+                        lines.append(line)
+                        size += len(line) + 1
+                    elif tag == _W_TC and cells:
+                        cell = " ".join(p for p in cells.pop() if p)
+                        if rows:
+                            rows[-1].append(cell)
+                        el.clear()
+                    elif tag == _W_TR and rows:
+                        line = "\t".join(rows.pop())
+                        el.clear()
+                        if cells:  # nested table: the row belongs to the outer cell
+                            cells[-1].append(line)
+                            continue
+                        lines.append(line)
+                        size += len(line) + 1
+                    else:
+                        continue
+                    if size > max_chars:
+                        truncated = True
+                        break
+        except ParseError as e:
+            return failure("corrupt", f"document.xml: {e}", DOCX)
+    text = "\n".join(lines)
+    return ExtractionResult(text[:max_chars], format=DOCX, truncated=truncated or len(text) > max_chars)
+
+
+@register_extractor(MIME_TEXT, "plain-text", speed="fast", fidelity="text",
+                    description="UTF-8 text, latin-1 fallback")
+def _text_file(src, max_pages, max_chars):
+    # read at most ~4 bytes/char so a huge text file can't be pulled into memory
+    with _open(src) as f:
+        raw = f.read(max_chars * 4 + 1)
+    try:
+        text = raw.decode("utf-8")
+    except UnicodeDecodeError:
+        text = raw.decode("latin-1", errors="ignore")
+    return ExtractionResult(text[:max_chars], format=TEXT, truncated=len(text) > max_chars)
+
+
+def _extract(src, fmt, max_pages, max_chars, backend=None):
+    mime = FORMAT_MIME.get(fmt)
+    b = get_backend(mime, backend)
+    if b is None:
+        return failure("unsupported_format", f"no extractor backend {backend!r} for {mime}", fmt)
+    missing = b.missing_dependency()
+    if missing:
+        return failure("missing_dependency", missing, fmt)
+    return b.fn(src, max_pages, max_chars)
+
+
+# set in the sandbox child only; in-process extraction stays sequential
+_page_workers = 0
+
+
+def _child_main(conn, src, fmt, max_pages, max_chars, max_rss_mb, backend=None, page_workers=0):
+    global _page_workers
+    _page_workers = page_workers if "fork" in multiprocessing.get_all_start_methods() else 0
+    if resource is not None and max_rss_mb:
+        # hard backstop; the parent also polls the real RSS
+        try:
+            limit = max_rss_mb * 1024 * 1024 * 2
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+        except Exception:
+            pass
+    try:
+        res = _extract(src, fmt, max_pages, max_chars, backend)
+    except MemoryError:
+        res = failure("memory_limit", "MemoryError", fmt)
+    except Exception as e:
+        res = failure("corrupt", f"{type(e).__name__}: {e}", fmt)
+    conn.send((res.text, res.ok, res.reason, res.detail, res.format, res.truncated))
+    conn.close()
+
+
+# ---------- Sandbox ----------
+_ctx = None
+
+
+def _mp_context():
+    global _ctx
+    if _ctx is None:
+        # forkserver forks from a clean single-threaded server (plain fork is
+        # unsafe from the multi-threaded Streamlit process); preloading this
+        # module there means children start with pdfminer already imported
+        if "forkserver" in multiprocessing.get_all_start_methods():
+            _ctx = multiprocessing.get_context("forkserver")
+            _ctx.set_forkserver_preload([__name__])
+        else:
+            _ctx = multiprocessing.get_context("spawn")
+    return _ctx
+
+
+def _descendants(pid):
+    """pids of every process below pid (the page-range pool workers), via /proc."""
+    out, todo = [], [pid]
+    while todo:
+        p = todo.pop()
+        try:
+            tids = os.listdir(f"/proc/{p}/task")
+        except OSError:
+            continue
+        for tid in tids:
+            try:
+                with open(f"/proc/{p}/task/{tid}/children") as f:
+                    kids = [int(k) for k in f.read().split()]
+            except (OSError, ValueError):
+                continue
+            out += kids
+            todo += kids
+    return out
+
+
+def _rss_mb(pid):
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except Exception:
+        return 0.0
+
+
+def _tree_rss_mb(pid):
+    return _rss_mb(pid) + sum(_rss_mb(k) for k in _descendants(pid))
+
+
+def extract_text_safe(source, max_pages=None, timeout_s=None, max_rss_mb=None, max_chars=None, sandbox=True,
+                      backend=None, page_workers=None):
+    """
+    Extract resume text with resource limits. Returns an ExtractionResult;
+    never raises for bad input. `source` is a file path or the file's bytes
+    (bytes / memoryview / a BytesIO such as a Streamlit UploadedFile), which
+    are extracted without touching the disk. `backend` overrides the selected extractor
+    backend for the sniffed format (see configure_backends); `page_workers`
+    overrides PAGE_WORKERS for long PDFs (sandboxed runs only). The RSS limit
+    covers the child and its page workers together.
+    """
+    max_pages = MAX_PAGES if max_pages is None else max_pages
+    timeout_s = TIMEOUT_S if timeout_s is None else timeout_s
+    max_rss_mb = MAX_RSS_MB if max_rss_mb is None else max_rss_mb
+    max_chars = MAX_CHARS if max_chars is None else max_chars
+    page_workers = PAGE_WORKERS if page_workers is None else page_workers
+
+    if hasattr(source, "getbuffer"):
+        source = source.getbuffer()
+    if _is_buffer(source):
+        head = bytes(source[:8192])
+    else:
+        try:
+            with open(source, "rb") as f:
+                head = f.read(8192)
+        except FileNotFoundError:
+            return failure("not_found")
+        except OSError as e:
+            return failure("not_found", str(e))
+    if not head:
+        return failure("empty_file")
+
+    fmt = sniff_format(head)
+    if fmt == LEGACY_DOC:
+        return failure("legacy_doc", fmt=fmt)
+    if fmt == UNKNOWN:
+        return failure("unsupported_format", fmt=fmt)
+    backend = backend or selected_backend_name(FORMAT_MIME[fmt])
+    if fmt == TEXT or not sandbox:
+        try:
+            res = _extract(source, fmt, max_pages, max_chars, backend)
+        except Exception as e:
+            res = failure("corrupt", f"{type(e).__name__}: {e}", fmt)
+        return _finish(res)
+
+    ctx = _mp_context()
+    parent_conn, child_conn = ctx.Pipe(duplex=False)
+    if isinstance(source, memoryview):
+        # memoryviews don't pickle; the child gets one copy through the pipe
+        source = source.tobytes()
+    proc = ctx.Process(target=_child_main, args=(child_conn, source, fmt, max_pages, max_chars, max_rss_mb, backend,
+                                                       page_workers))
+    proc.start()
+    child_conn.close()
+    deadline = time.monotonic() + timeout_s
+    res = None
+    try:
+        while True:
+            if parent_conn.poll(0.05):
+                try:
+                    res = ExtractionResult(*parent_conn.recv())
+                except EOFError:
+                    res = failure("crashed", f"exit code {proc.exitcode}", fmt)
+                break
+            if not proc.is_alive() and not parent_conn.poll(0):
+                code = proc.exitcode
+                res = failure("memory_limit" if code and code < 0 else "crashed", f"exit code {code}", fmt)
+                break
+            if time.monotonic() > deadline:
+                res = failure("timeout", f"> {timeout_s:g}s", fmt)
+                break
+            if max_rss_mb and _tree_rss_mb(proc.pid) > max_rss_mb:
+                res = failure("memory_limit", f"> {max_rss_mb} MB RSS", fmt)
+                break
+    finally:
+        if proc.is_alive():
+            # kill page workers first so none are left orphaned
+            for pid in _descendants(proc.pid):
+                try:
+                    os.kill(pid, signal.SIGKILL)
+                except OSError:
+                    pass
+            proc.kill()
+        proc.join(1)
+        parent_conn.close()
+    return _finish(res)
+
+
+def _finish(res):
+    if res.ok and not res.text.strip():
+        return failure("no_text", fmt=res.format)
+    return res
+
+
+# per-deployment selection, e.g. EXTRACTOR_BACKENDS="pdf=pdfminer-fast;docx=docx-python-docx"
+if os.environ.get("EXTRACTOR_BACKENDS"):
+    configure_backends(os.environ["EXTRACTOR_BACKENDS"])
@@ -0,0 +1,111 @@
+# backend/field_extractor.py
+"""
+Precompiled extractor for the job-agnostic resume fields.
+
+extract_fields() returns a dict with a fixed schema (FIELD_KEYS):
+  email, phone, degrees, experience_years, publications
+
+The text is lowercased once (TextViews) and degrees, "N years" and publication
+keywords are collected in a single finditer pass over that buffer. Degree
+patterns sit inside a zero-width lookahead, so they never consume the
+keywords/years that follow them, and each degree pattern keeps findall's
+non-overlapping semantics. Email and phone are first-match searches on the
+original text (case preserved) and stop at the first hit.
+"""
+import re
+from typing import Any, Dict, List, Tuple
+
+FIELD_KEYS = ("email", "phone", "degrees", "experience_years", "publications")
+
+EMAIL_RE = re.compile(r'[\w\.-]+@[\w\.-]+\.\w+')
+PHONE_RE = re.compile(r'(\+?\d[\d\-\s]{7,}\d)')
+
+# order matters: degrees are reported grouped by pattern, in this order
+DEGREE_PATTERNS = [r"b\.?tech\b", r"b\.?des\b", r"bachelor of [a-z ]+", r"m\.?tech\b", r"ph\.?d\b"]
+
+# every alternative starts with one of [0-9bcdjmp]; the leading guard lets the
+# engine skip all other positions cheaply
+_FIELDS_RE = re.compile(
+    r"(?=[0-9bcdjmp])(?:"
+    r"(?P<years>\d{1,2})\s+years"
+    r"|\b(?P<pub>publication|published|journal|conference|doi)\b"
+    r"|(?=\b(?:" + "|".join(
+        # the "bachelor of" pattern needs its own trailing \b (it ends in [a-z ]+)
+        f"(?P<d{i}>{p})" + (r"\b" if p.endswith("+") else "")
+        for i, p in enumerate(DEGREE_PATTERNS)) + r")))"
+)
+_DEGREE_GROUPS = [f"d{i}" for i in range(len(DEGREE_PATTERNS))]
+
+_NON_TOKEN_RE = re.compile(r'[^a-z0-9\.\+\#]+')
+_COMPACT_RE = re.compile(r'[\s\.]+')
+
+
+class TextViews:
+    """The views of one resume text that the parser needs, each computed once."""
+    __slots__ = ("text", "lower", "norm", "_compact", "_tokens")
+
+    def __init__(self, text: str, tokens: Tuple[str, ...] = None):
+        self.text = text or ""
+        self.lower = self.text.lower()
+        # same as resume_parser._normalize: each run of chars outside
+        # [a-z0-9.+#] (whitespace included) becomes a single space
+        self.norm = _NON_TOKEN_RE.sub(' ', self.lower.strip())
+        self._compact = None
+        self._tokens = tokens  # precomputed tokens (e.g. from a cached profile)
+
+    @property
+    def compact(self) -> str:
+        if self._compact is None:
+            self._compact = _COMPACT_RE.sub('', self.norm)
+        return self._compact
+
+    @property
+    def tokens(self) -> Tuple[str, ...]:
+        """
+        Unique normalized heuristic tokens (runs of [a-z0-9.+#], length >= 2)
+        in order of first occurrence, so fuzzy ties resolve deterministically
+        to the earliest token in the resume.
+        """
+        if self._tokens is None:
+            self._tokens = tuple(dict.fromkeys(tok for tok in self.norm.split(' ') if len(tok) > 1))
+        return self._tokens
+
+
+def _normalize_phrase(s: str) -> str:
+    return _NON_TOKEN_RE.sub(' ', s.lower().strip())
+
+
+def extract_fields(text: str, views: TextViews = None) -> Dict[str, Any]:
+    views = views or TextViews(text)
+    t = views.text
+
+    email_m = EMAIL_RE.search(t)
+    phone_m = PHONE_RE.search(t)
+
+    degrees_by_pattern: List[List[str]] = [[] for _ in DEGREE_PATTERNS]
+    degree_end = [0] * len(DEGREE_PATTERNS)  # emulate findall's non-overlap per pattern
+    years = 0
+    pubs = 0
+    for m in _FIELDS_RE.finditer(views.lower):
+        y = m.group("years")
+        if y is not None:
+            years = max(years, int(y))
+            continue
+        if m.group("pub") is not None:
+            pubs += 1
+            continue
+        for i, g in enumerate(_DEGREE_GROUPS):
+            d = m.group(g)
+            if d is not None:
+                if m.start(g) >= degree_end[i]:
+                    degrees_by_pattern[i].append(_normalize_phrase(d))
+                    degree_end[i] = m.end(g)
+                break
+
+    return {
+        "email": email_m.group(0) if email_m else None,
+        "phone": phone_m.group(0) if phone_m else None,
+        "degrees": [d for group in degrees_by_pattern for d in group],
+        "experience_years": years,
+        "publications": pubs,
+    }
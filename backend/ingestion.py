@@ -0,0 +1,323 @@
+# backend/ingestion.py
+"""
+Bulk resume ingestion for a job: extract -> parse -> eligibility -> score -> persist.
+
+Files are split into chunks and screened in a process pool. Each worker imports
+resume_parser once (so spaCy is loaded once per process), builds the chunk's
+job-agnostic profiles (cached per file content; misses are tokenized as one
+nlp.pipe batch) and matches them against the job, with eligibility run for the
+whole chunk at once (eligibility.check_eligibility_batch). Results are written to the DB one chunk at a time, and the
+run is tracked as a backend.tasks.Task (progress, cancellation, per-file failures).
+"""
+import os
+import json
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from backend import db, tasks, uploads_store
+from backend.deadline import Deadline
+
+SUPPORTED_EXTENSIONS = (".pdf", ".docx", ".doc")
+
+# files per worker chunk; also the DB write batch size
+CHUNK_SIZE = 16
+MAX_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+
+# latency target for the candidate submit (extract + parse + eligibility +
+# score); stages that don't fit are finished in the background
+SUBMIT_SLO_S = float(os.environ.get("SUBMIT_SLO_S", 3.0))
+
+
+def _candidate_name_from_path(path):
+    stem = os.path.splitext(os.path.basename(path))[0]
+    # uploads before the uploads store were saved as "<timestamp>_<original name>"
+    head, sep, rest = stem.partition("_")
+    if sep and head.isdigit():
+        stem = rest
+    name = " ".join(stem.replace("_", " ").replace("-", " ").split())
+    return name or "Unknown candidate"
+
+
+def _init_worker():
+    # importing the parser loads spaCy once for the lifetime of the worker
+    from backend import resume_parser  # noqa: F401
+
+
+def _job_skills(criteria):
+    return (criteria.get('required_skills', []) or []) + (criteria.get('optional_skills', []) or [])
+
+
+# statuses set by automatic screening; anything else was set by an admin and
+# survives a re-screen
+AUTO_STATUSES = ('received', 'shortlisted', 'rejected')
+
+
+def current_versions():
+    """Versions of everything that produced a screening result (stamped as parsed['_versions'])."""
+    from backend import resume_parser, eligibility, scoring, synonyms
+    return {
+        "profile": resume_parser.profile_version(),
+        "matcher": resume_parser.MATCHER_VERSION,
+        "synonyms": synonyms.version(),
+        "eligibility": eligibility.ELIGIBILITY_VERSION,
+        "scoring": scoring.SCORING_VERSION,
+    }
+
+
+def save_screening(app, parsed, eligible, score, criteria_version=None):
+    """
+    Store a (re-)screening result for an application row, keeping any admin-set
+    status. criteria_version: the job criteria version it was computed against.
+    """
+    db.update_application_parsed(app['id'], parsed, eligible, score, status=screening_status(app),
+                                 criteria_version=criteria_version)
+
+
+def screening_status(app):
+    """Status to write with a new screening result: None (automatic) unless an admin set it."""
+    return None if app['status'] in AUTO_STATUSES else app['status']
+
+
+def screen_profile(profile, criteria, budget_s=None, debug=False, weights=None):
+    """
+    Match a resume profile against a job's criteria: parse -> eligibility -> score.
+    Returns (parsed, eligible, reasons, score); parsed carries match_info, the
+    score components, the current _versions, and partial=True if the budget cut
+    any stage short. weights: the job's score weights (scoring.job_weights).
+    A profile whose extraction ran out of the budget (profile.deferred) gives a
+    partial placeholder: not eligible yet, no score, for run_completion to finish.
+    """
+    from backend import resume_parser, eligibility, scoring
+    if profile.deferred:
+        parsed = {"extraction": dict(profile.extraction), "partial": True,
+                  "match_info": {"partial": True, "partial_stages": ["extraction"]},
+                  "_versions": current_versions()}
+        return parsed, False, [], None
+    deadline = Deadline.coerce(budget_s)
+    parsed = resume_parser.match_profile(profile, job_skills=_job_skills(criteria), debug=debug, budget_s=deadline)
+    eligible, reasons, match_info = eligibility.check_eligibility(parsed, criteria, debug=debug, budget_s=deadline)
+    score = scoring.score_parsed(parsed, criteria, match_info, weights)
+    parsed['match_info'] = match_info
+    if match_info.get('partial'):
+        parsed['partial'] = True
+    parsed['_versions'] = current_versions()
+    return parsed, eligible, reasons, score
+
+
+def screen_profiles(profiles, criteria, debug=False, workers=-1, mode="full", weights=None):
+    """
+    screen_profile for many profiles against one job, without a budget; the
+    eligibility stage runs as one batch (eligibility.check_eligibility_batch).
+    mode="triage" rejects candidates at their first unmet hard requirement and
+    only fully explains (and scores) those who pass; rejected ones keep the
+    triage match_info and no score (see scoring.score_parsed).
+    workers: threads for the fuzzy skill matching and the eligibility batch.
+    Returns one (parsed, eligible, reasons, score) tuple per profile, or the
+    exception raised while matching that profile.
+    """
+    from backend import resume_parser, eligibility, scoring
+    job_skills = _job_skills(criteria)
+    versions = current_versions()
+    out = [None] * len(profiles)
+    matched = []
+    for i, profile in enumerate(profiles):
+        try:
+            parsed = resume_parser.match_profile(profile, job_skills=job_skills, debug=debug, workers=workers)
+            matched.append((i, parsed))
+        except Exception as e:
+            out[i] = e
+    checks = eligibility.check_eligibility_batch([parsed for _, parsed in matched], criteria, debug=debug,
+                                                 workers=workers, mode=mode)
+    if mode == "triage":
+        passed = [k for k, check in enumerate(checks) if not isinstance(check, Exception) and check[0]]
+        full = eligibility.check_eligibility_batch([matched[k][1] for k in passed], criteria, debug=debug,
+                                                   workers=workers)
+        for k, check in zip(passed, full):
+            checks[k] = check
+    for (i, parsed), check in zip(matched, checks):
+        if isinstance(check, Exception):
+            out[i] = check
+            continue
+        eligible, reasons, match_info = check
+        try:
+            score = scoring.score_parsed(parsed, criteria, match_info, weights)
+        except Exception as e:
+            out[i] = e
+            continue
+        parsed['match_info'] = match_info
+        if match_info.get('partial'):
+            parsed['partial'] = True
+        parsed['_versions'] = versions
+        out[i] = (parsed, eligible, reasons, score)
+    return out
+
+
+def _screen_chunk(paths, criteria, mode="full", weights=None):
+    """Worker: screen a chunk of resume files. Returns one result dict per path."""
+    from backend import resume_parser
+
+    results = []
+    readable = []
+    # cached profiles are reused; misses are extracted and tokenized as one batch
+    for p, profile in zip(paths, resume_parser.build_profiles(paths)):
+        res = {"path": p, "ok": profile.ok, "sha256": profile.sha256}
+        results.append(res)
+        if not profile.ok:
+            ex = profile.extraction
+            res["error"] = ex["message"] + (f" ({ex['detail']})" if ex.get("detail") else "")
+            continue
+        readable.append((res, profile))
+    # the pool already runs one worker per core, so the batch matcher stays single-threaded
+    screened = screen_profiles([profile for _, profile in readable], criteria, workers=1, mode=mode, weights=weights)
+    for (res, _), r in zip(readable, screened):
+        if isinstance(r, Exception):
+            res.update(ok=False, error=str(r))
+        else:
+            parsed, eligible, reasons, score = r
+            res.update(parsed=parsed, eligible=eligible, reasons=reasons, score=score)
+    return results
+
+
+def collect_folder(folder):
+    """List supported resume files (recursively) under a server-side folder."""
+    out = []
+    for root, _dirs, files in os.walk(folder):
+        for f in sorted(files):
+            if f.lower().endswith(SUPPORTED_EXTENSIONS):
+                out.append(os.path.join(root, f))
+    return out
+
+
+def save_uploaded_files(uploaded_files):
+    """
+    Persist Streamlit UploadedFile objects into the uploads store.
+    Returns (paths, names, errors): blob paths, {blob path: uploaded file name}
+    and a message per rejected (too large) file.
+    """
+    paths, names, errors = [], {}, []
+    for up in uploaded_files or []:
+        try:
+            _sha, path, _buf = uploads_store.put_upload(up)
+        except ValueError as e:
+            errors.append(f"{up.name}: {e}")
+            continue
+        paths.append(path)
+        names.setdefault(path, up.name)
+    return paths, names, errors
+
+
+def run_ingestion(task, job_id, paths, max_workers=None, chunk_size=CHUNK_SIZE, names=None, mode="full"):
+    """mode: eligibility mode for the screening ("triage" explains rejections on demand only)."""
+    job = db.get_job(job_id)
+    if not job:
+        raise ValueError("Job not found")
+    from backend import scoring
+    criteria = json.loads(job['criteria']) if job.get('criteria') else {}
+    weights = scoring.job_weights(job)
+    chunks = [paths[i:i + chunk_size] for i in range(0, len(paths), chunk_size)]
+    task.set_total(len(paths))
+    summary = {"job_id": job_id, "inserted": 0, "eligible": 0, "failed": 0, "skipped_capacity": 0}
+
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=max_workers or MAX_WORKERS, mp_context=ctx, initializer=_init_worker) as pool:
+        futures = {pool.submit(_screen_chunk, chunk, criteria, mode, weights): chunk for chunk in chunks}
+        for fut in as_completed(futures):
+            chunk = futures[fut]
+            if task.cancelled:
+                break
+            try:
+                results = fut.result()
+            except Exception as e:
+                for p in chunk:
+                    task.fail((names or {}).get(p) or os.path.basename(p), f"worker failed: {e}")
+                summary["failed"] += len(chunk)
+                task.advance(len(chunk))
+                continue
+
+            rows = []
+            for r in results:
+                if not r.get("ok"):
+                    task.fail((names or {}).get(r["path"]) or os.path.basename(r["path"]), r.get("error"))
+                    summary["failed"] += 1
+                    continue
+                parsed = r["parsed"]
+                name = (names or {}).get(r["path"]) or os.path.basename(r["path"])
+                # files from a server folder are copied into the store
+                sha, blob = uploads_store.put_file(r["path"], sha256=r["sha256"])
+                rows.append({
+                    "candidate_name": _candidate_name_from_path(name),
+                    "email": parsed.get("email"),
+                    "phone": parsed.get("phone"),
+                    "resume_path": blob,
+                    "resume_sha256": sha,
+                    "resume_name": name,
+                    "parsed": parsed,
+                    "eligible": r["eligible"],
+                    "score": r["score"],
+                    "criteria_version": job.get('criteria_version'),
+                })
+            ids = db.insert_applications_bulk(job_id, rows)
+            for r in rows[len(ids):]:
+                task.fail(r["resume_name"], "Application limit reached for this job")
+            summary["skipped_capacity"] += len(rows) - len(ids)
+            summary["inserted"] += len(ids)
+            summary["eligible"] += sum(1 for r in rows[:len(ids)] if r["eligible"])
+            task.advance(len(chunk), message=f"{summary['inserted']} screened")
+
+        if task.cancelled:
+            for f in futures:
+                f.cancel()
+    if (db.get_job(job_id) or {}).get('criteria_version') != job.get('criteria_version'):
+        # the criteria were edited while this ran; bring these rows up to date too
+        from backend import rescreen
+        rescreen.start_criteria_rescreen(job_id)
+    return summary
+
+
+def start_ingestion(job_id, paths, max_workers=None, names=None, mode="full"):
+    """
+    Start screening `paths` for `job_id` in the background; returns the Task.
+    names: optional {path: original file name} for files already in the store.
+    mode: "full" or "triage" (see screen_profiles).
+    """
+    from backend import eligibility
+    if mode not in eligibility.MODES:
+        raise ValueError(f"Unknown eligibility mode: {mode!r}")
+    return tasks.start_task("ingestion", run_ingestion, job_id, list(paths), max_workers=max_workers,
+                            names=names, mode=mode, total=len(paths))
+
+
+# ---------- Completing partial (deadline-limited) screenings ----------
+def run_completion(task, app_ids):
+    """Re-screen applications without a budget, replacing their partial results."""
+    from backend import resume_parser, scoring
+    task.set_total(len(app_ids))
+    completed = 0
+    for app_id in app_ids:
+        if task.cancelled:
+            break
+        app = db.get_application(app_id)
+        job = db.get_job(app['job_id']) if app else None
+        if not app or not job:
+            task.fail(app_id, "application or job not found")
+            task.advance()
+            continue
+        profile = resume_parser.build_profile(uploads_store.resume_source(app), sha256=app.get('resume_sha256'))
+        if not profile.ok:
+            task.fail(app_id, profile.extraction['message'])
+            task.advance()
+            continue
+        criteria = json.loads(job['criteria']) if job.get('criteria') else {}
+        old = json.loads(app['parsed_json']) if app.get('parsed_json') else {}
+        parsed, eligible, _reasons, score = screen_profile(profile, criteria, debug='_debug' in old,
+                                                           weights=scoring.job_weights(job))
+        save_screening(app, parsed, eligible, score, criteria_version=job.get('criteria_version'))
+        completed += 1
+        task.advance(message=f"{completed} completed")
+    return {"completed": completed}
+
+
+def start_completion(app_ids):
+    """Finish partial screenings in the background; returns the Task."""
+    return tasks.start_task("complete_screening", run_completion, list(app_ids), total=len(app_ids))
+
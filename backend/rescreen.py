@@ -0,0 +1,439 @@
+# backend/rescreen.py
+"""
+Bringing stored screening results up to date after a parser, synonym,
+eligibility or scoring change.
+
+Every result carries parsed['_versions'] (see ingestion.current_versions).
+stale_stage() compares it with the running code and names the earliest stage
+whose version moved; refresh_application() recomputes from that stage on and
+nothing before it:
+  profile / match -> profile from cache (re-extracted only if its own version
+                     moved), then match, eligibility, score
+  eligibility     -> eligibility + score on the stored parse
+  score           -> score only
+
+Stale rows are refreshed lazily when the admin views them (within a small time
+budget) and by a bounded background task that checkpoints its position in the
+settings table, so a restart resumes where it stopped.
+
+Editing a job's criteria (update_job_criteria) bumps the job's
+criteria_version and re-screens its applications in the background from their
+stored parse: eligibility.check_eligibility_incremental reuses every skill and
+degree result the edit didn't touch. An edit that adds skills re-matches each
+resume against the new skill list first (from the cached profile), since the
+stored parse only lists the skills it was matched against. Each row records the criteria version it
+was screened against, so an interrupted run is picked up again by the next.
+
+Changing a job's score weights (reweight_job) needs no re-screen at all: the
+score's component percentages are stored per application, so the job is
+re-ranked with one product over its component matrix.
+"""
+import os
+import json
+import time
+
+import numpy as np
+
+from backend import db, tasks, ingestion, uploads_store
+from backend.deadline import Deadline
+
+STAGES = ("profile", "match", "eligibility", "score")
+
+# time the admin page may spend refreshing stale rows before handing the rest
+# to the background task
+VIEW_REFRESH_BUDGET_S = float(os.environ.get("RESCREEN_VIEW_BUDGET_S", 1.5))
+# rows per background run (bounded so one run can't monopolise the worker)
+MAX_PER_RUN = int(os.environ.get("RESCREEN_MAX_PER_RUN", 500))
+BATCH_SIZE = 50
+CHECKPOINT_KEY = "rescreen_checkpoint"
+
+
+def stale_stage(parsed, versions=None):
+    """Earliest stage that must be recomputed for this parsed result, or None if current."""
+    versions = versions or ingestion.current_versions()
+    stamped = (parsed or {}).get('_versions') or {}
+    if not stamped or stamped.get('profile') != versions['profile']:
+        return "profile"
+    if (parsed.get('partial') or stamped.get('matcher') != versions['matcher']
+            or stamped.get('synonyms') != versions['synonyms']):
+        return "match"
+    if stamped.get('eligibility') != versions['eligibility']:
+        return "eligibility"
+    if stamped.get('scoring') != versions['scoring']:
+        return "score"
+    return None
+
+
+def refresh_application(app, job=None, versions=None):
+    """
+    Recompute the stale stages of one application row and store the result.
+    Returns the updated row (unchanged if already current). Raises ValueError
+    if the resume can no longer be read.
+    """
+    from backend import resume_parser, eligibility, scoring
+    versions = versions or ingestion.current_versions()
+    parsed = (json.loads(app['parsed_json']) if app.get('parsed_json') else None) or {}
+    stage = stale_stage(parsed, versions)
+    if stage is None:
+        return app
+    job = job or db.get_job(app['job_id'])
+    criteria = json.loads(job['criteria']) if job and job.get('criteria') else {}
+
+    if stage in ("profile", "match"):
+        profile = resume_parser.build_profile(uploads_store.resume_source(app), sha256=app.get('resume_sha256'))
+        if not profile.ok:
+            raise ValueError(profile.extraction['message'])
+        parsed, eligible, _reasons, score = ingestion.screen_profile(profile, criteria, debug='_debug' in parsed,
+                                                                     weights=scoring.job_weights(job))
+    else:
+        if stage == "eligibility":
+            eligible, _reasons, match_info = eligibility.check_eligibility(parsed, criteria)
+            parsed['match_info'] = match_info
+        else:
+            eligible = bool(app.get('eligible'))
+        score = scoring.score_parsed(parsed, criteria, parsed.get('match_info') or {}, scoring.job_weights(job))
+        parsed['_versions'] = versions
+    ingestion.save_screening(app, parsed, eligible, score, criteria_version=(job or {}).get('criteria_version'))
+    return db.get_application(app['id'])
+
+
+def explain_application(app, job=None):
+    """
+    Replace a triage-mode result (eligibility stopped at the first unmet
+    requirement) with the full explanation, recomputing eligibility and score
+    on the stored parse. Returns the updated row (unchanged if not triaged).
+    """
+    from backend import eligibility, scoring
+    parsed = (json.loads(app['parsed_json']) if app.get('parsed_json') else None) or {}
+    if not (parsed.get('match_info') or {}).get('triage'):
+        return app
+    versions = ingestion.current_versions()
+    if stale_stage(parsed, versions) in ("profile", "match"):
+        # re-screened from the resume, which explains in full anyway
+        return refresh_application(app, job, versions)
+    job = job or db.get_job(app['job_id'])
+    criteria = json.loads(job['criteria']) if job and job.get('criteria') else {}
+    eligible, _reasons, match_info = eligibility.check_eligibility(parsed, criteria)
+    parsed['match_info'] = match_info
+    score = scoring.score_parsed(parsed, criteria, match_info, scoring.job_weights(job))
+    parsed['_versions'] = versions
+    ingestion.save_screening(app, parsed, eligible, score, criteria_version=(job or {}).get('criteria_version'))
+    return db.get_application(app['id'])
+
+
+def refresh_for_view(apps, budget_s=None):
+    """
+    Refresh stale rows among `apps` (dicts from db) until the budget runs out;
+    any left over are handed to the background task. Returns the list with
+    refreshed rows swapped in.
+    """
+    deadline = Deadline(VIEW_REFRESH_BUDGET_S if budget_s is None else budget_s)
+    versions = ingestion.current_versions()
+    jobs = {}
+    out = []
+    leftover = False
+    for app in apps:
+        parsed = json.loads(app['parsed_json']) if app.get('parsed_json') else None
+        if parsed is None or app.get('status') == 'archived' or stale_stage(parsed, versions) is None:
+            out.append(app)
+            continue
+        if deadline.expired():
+            leftover = True
+            out.append(app)
+            continue
+        if app['job_id'] not in jobs:
+            jobs[app['job_id']] = db.get_job(app['job_id'])
+        try:
+            out.append(refresh_application(app, jobs[app['job_id']], versions))
+        except ValueError:
+            out.append(app)
+    if leftover:
+        start_rescreen()
+    return out
+
+
+# ---------- Background re-screen ----------
+def _load_checkpoint(versions):
+    raw = db.get_setting(CHECKPOINT_KEY)
+    try:
+        cp = json.loads(raw) if raw else {}
+    except ValueError:
+        cp = {}
+    # a checkpoint from a run against other versions is meaningless now
+    return cp.get('after_id', 0) if cp.get('versions') == versions else 0
+
+
+def _save_checkpoint(versions, after_id):
+    db.set_setting(CHECKPOINT_KEY, json.dumps({"versions": versions, "after_id": after_id}))
+
+
+def run_rescreen(task, max_items=MAX_PER_RUN, job_id=None):
+    """Refresh up to max_items stale applications, resuming from the last checkpoint."""
+    versions = ingestion.current_versions()
+    after_id = _load_checkpoint(versions) if job_id is None else 0
+    summary = {"refreshed": 0, "failed": 0, "remaining": False}
+    jobs = {}
+    done = 0
+    while done < max_items and not task.cancelled:
+        ids = db.get_stale_application_ids(versions, after_id=after_id, limit=min(BATCH_SIZE, max_items - done),
+                                           job_id=job_id)
+        if not ids:
+            break
+        task.set_total(task.total + len(ids))
+        for app_id in ids:
+            if task.cancelled:
+                break
+            app = db.get_application(app_id)
+            if app:
+                if app['job_id'] not in jobs:
+                    jobs[app['job_id']] = db.get_job(app['job_id'])
+                try:
+                    refresh_application(app, jobs[app['job_id']], versions)
+                    summary["refreshed"] += 1
+                except Exception as e:
+                    task.fail(app_id, str(e))
+                    summary["failed"] += 1
+            after_id = app_id
+            done += 1
+            task.advance(message=f"{summary['refreshed']} refreshed")
+        if job_id is None:
+            _save_checkpoint(versions, after_id)
+    summary["remaining"] = bool(db.get_stale_application_ids(versions, after_id=after_id, limit=1, job_id=job_id))
+    if job_id is None and not summary["remaining"]:
+        # full pass done; failed rows are retried from the start next run
+        _save_checkpoint(versions, 0)
+    return summary
+
+
+def start_rescreen(max_items=MAX_PER_RUN, job_id=None):
+    """Start a background re-screen unless one is already running; returns the Task."""
+    for t in tasks.list_tasks("rescreen"):
+        if not t.finished:
+            return t
+    return tasks.start_task("rescreen", run_rescreen, max_items=max_items, job_id=job_id)
+
+
+def count_stale(job_id=None, limit=1000):
+    return len(db.get_stale_application_ids(ingestion.current_versions(), limit=limit, job_id=job_id))
+
+
+# ---------- Criteria edits ----------
+def diff_criteria(old, new):
+    """What changed between two criteria dicts: {field: [old, new]} / {skills field: {added, removed}}."""
+    old, new = old or {}, new or {}
+    changes = {}
+    for key in ("min_experience", "min_publications", "required_degree"):
+        if old.get(key) != new.get(key):
+            changes[key] = [old.get(key), new.get(key)]
+    for key in ("required_skills", "optional_skills"):
+        before, after = old.get(key) or [], new.get(key) or []
+        added = [sk for sk in after if sk not in before]
+        removed = [sk for sk in before if sk not in after]
+        if added or removed:
+            changes[key] = {"added": added, "removed": removed}
+    return changes
+
+
+def update_job_criteria(job_id, criteria, changed_by="Admin"):
+    """
+    Save new criteria for a job and re-screen its applications against them in
+    the background. Returns (changes, task); task is None if nothing changed.
+    Raises ValueError if the job doesn't exist or is archived.
+    """
+    job = db.get_job(job_id)
+    if not job:
+        raise ValueError("Job not found")
+    old = json.loads(job['criteria']) if job.get('criteria') else {}
+    changes = diff_criteria(old, criteria)
+    if not changes:
+        return changes, None
+    db.update_job_criteria(job_id, criteria, changed_by=changed_by)
+    return changes, start_criteria_rescreen(job_id)
+
+
+def _added_skills(old_criteria, criteria):
+    """Skills of `criteria` the resume was not matched against under old_criteria (all of them if unknown)."""
+    before = set(ingestion._job_skills(old_criteria)) if old_criteria is not None else set()
+    return [sk for sk in ingestion._job_skills(criteria) if sk not in before]
+
+
+def _rematch(app, parsed, criteria):
+    """
+    The stored parse matched again against the job skills of `criteria`, from
+    the cached profile. Needed when the edit added skills: the stored skill
+    list only covers the skills the resume was matched against before, so a
+    new skill outside the synonym table would otherwise be missing for
+    everyone. Raises ValueError if the resume can no longer be read.
+    """
+    from backend import resume_parser
+    profile = resume_parser.build_profile(uploads_store.resume_source(app), sha256=app.get('resume_sha256'))
+    if not profile.ok:
+        raise ValueError(profile.extraction['message'])
+    rematched = resume_parser.match_profile(profile, job_skills=ingestion._job_skills(criteria),
+                                            debug='_debug' in parsed)
+    # keep the stored match_info: it still says whether the row was triaged
+    rematched['match_info'] = parsed.get('match_info') or {}
+    return rematched
+
+
+def _rescreen_stored(parsed, old_criteria, criteria):
+    """
+    Eligibility of a stored parse under new criteria, reusing old results
+    where possible (old_criteria=None: no reuse, full check).
+    """
+    from backend import eligibility
+    old_info = parsed.get('match_info') or {}
+    debug = 'debug_parsed_skills' in old_info
+    if old_info.get('triage'):
+        # triaged rows stay triaged; those who pass are explained in full
+        eligible, reasons, match_info = eligibility.check_eligibility(parsed, criteria, debug=debug, mode="triage")
+        if eligible:
+            eligible, reasons, match_info = eligibility.check_eligibility(parsed, criteria, debug=debug)
+        return eligible, match_info, False
+    if old_criteria is None:
+        eligible, _reasons, match_info = eligibility.check_eligibility(parsed, criteria, debug=debug)
+        return eligible, match_info, False
+    eligible, _reasons, match_info = eligibility.check_eligibility_incremental(parsed, old_info, old_criteria,
+                                                                              criteria, debug=debug)
+    return eligible, match_info, True
+
+
+def run_criteria_rescreen(task, job_id):
+    """
+    Re-screen the applications of a job screened against an older criteria
+    version, BATCH_SIZE rows per write. Stops early if the criteria are edited
+    again (that edit starts its own run). Returns a before/after eligibility
+    summary, also stored with the criteria version in job_criteria_history.
+    """
+    from backend import scoring
+    # one writer per job: let a cancelled earlier run finish its batch first
+    while any(t is not task and not t.finished for t in tasks.list_tasks(task.name)):
+        time.sleep(0.1)
+    job = db.get_job(job_id)
+    if not job:
+        raise ValueError("Job not found")
+    version = job.get('criteria_version') or 1
+    criteria = json.loads(job['criteria']) if job.get('criteria') else {}
+    history = {h['version']: json.loads(h['criteria']) if h.get('criteria') else {}
+               for h in db.get_job_criteria_history(job_id)}
+    versions = ingestion.current_versions()
+    summary = {"version": version, "processed": 0, "incremental": 0, "rematched": 0, "failed": 0,
+               "eligible_before": 0, "eligible_after": 0, "became_eligible": 0, "became_ineligible": 0}
+    after_id = 0
+    superseded = False
+    while not task.cancelled:
+        current = db.get_job(job_id) or {}
+        if current.get('criteria_version') != version:
+            superseded = True
+            break
+        # weights may be changed (rescreen.reweight_job) while this runs
+        weights = scoring.job_weights(current)
+        apps = db.get_outdated_criteria_applications(job_id, version, after_id=after_id, limit=BATCH_SIZE)
+        if not apps:
+            break
+        task.set_total(task.total + len(apps))
+        rows = []
+        for app in apps:
+            after_id = app['id']
+            before = bool(app.get('eligible'))
+            try:
+                parsed = json.loads(app['parsed_json']) or {}
+                if stale_stage(parsed, versions) in ("profile", "match"):
+                    # the stored parse itself is outdated: screen again from the resume
+                    eligible = bool(refresh_application(app, job, versions)['eligible'])
+                else:
+                    old_criteria = history.get(app.get('criteria_version') or 1)
+                    if _added_skills(old_criteria, criteria):
+                        # new skills must be looked for in the resume itself; the
+                        # re-matched skill list invalidates the old per-skill results
+                        parsed, old_criteria = _rematch(app, parsed, criteria), None
+                        summary["rematched"] += 1
+                    elif stale_stage(parsed, versions) == "eligibility":
+                        old_criteria = None
+                    eligible, match_info, incremental = _rescreen_stored(parsed, old_criteria, criteria)
+                    parsed['match_info'] = match_info
+                    score = scoring.score_parsed(parsed, criteria, match_info, weights)
+                    parsed['_versions'] = versions
+                    rows.append((app['id'], parsed, eligible, score, ingestion.screening_status(app), version))
+                    summary["incremental"] += incremental
+            except Exception as e:
+                task.fail(app['id'], str(e))
+                summary["failed"] += 1
+                continue
+            summary["processed"] += 1
+            summary["eligible_before"] += before
+            summary["eligible_after"] += eligible
+            summary["became_eligible"] += eligible and not before
+            summary["became_ineligible"] += before and not eligible
+        db.update_applications_parsed_bulk(rows)
+        task.advance(len(apps), message=f"{summary['processed']} re-screened")
+    if summary["processed"] or summary["failed"]:
+        _record_criteria_summary(job_id, version, summary)
+    summary["superseded"] = superseded
+    return summary
+
+
+def _record_criteria_summary(job_id, version, summary):
+    """Add a run's counts to the version's stored summary (a version may take several runs)."""
+    stored = {}
+    for h in db.get_job_criteria_history(job_id):
+        if h['version'] == version and h.get('summary'):
+            stored = json.loads(h['summary'])
+    merged = {k: (stored.get(k, 0) + v if k != "version" else v) for k, v in summary.items()}
+    db.set_criteria_change_summary(job_id, version, merged)
+
+
+def _criteria_task_name(job_id):
+    return f"criteria_rescreen_{job_id}"
+
+
+def start_criteria_rescreen(job_id):
+    """
+    Start re-screening a job's applications against its current criteria;
+    returns the Task. An earlier run for the job is cancelled (the new one
+    waits for it, then covers whatever it left).
+    """
+    for t in tasks.list_tasks(_criteria_task_name(job_id)):
+        if not t.finished:
+            t.cancel()
+    return tasks.start_task(_criteria_task_name(job_id), run_criteria_rescreen, job_id)
+
+
+def criteria_rescreen_task(job_id):
+    """The latest criteria re-screen Task of a job in this process, or None."""
+    found = tasks.list_tasks(_criteria_task_name(job_id))
+    return found[0] if found else None
+
+
+def count_outdated_criteria(job_id, limit=1000):
+    """Applications of a job still screened against an older criteria version."""
+    job = db.get_job(job_id)
+    if not job:
+        return 0
+    return len(db.get_outdated_criteria_applications(job_id, job.get('criteria_version') or 1, limit=limit))
+
+
+# ---------- Re-weighting scores ----------
+def reweight_job(job_id, weights):
+    """
+    Set a job's score weights ({component: weight}, see scoring.normalize_weights)
+    and re-rank its applications from their stored score components: one
+    matrix-vector product and one batched write, no parse or eligibility. Rows
+    without stored components are left alone: results from before scoring
+    version 2 are re-scored with the new weights by the stale-row refresh, and
+    triage rejections get their score when explained in full.
+    Returns {"rescored", "without_components", "rank_ms"}; raises ValueError for
+    invalid weights or an unknown job.
+    """
+    from backend import scoring
+    scoring.normalize_weights(weights)
+    if not db.get_job(job_id):
+        raise ValueError("Job not found")
+    db.set_job_score_weights(job_id, weights)
+    ids, rows = db.get_score_components(job_id)
+    t0 = time.perf_counter()
+    scores = scoring.rank(np.array(rows, dtype=np.float64).reshape(len(rows), len(scoring.COMPONENTS)), weights)
+    rank_ms = (time.perf_counter() - t0) * 1000
+    db.update_scores_bulk(zip(ids, scores.tolist()))
+    return {"rescored": len(ids), "without_components": db.count_active_applications(job_id) - len(ids),
+            "rank_ms": rank_ms}
@@ -1,18 +1,8 @@
 # backend/resume_parser.py
-import os, re, json
+import os, re, json, hashlib, threading
+from collections import OrderedDict
 from datetime import datetime
-from typing import List, Optional, Dict, Any
-
-# optional imports
-try:
-    from pdfminer.high_level import extract_text as extract_pdf_text
-except Exception:
-    extract_pdf_text = None
-
-try:
-    from docx import Document
-except Exception:
-    Document = None
+from typing import List, Optional, Dict, Any, Tuple
 
 # spaCy for PhraseMatcher
 try:
@@ -25,56 +15,112 @@ except Exception:
 
 # fuzzy fallback
 try:
+    import numpy as np
     from rapidfuzz import process, fuzz
     HAS_RAPIDFUZZ = True
 except Exception:
     HAS_RAPIDFUZZ = False
 
+from backend import extraction
+from backend.extraction import ExtractionResult
+from backend.text_cache import text_cache, profile_cache, sha256_file, sha256_bytes
+from backend.skill_scanner import SkillScanner
+from backend.field_extractor import TextViews, extract_fields
+from backend.deadline import Deadline, UNLIMITED
+from backend import synonyms
+from backend.synonyms import SynonymIndex
+
+FUZZY_SKILL_THRESHOLD = 80
+_COMPACT_RE = re.compile(r'[\s\.]+')
+
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 UPLOADS_DIR = os.path.join(BASE_DIR, "uploads")
 os.makedirs(UPLOADS_DIR, exist_ok=True)
 
 
-# ---------- Configurable synonyms map (extendable) ----------
-GLOBAL_SKILL_SYNONYMS = {
-    "javascript": ["js", "java script"],
-    "react": ["react.js", "reactjs", "react js"],
-    "tailwindcss": ["tailwind", "tailwind css", "tailwind.css"],
-    "pocketbase": ["pocket base", "pocket-base"],
-    "firebase": ["google firebase", "firebase realtime", "firebase auth"],
-    "git": ["github", "gitlab", "version control"],
-    "python": ["py"],
-    # design examples
-    "figma": ["figma design"],
-    "photoshop": ["adobe photoshop", "ps"],
-}
+# Skill synonyms come from the shared, DB-managed registry (backend/synonyms.py);
+# its version is part of the skill-set cache key.
+
+# number of compiled job skill sets kept in memory (one per distinct job criteria)
+SKILL_SET_CACHE_SIZE = 64
+
+
+# bump whenever extraction output changes so cached text is not reused
+EXTRACTOR_VERSION = "2"
+# bump whenever the job-agnostic profile (fields, tokens, tokenization) changes
+PROFILE_VERSION = "1"
+# bump whenever skill matching (match_profile) output changes
+MATCHER_VERSION = "1"
 
 
 # ---------- Helpers ----------
-def extract_text_from_file(path: str) -> str:
-    ext = os.path.splitext(path)[1].lower()
-    text = ""
+def _backends_tag():
+    return hashlib.sha1(extraction.backends_signature().encode("utf-8")).hexdigest()[:8]
+
+
+def extract_text_with_status(path: str) -> ExtractionResult:
+    """
+    Extract text from a resume file in the extraction sandbox (see
+    backend/extraction.py). Successful results (text plus format/truncated) are
+    cached on disk keyed by the sha256 of the file bytes + EXTRACTOR_VERSION + the selected extractor
+    backends, so re-screening or the same file submitted for several jobs skips
+    the (slow) PDF layout analysis, and switching backends never serves text
+    produced by another one.
+    """
     try:
-        if ext == ".pdf" and extract_pdf_text:
-            text = extract_pdf_text(path) or ""
-        elif ext in (".docx", ".doc") and Document:
-            doc = Document(path)
-            text = "\n".join([p.text for p in doc.paragraphs])
-        else:
-            with open(path, "rb") as f:
-                raw = f.read()
-                try:
-                    text = raw.decode("utf-8")
-                except:
-                    text = raw.decode("latin-1", errors="ignore")
-    except Exception:
+        sha = sha256_file(path)
+    except OSError as e:
+        return extraction.failure("not_found", str(e))
+    return _extract_text(path, sha)
+
+
+# layout of a text cache entry; part of the key, so entries in an older layout are misses
+TEXT_ENTRY_FORMAT = "2"
+
+# least time a budgeted extraction is given, even when the budget is (nearly) spent
+EXTRACT_MIN_BUDGET_S = float(os.environ.get("EXTRACT_MIN_BUDGET_S", 0.5))
+
+
+def _extract_text(source, sha: str, deadline: Deadline = UNLIMITED) -> ExtractionResult:
+    """
+    Cached extraction. Under a budget the sandbox timeout is the time left
+    (at least EXTRACT_MIN_BUDGET_S, at most extraction.TIMEOUT_S); running out
+    of it is a "deadline" failure, to be retried without a budget.
+    """
+    # the entry keeps the extraction metadata (format, truncated) with the
+    # text, so a hit rebuilds the same ExtractionResult as the extraction
+    key = f"{sha}-{EXTRACTOR_VERSION}-{_backends_tag()}-{TEXT_ENTRY_FORMAT}"
+    cached = text_cache.get(key)
+    if cached is not None:
         try:
-            with open(path, "rb") as f:
-                raw = f.read()
-                text = raw.decode("utf-8", errors="ignore")
-        except:
-            text = ""
-    return text or ""
+            entry = json.loads(cached)
+            return ExtractionResult(entry["text"], format=entry.get("format"), truncated=entry.get("truncated", False))
+        except (ValueError, KeyError, TypeError):
+            pass  # unreadable entry: extract again
+    timeout_s = None
+    remaining = deadline.remaining()
+    if remaining < extraction.TIMEOUT_S:
+        timeout_s = max(EXTRACT_MIN_BUDGET_S, remaining)
+    res = extraction.extract_text_safe(source, timeout_s=timeout_s)
+    if res.reason == "timeout" and timeout_s is not None and timeout_s < extraction.TIMEOUT_S:
+        # cut short by the caller's budget, not by the hard limit
+        return extraction.failure("deadline", res.detail, res.format)
+    if res.ok:
+        text_cache.put(key, json.dumps({"text": res.text, "format": res.format, "truncated": res.truncated},
+                                       separators=(",", ":")).encode("utf-8"))
+    return res
+
+
+def extract_text_from_file(path: str) -> str:
+    return extract_text_with_status(path).text
+
+
+def text_cache_stats() -> Dict[str, Any]:
+    return text_cache.stats()
+
+
+def profile_cache_stats() -> Dict[str, Any]:
+    return profile_cache.stats()
 
 
 def _normalize(s: str) -> str:
@@ -89,14 +135,12 @@ def _compact(s: str) -> str:
     return re.sub(r'[\s\.]+', '', _normalize(s))
 
 
-def _expand_skill_variants(skill: str, extra_synonyms: Optional[Dict[str, List[str]]] = None):
+def _expand_skill_variants(skill: str, extra_synonyms: Optional[Dict[str, List[str]]] = None,
+                           index: Optional[SynonymIndex] = None):
+    index = index or synonyms.get_index()
     s = _normalize(skill)
-    variants = [s]
-    # global synonyms
-    for canon, vals in GLOBAL_SKILL_SYNONYMS.items():
-        if canon == s or s in [ _normalize(v) for v in vals ]:
-            variants = [canon] + vals
-            break
+    # global synonyms: O(1) reverse-index lookup, variants already normalized
+    variants = list(index.variants_for(skill)) or [s]
     # extra synonyms override/extend
     if extra_synonyms:
         for canon, vals in extra_synonyms.items():
@@ -108,108 +152,478 @@ def _expand_skill_variants(skill: str, extra_synonyms: Optional[Dict[str, List[s
     return variants
 
 
+# ---------- Compiled skill sets (cached per job) ----------
+class CompiledSkillSet:
+    """
+    Job-specific matching state: the candidate variants, their compact forms,
+    the multi-pattern scanner and the spaCy PhraseMatcher built from them.
+    Depends only on the job skills and synonyms, so it is built once and shared
+    by every resume parsed for that job.
+    """
+    __slots__ = ("key", "variants", "compact", "scanner", "matcher", "targets")
+
+    def __init__(self, key: str, variants: frozenset, compact: Dict[str, str], scanner: SkillScanner, matcher=None,
+                 targets: Tuple[Tuple[str, frozenset], ...] = ()):
+        self.key = key
+        self.variants = variants
+        self.compact = compact
+        self.scanner = scanner
+        self.matcher = matcher
+        # (job skill, its variants): a job skill is resolved once any variant is found
+        self.targets = targets
+
+
+_skill_set_cache: "OrderedDict[str, CompiledSkillSet]" = OrderedDict()
+_skill_set_lock = threading.Lock()
+_skill_set_stats = {"hits": 0, "misses": 0}
+
+
+def _skill_set_key(job_skills: Optional[List[str]], extra_synonyms: Optional[Dict[str, List[str]]],
+                   synonyms_version: int) -> str:
+    payload = json.dumps([list(job_skills or []), extra_synonyms or None, synonyms_version], sort_keys=True)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def _build_skill_set(key: str,
+                     job_skills: Optional[List[str]],
+                     extra_synonyms: Optional[Dict[str, List[str]]],
+                     index: SynonymIndex) -> CompiledSkillSet:
+    # Build candidate variants using job_skills + global synonyms
+    candidate_variants = set()
+    targets = []
+    if job_skills:
+        for s in job_skills:
+            skill_variants = _expand_skill_variants(s, extra_synonyms=extra_synonyms, index=index)
+            candidate_variants.update(skill_variants)
+            targets.append((s, frozenset(skill_variants)))
+    # include global synonyms keys as possible detects
+    if extra_synonyms:
+        for canon, vals in extra_synonyms.items():
+            candidate_variants.add(_normalize(canon))
+            for vv in vals:
+                candidate_variants.add(_normalize(vv))
+    else:
+        for group in index.groups.values():
+            candidate_variants.update(group)
+
+    compact = {var: var.replace(" ", "") for var in candidate_variants if var}
+
+    matcher = None
+    if nlp and PhraseMatcher:
+        try:
+            patterns = [nlp.make_doc(var) for var in sorted(candidate_variants) if var and len(var.split()) <= 6]
+            if patterns:
+                matcher = PhraseMatcher(nlp.vocab, attr="LOWER")
+                matcher.add("SKILLS", patterns)
+        except Exception:
+            matcher = None
+    return CompiledSkillSet(key, frozenset(candidate_variants), compact, SkillScanner(candidate_variants), matcher,
+                            tuple(targets))
+
+
+def get_compiled_skill_set(job_skills: Optional[List[str]] = None,
+                           extra_synonyms: Optional[Dict[str, List[str]]] = None) -> CompiledSkillSet:
+    """Return the cached CompiledSkillSet for this job, building it on first use (LRU)."""
+    index = synonyms.get_index()
+    key = _skill_set_key(job_skills, extra_synonyms, index.version)
+    with _skill_set_lock:
+        cached = _skill_set_cache.get(key)
+        if cached is not None:
+            _skill_set_cache.move_to_end(key)
+            _skill_set_stats["hits"] += 1
+            return cached
+        _skill_set_stats["misses"] += 1
+    compiled = _build_skill_set(key, job_skills, extra_synonyms, index)
+    with _skill_set_lock:
+        _skill_set_cache[key] = compiled
+        _skill_set_cache.move_to_end(key)
+        while len(_skill_set_cache) > SKILL_SET_CACHE_SIZE:
+            _skill_set_cache.popitem(last=False)
+    return compiled
+
+
+def skill_set_cache_info() -> Dict[str, int]:
+    with _skill_set_lock:
+        return {**_skill_set_stats, "size": len(_skill_set_cache), "max_size": SKILL_SET_CACHE_SIZE}
+
+
+def clear_skill_set_cache():
+    with _skill_set_lock:
+        _skill_set_cache.clear()
+        _skill_set_stats.update(hits=0, misses=0)
+
+
+def _fuzzy_skill_matches(job_skills: List[str], tokens, workers: int = -1) -> List[tuple]:
+    """
+    Best partial_ratio match of every job skill against the resume tokens, as
+    (skill, token, score) for scores >= FUZZY_SKILL_THRESHOLD.
+    One skills x tokens cdist call on `workers` threads (-1: one per core);
+    tokens are deduplicated on their compact form keeping the first token per
+    form (what list.index() used to return), and ties resolve to the first
+    best token like process.extractOne.
+    """
+    tokens = list(tokens)
+    # compact all tokens with one regex pass ("\x00" survives the substitution)
+    compacts = _COMPACT_RE.sub('', "\x00".join(tokens)).split("\x00") if tokens else []
+    first_token = {}
+    for c, tok in zip(compacts, tokens):
+        if c and c not in first_token:  # empty forms can never score
+            first_token[c] = tok
+    if not first_token:
+        return []
+    choices = list(first_token)
+    queries = [_COMPACT_RE.sub('', _normalize(sk)) for sk in job_skills]
+    scores = process.cdist(queries, choices, scorer=fuzz.partial_ratio, score_cutoff=FUZZY_SKILL_THRESHOLD,
+                           dtype=np.float64, workers=workers)
+    best_idx = scores.argmax(axis=1)
+    out = []
+    for i, sk in enumerate(job_skills):
+        j = int(best_idx[i])
+        score = float(scores[i, j])
+        if score >= FUZZY_SKILL_THRESHOLD:
+            out.append((sk, first_token[choices[j]], score))
+    return out
+
+
+# ---------- Match tiers ----------
+MATCH_TIERS = ("exact", "heuristic", "phrase", "fuzzy")
+
+_tier_lock = threading.Lock()
+_tier_stats = {"parses": 0, **{f"{t}_hits": 0 for t in MATCH_TIERS}, **{f"{t}_skipped": 0 for t in MATCH_TIERS}}
+
+
+def _resolve(unresolved: List[tuple], found: set, tier_hits: Dict[str, int], tier: str) -> List[tuple]:
+    """Drop the job skills that now have a found variant; credit them to `tier`."""
+    still = [(sk, variants) for sk, variants in unresolved if variants.isdisjoint(found)]
+    tier_hits[tier] += len(unresolved) - len(still)
+    return still
+
+
+def _record_tiers(tier_hits: Dict[str, int], skipped: List[str]):
+    with _tier_lock:
+        _tier_stats["parses"] += 1
+        for tier, n in tier_hits.items():
+            _tier_stats[f"{tier}_hits"] += n
+        for tier in skipped:
+            _tier_stats[f"{tier}_skipped"] += 1
+
+
+def match_tier_stats() -> Dict[str, int]:
+    """Process-wide job skills resolved per tier and tiers skipped by early exit."""
+    with _tier_lock:
+        return dict(_tier_stats)
+
+
+# ---------- spaCy docs ----------
+# The skill matcher only looks at the LOWER attribute, so the tagger/parser/NER
+# add nothing to it; docs are tokenized with every pipeline component disabled.
+def make_doc(text: str):
+    if not nlp:
+        return None
+    return nlp.make_doc(text or "")
+
+
+def make_docs(texts: List[str], batch_size: int = 32):
+    """Tokenize many resume texts in one nlp.pipe stream (used by bulk ingestion)."""
+    if not nlp:
+        return [None] * len(texts)
+    return list(nlp.pipe([t or "" for t in texts], batch_size=batch_size, disable=nlp.pipe_names))
+
+
+# ---------- Resume profiles (job-agnostic stage) ----------
+class ResumeProfile:
+    """
+    The job-agnostic half of a parse: extracted text, contact / degree /
+    experience / publication fields, the heuristic tokens and the spaCy
+    tokenization (stored as words + trailing-space flags, enough to rebuild
+    the Doc without re-tokenizing).
+
+    Serializable with to_dict()/from_dict(). build_profile() caches it on
+    disk per file content, so matching one resume against many jobs, or
+    re-screening it, only runs match_profile().
+    """
+    __slots__ = ("sha256", "text", "fields", "tokens", "words", "spaces", "extraction", "_views", "_doc")
+
+    def __init__(self, text: str, fields: Dict[str, Any], tokens, words: Optional[List[str]] = None,
+                 spaces: Optional[str] = None, extraction: Optional[Dict[str, Any]] = None,
+                 sha256: Optional[str] = None):
+        self.sha256 = sha256
+        self.text = text or ""
+        self.fields = fields
+        self.tokens = tuple(tokens)
+        self.words = words
+        self.spaces = spaces  # "1"/"0" per word: followed by a space
+        self.extraction = extraction
+        self._views = None
+        self._doc = None
+
+    @classmethod
+    def from_text(cls, text: str, doc=None, extraction: Optional[Dict[str, Any]] = None,
+                  sha256: Optional[str] = None, tokenize: bool = True) -> "ResumeProfile":
+        """tokenize=False leaves the spaCy tokenization to the first use of .doc."""
+        views = TextViews(text)
+        fields = extract_fields(views.text, views)
+        if doc is None and tokenize:
+            doc = make_doc(views.text)
+        words = spaces = None
+        if doc is not None:
+            words = [tok.text for tok in doc]
+            spaces = "".join("1" if tok.whitespace_ else "0" for tok in doc)
+        profile = cls(views.text, fields, views.tokens, words, spaces, extraction, sha256)
+        profile._views = views
+        profile._doc = doc
+        return profile
+
+    @property
+    def ok(self) -> bool:
+        return not self.extraction or self.extraction.get("ok", True)
+
+    @property
+    def deferred(self) -> bool:
+        """Extraction ran out of the latency budget (not a bad file): retry without one."""
+        return bool(self.extraction) and self.extraction.get("reason") == "deadline"
+
+    @property
+    def views(self) -> TextViews:
+        if self._views is None:
+            self._views = TextViews(self.text, tokens=self.tokens)
+        return self._views
+
+    @property
+    def doc(self):
+        """spaCy Doc for the text (rebuilt from the stored tokenization), or None without spaCy."""
+        if self._doc is None and nlp is not None:
+            if self.words is None:
+                self._doc = make_doc(self.text)
+            else:
+                from spacy.tokens import Doc
+                self._doc = Doc(nlp.vocab, words=self.words, spaces=[c == "1" for c in self.spaces])
+        return self._doc
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"version": PROFILE_VERSION, "sha256": self.sha256, "text": self.text, "fields": self.fields,
+                "tokens": list(self.tokens), "words": self.words, "spaces": self.spaces,
+                "extraction": self.extraction}
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "ResumeProfile":
+        return cls(d.get("text", ""), d.get("fields") or {}, d.get("tokens") or (), d.get("words"),
+                   d.get("spaces"), d.get("extraction"), d.get("sha256"))
+
+
+def profile_version() -> str:
+    """Everything a cached profile depends on besides the file bytes."""
+    return f"{PROFILE_VERSION}-{EXTRACTOR_VERSION}-{_backends_tag()}"
+
+
+def _profile_key(sha: str) -> str:
+    return f"{sha}-{profile_version()}"
+
+
+def _load_profile(key: str) -> Optional[ResumeProfile]:
+    data = profile_cache.get(key)
+    if data is None:
+        return None
+    try:
+        d = json.loads(data)
+    except ValueError:
+        return None
+    if d.get("version") != PROFILE_VERSION:
+        return None
+    return ResumeProfile.from_dict(d)
+
+
+def _store_profile(key: str, profile: ResumeProfile):
+    profile_cache.put(key, json.dumps(profile.to_dict(), separators=(",", ":")).encode("utf-8"))
+
+
+def build_profile(source, budget_s=None, sha256: Optional[str] = None) -> ResumeProfile:
+    """
+    Job-agnostic profile of a resume file, from the profile cache when this
+    file content was seen before. Extraction failures give a profile with
+    ok == False and the failure in .extraction (never cached).
+    - source: file path, or the file's bytes (e.g. an upload still in memory).
+    - budget_s: seconds or a Deadline; extraction gets the time left (the
+      profile is .deferred if it runs out), and if the budget has run out once
+      the text is extracted, tokenization is deferred and the profile is not cached.
+    - sha256: content hash if already known (uploads store), skips re-hashing.
+    """
+    return build_profiles([source], budget_s=budget_s, shas=[sha256])[0]
+
+
+def build_profiles(sources: List[Any], budget_s=None, shas: Optional[List[Optional[str]]] = None) -> List[ResumeProfile]:
+    """
+    build_profile for many files; cache misses are tokenized in one nlp.pipe
+    stream, and files with identical content are extracted and parsed once.
+    """
+    deadline = Deadline.coerce(budget_s)
+    profiles: List[Optional[ResumeProfile]] = [None] * len(sources)
+    pending = []  # (index, sha, ExtractionResult)
+    first_seen: Dict[str, int] = {}
+    duplicates = []  # (index, index of the first file with the same content)
+    for i, p in enumerate(sources):
+        sha = shas[i] if shas else None
+        if not sha and isinstance(p, (bytes, bytearray, memoryview)):
+            sha = sha256_bytes(p)
+        elif not sha:
+            try:
+                sha = sha256_file(p)
+            except OSError as e:
+                profiles[i] = ResumeProfile.from_text("", extraction=extraction.failure("not_found", str(e)).to_dict())
+                continue
+        if sha in first_seen:
+            duplicates.append((i, first_seen[sha]))
+            continue
+        first_seen[sha] = i
+        cached = _load_profile(_profile_key(sha))
+        if cached is not None:
+            profiles[i] = cached
+            continue
+        res = _extract_text(p, sha, deadline)
+        if not res.ok:
+            profiles[i] = ResumeProfile.from_text("", extraction=res.to_dict(), sha256=sha)
+            continue
+        pending.append((i, sha, res))
+
+    if pending and deadline.expired():
+        # out of time: fields and tokens only, the Doc is built if a later
+        # (unbudgeted) match needs it; incomplete profiles are not cached
+        for i, sha, res in pending:
+            profiles[i] = ResumeProfile.from_text(res.text, extraction=res.to_dict(), sha256=sha, tokenize=False)
+    else:
+        docs = make_docs([res.text for _i, _sha, res in pending])
+        for (i, sha, res), doc in zip(pending, docs):
+            profile = ResumeProfile.from_text(res.text, doc=doc, extraction=res.to_dict(), sha256=sha)
+            _store_profile(_profile_key(sha), profile)
+            profiles[i] = profile
+    for i, first in duplicates:
+        profiles[i] = profiles[first]
+    return profiles
+
+
 # ---------- Main parser ----------
 def parse_resume(path: str,
                  job_skills: Optional[List[str]] = None,
                  extra_synonyms: Optional[Dict[str, List[str]]] = None,
-                 debug: bool = False) -> Dict[str, Any]:
+                 debug: bool = False,
+                 budget_s=None) -> Dict[str, Any]:
     """
     Parse resume and return structured dict.
     - job_skills: list of skills from the job posting to focus extraction.
-    - extra_synonyms: optional dict to extend GLOBAL_SKILL_SYNONYMS for this job.
+    - extra_synonyms: optional dict replacing the synonym registry for this job.
     - debug: include debug helpers and candidates found.
+    - budget_s: latency budget (seconds or a Deadline shared with later stages);
+      see match_profile.
+    Equivalent to match_profile(build_profile(path), ...).
     """
-    text = extract_text_from_file(path)
-    t = text or ""
-    t_norm = _normalize(t)
+    deadline = Deadline.coerce(budget_s)
+    return match_profile(build_profile(path, budget_s=deadline), job_skills=job_skills,
+                         extra_synonyms=extra_synonyms, debug=debug, budget_s=deadline)
 
-    # contact
-    email_m = re.search(r'[\w\.-]+@[\w\.-]+\.\w+', t)
-    phone_m = re.search(r'(\+?\d[\d\-\s]{7,}\d)', t)
 
-    # degrees: heuristics
-    degrees = []
-    deg_patterns = [r"\b(b\.?tech\b)", r"\b(b\.?des\b)", r"\b(bachelor of [a-z ]+)\b", r"\b(m\.?tech\b)", r"\b(ph\.?d\b)"]
-    for p in deg_patterns:
-        for m in re.findall(p, t, flags=re.I):
-            degrees.append(_normalize(m))
+def parse_resume_text(text: str,
+                      job_skills: Optional[List[str]] = None,
+                      extra_synonyms: Optional[Dict[str, List[str]]] = None,
+                      debug: bool = False,
+                      doc=None) -> Dict[str, Any]:
+    """
+    Same as parse_resume but on already extracted text.
+    - doc: optional pre-tokenized spaCy doc for `text` (see make_docs).
+    """
+    return match_profile(ResumeProfile.from_text(text, doc=doc), job_skills=job_skills,
+                         extra_synonyms=extra_synonyms, debug=debug)
 
-    # experience years heuristic
-    years = 0
-    for m in re.findall(r'(\d{1,2})\s+years', t.lower()):
-        try:
-            v = int(m)
-            if v > years:
-                years = v
-        except:
-            pass
 
-    # publications heuristic
-    pubs = len(re.findall(r'\b(publication|published|journal|conference|doi)\b', t, flags=re.I))
+def match_profile(profile: ResumeProfile,
+                  job_skills: Optional[List[str]] = None,
+                  extra_synonyms: Optional[Dict[str, List[str]]] = None,
+                  debug: bool = False,
+                  budget_s=None,
+                  workers: int = -1) -> Dict[str, Any]:
+    """
+    Job-specific stage: match a ResumeProfile against the job skills. Returns
+    the parse_resume dict (profile fields + skills).
+    - budget_s: seconds or a Deadline. Once it has run out the expensive tiers
+      (spaCy phrase matching, fuzzy) are skipped; the result then has
+      partial=True and lists them in partial_stages.
+    - workers: threads for the fuzzy tier (-1: one per core; 1 inside a
+      process pool that already runs one worker per core).
+    """
+    deadline = Deadline.coerce(budget_s)
+    t = profile.text
+    views = profile.views
+    t_norm = views.norm
 
-    # Build candidate variants using job_skills + global synonyms
-    candidate_variants = set()
-    if job_skills:
-        for s in job_skills:
-            for v in _expand_skill_variants(s, extra_synonyms=extra_synonyms):
-                candidate_variants.add(v)
-    # include global synonyms keys as possible detects
-    for canon, vals in (extra_synonyms or GLOBAL_SKILL_SYNONYMS).items():
-        candidate_variants.add(_normalize(canon))
-        for vv in vals:
-            candidate_variants.add(_normalize(vv))
+    # job-specific variants + matcher (compiled once per job skill set)
+    skill_set = get_compiled_skill_set(job_skills, extra_synonyms)
+    candidate_variants = skill_set.variants
 
     # heuristic tokens from entire text
-    heuristic_tokens = set(re.findall(r'[A-Za-z0-9\.\+\#]{2,}', t))
-    heuristic_norm = {_normalize(tok) for tok in heuristic_tokens if len(tok) > 1}
+    heuristic_norm = views.tokens
 
     found = set()
     debug_found = {"phrase_matches": [], "heuristic_matches": [], "fuzzy_matches": []}
 
-    # Try spaCy PhraseMatcher first for robust phrase detection
-    if nlp and PhraseMatcher:
+    # Tiers run cheapest first. With job skills, a tier only runs while some
+    # job skill is unresolved, and fuzzy only scores the unresolved skills, so
+    # resumes that state every skill verbatim never reach spaCy or rapidfuzz.
+    # Without job skills there is nothing to resolve and every tier runs.
+    targets = skill_set.targets
+    unresolved = list(targets)
+    tier_hits = {tier: 0 for tier in MATCH_TIERS}
+    skipped = []
+    partial_stages = []
+
+    # tier 1 - exact: substring/compact scanning, one automaton pass over each text
+    found |= skill_set.scanner.scan(t_norm, views.compact)
+    unresolved = _resolve(unresolved, found, tier_hits, "exact")
+
+    # tier 2 - heuristic: match any heuristic token containing or contained-in candidate variants.
+    # Every token is a substring of t_norm, so "variant inside token" is already
+    # covered by the scan above; only "token inside variant" can add new hits.
+    if unresolved or not targets:
+        for h in heuristic_norm:
+            hits = skill_set.scanner.variants_containing(h)
+            if debug:
+                hits = hits | skill_set.scanner.variants_within(h)
+            if hits:
+                found |= hits
+                debug_found["heuristic_matches"].extend([h] * len(hits))
+        unresolved = _resolve(unresolved, found, tier_hits, "heuristic")
+    else:
+        skipped.append("heuristic")
+
+    # tier 3 - phrase: spaCy PhraseMatcher (needs the Doc)
+    if skill_set.matcher is not None and (unresolved or not targets) and deadline.expired():
+        partial_stages.append("phrase")
+    elif skill_set.matcher is not None and (unresolved or not targets):
         try:
-            matcher = PhraseMatcher(nlp.vocab, attr="LOWER")
-            patterns = [nlp.make_doc(var) for var in sorted(candidate_variants) if var and len(var.split()) <= 6]
-            if patterns:
-                matcher.add("SKILLS", patterns)
-                doc = nlp(t)
-                matches = matcher(doc)
-                for mid, start, end in matches:
-                    span = doc[start:end].text
-                    found.add(_normalize(span))
-                    debug_found["phrase_matches"].append(span)
+            doc = profile.doc
+            for mid, start, end in skill_set.matcher(doc):
+                span = doc[start:end].text
+                found.add(_normalize(span))
+                debug_found["phrase_matches"].append(span)
         except Exception:
             pass
+        unresolved = _resolve(unresolved, found, tier_hits, "phrase")
+    elif skill_set.matcher is not None:
+        skipped.append("phrase")
 
-    # substring/compact scanning
-    text_compact = re.sub(r'[\s\.]+', '', t_norm)
-    for var in candidate_variants:
-        if var and (var in t_norm or var.replace(" ", "") in text_compact):
-            found.add(var)
-
-    # heuristics: match any heuristic token containing or contained-in candidate variants
-    for h in heuristic_norm:
-        for var in candidate_variants:
-            if var in h or h in var:
-                found.add(var)
-                debug_found["heuristic_matches"].append(h)
-
-    # fuzzy fallback using rapidfuzz (match job_skills to heuristic tokens)
-    if HAS_RAPIDFUZZ and job_skills:
-        parsed_list = list(heuristic_norm)
-        compact_list = [re.sub(r'[\s\.]+', '', x) for x in parsed_list]
-        for sk in job_skills:
-            sk_compact = re.sub(r'[\s\.]+', '', _normalize(sk))
-            try:
-                best = process.extractOne(sk_compact, compact_list, scorer=fuzz.partial_ratio) if compact_list else None
-                if best and best[1] >= 80:
-                    idx = compact_list.index(best[0])
-                    matched = parsed_list[idx]
-                    found.add(_normalize(matched))
-                    debug_found["fuzzy_matches"].append((sk, matched, best[1]))
-            except Exception:
-                pass
+    # tier 4 - fuzzy fallback using rapidfuzz (unresolved job skills vs heuristic tokens)
+    if HAS_RAPIDFUZZ and unresolved and deadline.expired():
+        partial_stages.append("fuzzy")
+    elif HAS_RAPIDFUZZ and unresolved:
+        try:
+            fuzzy = _fuzzy_skill_matches([sk for sk, _variants in unresolved], heuristic_norm, workers)
+            for sk, matched, score in fuzzy:
+                found.add(_normalize(matched))
+                debug_found["fuzzy_matches"].append((sk, matched, score))
+                tier_hits["fuzzy"] += 1
+        except Exception:
+            pass
+    elif HAS_RAPIDFUZZ and targets:
+        skipped.append("fuzzy")
+    _record_tiers(tier_hits, skipped)
 
     # soft keywords
     soft_kw = ["communication","interpersonal","presentation","collaborat","team","client"]
@@ -220,14 +634,18 @@ def parse_resume(path: str,
     skills = sorted({ _normalize(s) for s in found })
 
     parsed = {
-        "email": email_m.group(0) if email_m else None,
-        "phone": phone_m.group(0) if phone_m else None,
-        "degrees": degrees,
-        "experience_years": years,
-        "publications": pubs,
+        **profile.fields,
         "skills": skills,
         "raw_text_excerpt": t[:4000]
     }
+    if targets:
+        parsed["match_tiers"] = {**tier_hits, "unresolved": len(unresolved) - tier_hits["fuzzy"],
+                                 "skipped": skipped}
+    if partial_stages:
+        parsed["partial"] = True
+        parsed["partial_stages"] = partial_stages
+    if profile.extraction is not None:
+        parsed["extraction"] = dict(profile.extraction)
     if debug:
         parsed["_debug"] = {
             "candidate_variants": sorted(list(candidate_variants))[:300],
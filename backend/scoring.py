@@ -1,15 +1,58 @@
 # backend/scoring.py
-def compute_score(parsed_resume, criteria, match_info):
+"""
+Candidate score (0-100): a weighted sum of five component percentages (each
+0-1), computed at screening time and stored per application (parsed
+['score_components'], mirrored into the score_* columns). Weights are per job
+(jobs.score_weights, DEFAULT_WEIGHTS when unset) and only relative: they are
+scaled to sum to 100. Re-weighting a job is one matrix-vector product over its
+stored components (rank), without re-running parse or eligibility.
+"""
+import json
+
+import numpy as np
+
+# bump whenever the component formulas change
+SCORING_VERSION = "3"
+
+COMPONENTS = ("required_skills", "degree", "experience", "optional_skills", "publications")
+DEFAULT_WEIGHTS = {
+    "required_skills": 50.0,  # required skills coverage
+    "degree": 15.0,           # degree match strength
+    "experience": 15.0,       # experience relative to the minimum
+    "optional_skills": 10.0,  # optional skills bonus
+    "publications": 10.0,     # publications bonus
+}
+
+
+def normalize_weights(weights=None):
     """
-    Returns a numeric score (0-100).
-    Weights:
-      - Required skills coverage: 50%
-      - Degree match strength: 15%
-      - Experience (relative to min): 15%
-      - Optional skills bonus: 10%
-      - Publications bonus: 10%
+    Weights as a vector in COMPONENTS order, scaled to sum to 100. `weights` is a
+    {component: weight} dict (missing components default to 0) or None for
+    DEFAULT_WEIGHTS. Raises ValueError for unknown components, negative weights or
+    an all-zero set.
     """
-    score = 0.0
+    if weights is None:
+        weights = DEFAULT_WEIGHTS
+    unknown = set(weights) - set(COMPONENTS)
+    if unknown:
+        raise ValueError(f"Unknown score components: {', '.join(sorted(unknown))}")
+    vec = np.array([float(weights.get(c) or 0) for c in COMPONENTS], dtype=np.float64)
+    if (vec < 0).any():
+        raise ValueError("Score weights can't be negative")
+    total = vec.sum()
+    if total <= 0:
+        raise ValueError("At least one score weight must be positive")
+    return vec * (100.0 / total)
+
+
+def job_weights(job):
+    """A job's weights as a {component: weight} dict (DEFAULT_WEIGHTS if not configured)."""
+    stored = (job or {}).get('score_weights')
+    return json.loads(stored) if stored else dict(DEFAULT_WEIGHTS)
+
+
+def compute_components(parsed_resume, criteria, match_info):
+    """Returns {component: percentage (0-1)} for the COMPONENTS."""
     # Required skills
     required = criteria.get("required_skills", []) or []
     if required:
@@ -17,13 +60,11 @@ def compute_score(parsed_resume, criteria, match_info):
         req_pct = min(1.0, len(matched) / len(required))
     else:
         req_pct = 1.0
-    score += req_pct * 50.0
 
     # Degree match strength (if matched score given)
     deg = match_info.get("degree", {})
     deg_score = deg.get("score", 0) or 0
     deg_pct = min(1.0, deg_score / 100.0)
-    score += deg_pct * 15.0
 
     # Experience: more than min gives linear bonus up to 2x min
     min_exp = criteria.get("min_experience", 0)
@@ -32,7 +73,6 @@ def compute_score(parsed_resume, criteria, match_info):
         exp_pct = 1.0
     else:
         exp_pct = min(1.0, found_exp / (min_exp * 2))  # cap
-    score += exp_pct * 15.0
 
     # Optional skills bonus
     opt_count = match_info.get("optional_bonus_count", 0)
@@ -44,7 +84,6 @@ def compute_score(parsed_resume, criteria, match_info):
         opt_pct = min(1.0, opt_count / total_opt)
     else:
         opt_pct = min(1.0, opt_count / (opt_count + 1))
-    score += opt_pct * 10.0
 
     # Publications bonus (simple)
     min_pubs = criteria.get("min_publications", 0)
@@ -53,8 +92,37 @@ def compute_score(parsed_resume, criteria, match_info):
         pub_pct = min(1.0, pubs_found / 1.0)  # any publications gives some bonus
     else:
         pub_pct = min(1.0, pubs_found / (min_pubs * 1.0))
-    score += min(10.0, pub_pct * 10.0)
 
-    # final clamp
-    final = max(0.0, min(100.0, round(score, 2)))
-    return final
+    return {"required_skills": req_pct, "degree": deg_pct, "experience": exp_pct,
+            "optional_skills": opt_pct, "publications": pub_pct}
+
+
+def weighted_score(components, weights=None):
+    """Score (0-100) of a {component: percentage} dict under `weights` (see normalize_weights)."""
+    return float(rank(np.array([[components.get(c) or 0.0 for c in COMPONENTS]]), weights)[0])
+
+
+def rank(matrix, weights=None):
+    """Scores (0-100, 2 decimals) for an (n, len(COMPONENTS)) matrix of component percentages."""
+    scores = np.asarray(matrix, dtype=np.float64) @ normalize_weights(weights)
+    return np.clip(np.round(scores, 2), 0.0, 100.0)
+
+
+def score_parsed(parsed_resume, criteria, match_info, weights=None):
+    """
+    Compute the components, store them in parsed_resume['score_components'] and
+    return the score. A triage rejection (match_info['triage']) stopped at its
+    first unmet requirement, so its components would be understated: it gets
+    no components and a None score until it is explained in full.
+    """
+    if match_info.get("triage"):
+        parsed_resume.pop('score_components', None)
+        return None
+    components = compute_components(parsed_resume, criteria, match_info)
+    parsed_resume['score_components'] = components
+    return weighted_score(components, weights)
+
+
+def compute_score(parsed_resume, criteria, match_info, weights=None):
+    """Returns a numeric score (0-100) under `weights` (DEFAULT_WEIGHTS if None)."""
+    return weighted_score(compute_components(parsed_resume, criteria, match_info), weights)
@@ -0,0 +1,78 @@
+# backend/skill_scanner.py
+"""
+Multi-pattern skill scanner used by resume_parser.
+
+Built once per variant set (see resume_parser.CompiledSkillSet):
+  - an Aho-Corasick automaton (pyahocorasick) over every variant and its compact
+    form, so one linear pass over the normalized text and one over the compact
+    text find every variant occurrence;
+  - a substring index (substring -> variants containing it) that answers the
+    heuristic "token contained in a variant" question with one dict lookup.
+
+Without pyahocorasick the text scan falls back to one C-level substring search
+per pattern, which is still faster than a pure-Python automaton for the few
+hundred variants a job has.
+"""
+from typing import Dict, Iterable, List, Set, Tuple
+
+try:
+    import ahocorasick
+except Exception:
+    ahocorasick = None
+
+FULL = 1      # pattern is the normalized variant, searched in normalized text
+COMPACT = 2   # pattern is the compact variant, searched in compact text
+
+
+class SkillScanner:
+    def __init__(self, variants: Iterable[str]):
+        patterns: Dict[str, List[Tuple[str, int]]] = {}
+        substrings: Dict[str, Set[str]] = {}
+        for var in variants:
+            if not var:
+                continue
+            patterns.setdefault(var, []).append((var, FULL))
+            patterns.setdefault(var.replace(" ", ""), []).append((var, COMPACT))
+            n = len(var)
+            for i in range(n):
+                for j in range(i + 1, n + 1):
+                    substrings.setdefault(var[i:j], set()).add(var)
+        self._patterns = patterns
+        self._substrings = substrings
+        self._automaton = None
+        if ahocorasick is not None and patterns:
+            a = ahocorasick.Automaton()
+            for pat, payloads in patterns.items():
+                a.add_word(pat, tuple(payloads))
+            a.make_automaton()
+            self._automaton = a
+
+    def _iter_payloads(self, text: str):
+        if self._automaton is not None:
+            for _end, payloads in self._automaton.iter(text):
+                yield from payloads
+        else:
+            for pat, payloads in self._patterns.items():
+                if pat in text:
+                    yield from payloads
+
+    def scan(self, t_norm: str, text_compact: str) -> Set[str]:
+        """Variants v with `v in t_norm` or `v.replace(' ', '') in text_compact`."""
+        found = set()
+        if t_norm:
+            for var, kind in self._iter_payloads(t_norm):
+                if kind == FULL:
+                    found.add(var)
+        if text_compact:
+            for var, kind in self._iter_payloads(text_compact):
+                if kind == COMPACT:
+                    found.add(var)
+        return found
+
+    def variants_containing(self, token: str) -> Set[str]:
+        """Variants v with `token in v`."""
+        return self._substrings.get(token, set())
+
+    def variants_within(self, token: str) -> Set[str]:
+        """Variants v with `v in token`."""
+        return {var for var, kind in self._iter_payloads(token) if kind == FULL}
@@ -0,0 +1,156 @@
+# backend/synonyms.py
+"""
+Skill synonym registry shared by resume_parser and eligibility.
+
+Synonym groups (canonical skill -> variants) live in the skill_synonyms table
+and are edited from the admin dashboard. Every edit bumps a version number in
+the settings table. get_index() returns the compiled SynonymIndex for the
+current version:
+  - groups:     canonical -> normalized variants (canonical first)
+  - by_variant: normalized variant -> canonical (O(1) lookup per skill)
+  - compact:    normalized variant -> compact form (no spaces/dots)
+
+Each process re-checks the DB version at most every RELOAD_CHECK_S seconds and
+recompiles when it changed, so edits reach Streamlit sessions and ingestion
+workers without a restart. The version is part of the parser's skill-set cache
+key, so compiled job skill sets are rebuilt on change too.
+"""
+import os
+import re
+import time
+import sqlite3
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from backend import db
+
+RELOAD_CHECK_S = float(os.environ.get("SYNONYMS_RELOAD_S", 5))
+
+# seed for a fresh database (the table is the source of truth afterwards)
+DEFAULT_SYNONYMS = {
+    "javascript": ["js", "java script"],
+    "react": ["react.js", "reactjs", "react js"],
+    "tailwindcss": ["tailwind", "tailwind css", "tailwind.css"],
+    "pocketbase": ["pocket base", "pocket-base"],
+    "firebase": ["google firebase", "firebase realtime", "firebase auth"],
+    "git": ["github", "gitlab", "version control"],
+    "python": ["py"],
+    # design examples
+    "figma": ["figma design"],
+    "photoshop": ["adobe photoshop", "ps"],
+}
+
+_NON_TOKEN_RE = re.compile(r'[^a-z0-9\.\+\#]+')
+_COMPACT_RE = re.compile(r'[\s\.]+')
+
+
+def normalize(s: str) -> str:
+    """Same normalization as the parser: lowercase, runs outside [a-z0-9.+#] -> one space."""
+    if not s:
+        return ""
+    return _NON_TOKEN_RE.sub(' ', s.lower().strip()).strip()
+
+
+class SynonymIndex:
+    __slots__ = ("version", "groups", "by_variant", "compact")
+
+    def __init__(self, table: Dict[str, List[str]], version: int):
+        groups: Dict[str, Tuple[str, ...]] = {}
+        by_variant: Dict[str, str] = {}
+        compact: Dict[str, str] = {}
+        for canon, vals in table.items():
+            c = normalize(canon)
+            if not c:
+                continue
+            variants = tuple(dict.fromkeys(v for v in [c] + [normalize(x) for x in vals] if v))
+            groups[c] = variants
+            for v in variants:
+                by_variant.setdefault(v, c)
+                compact[v] = _COMPACT_RE.sub('', v)
+        self.version = version
+        self.groups = groups
+        self.by_variant = by_variant
+        self.compact = compact
+
+    def canonical(self, skill: str) -> Optional[str]:
+        return self.by_variant.get(normalize(skill))
+
+    def variants_for(self, skill: str) -> Tuple[str, ...]:
+        """The skill's whole synonym group (canonical first), or just the normalized skill."""
+        n = normalize(skill)
+        c = self.by_variant.get(n)
+        if c is not None:
+            return self.groups[c]
+        return (n,) if n else ()
+
+    def as_dict(self) -> Dict[str, List[str]]:
+        return {c: list(vs[1:]) for c, vs in self.groups.items()}
+
+
+_lock = threading.Lock()
+_index: Optional[SynonymIndex] = None
+_checked_at = 0.0
+
+
+def _load() -> SynonymIndex:
+    table, version = db.get_skill_synonyms()
+    if version is None:
+        # never populated: seed the defaults (another process may win the race)
+        try:
+            db.replace_skill_synonyms({c: [c] + [normalize(v) for v in vals] for c, vals in DEFAULT_SYNONYMS.items()})
+        except ValueError:
+            pass
+        table, version = db.get_skill_synonyms()
+    return SynonymIndex(table, version or 0)
+
+
+def get_index(force: bool = False) -> SynonymIndex:
+    """The compiled index for the current DB version (re-checked at most every RELOAD_CHECK_S)."""
+    global _index, _checked_at
+    now = time.monotonic()
+    with _lock:
+        current = _index
+        if current is not None and not force and now - _checked_at < RELOAD_CHECK_S:
+            return current
+        _checked_at = now
+    try:
+        if current is not None and db.get_synonyms_version() == current.version:
+            return current
+        index = _load()
+    except sqlite3.Error:
+        # schema not initialized yet (e.g. a script before init_db): built-in defaults
+        index = current or SynonymIndex(DEFAULT_SYNONYMS, 0)
+    with _lock:
+        _index = index
+    return index
+
+
+def version() -> int:
+    return get_index().version
+
+
+# ---------- Admin editing ----------
+def list_groups() -> Dict[str, List[str]]:
+    return get_index(force=True).as_dict()
+
+
+def set_group(canonical: str, variants: List[str]):
+    """Create or replace a synonym group. Raises ValueError on empty/conflicting input."""
+    c = normalize(canonical)
+    if not c:
+        raise ValueError("Canonical skill is required")
+    vals = [v for v in dict.fromkeys(normalize(v) for v in variants) if v and v != c]
+    index = get_index(force=True)
+    for v in [c] + vals:
+        owner = index.by_variant.get(v)
+        if owner is not None and owner != c:
+            raise ValueError(f"'{v}' is already a synonym of '{owner}'")
+    # the canonical is stored as a variant of itself, so UNIQUE(variant) also
+    # keeps canonicals from appearing in two groups
+    db.replace_skill_synonyms({c: [c] + vals})
+    get_index(force=True)
+
+
+def delete_group(canonical: str):
+    db.delete_skill_synonyms(normalize(canonical))
+    get_index(force=True)
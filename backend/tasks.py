@@ -0,0 +1,126 @@
+# backend/tasks.py
+"""
+Minimal in-process background task registry.
+
+Long-running admin jobs (bulk screening, re-parsing, ...) run in a daemon thread
+inside the Streamlit server process. Pages keep only the task id in
+st.session_state and poll get_task() for progress, failures and cancellation.
+"""
+import threading
+import traceback
+import uuid
+from datetime import datetime
+
+_tasks = {}
+_tasks_lock = threading.Lock()
+
+# finished tasks kept around so pages can still show their summary
+MAX_FINISHED_TASKS = 50
+
+
+class Task:
+    def __init__(self, name, total=0):
+        self.id = uuid.uuid4().hex[:12]
+        self.name = name
+        self.total = int(total or 0)
+        self.done = 0
+        self.status = "pending"     # pending | running | done | cancelled | error
+        self.message = ""
+        self.failures = []          # list of {"item": ..., "reason": ...}
+        self.result = None
+        self.error = None
+        self.started_at = datetime.utcnow().isoformat()
+        self.finished_at = None
+        self._cancel = threading.Event()
+        self._lock = threading.Lock()
+
+    # --- progress reporting (called from the worker thread) ---
+    def set_total(self, total):
+        with self._lock:
+            self.total = int(total or 0)
+
+    def advance(self, n=1, message=None):
+        with self._lock:
+            self.done += n
+            if message is not None:
+                self.message = message
+
+    def fail(self, item, reason):
+        with self._lock:
+            self.failures.append({"item": item, "reason": str(reason)})
+
+    # --- cancellation (called from the page) ---
+    def cancel(self):
+        self._cancel.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    @property
+    def finished(self):
+        return self.status in ("done", "cancelled", "error")
+
+    @property
+    def progress(self):
+        if not self.total:
+            return 1.0 if self.finished else 0.0
+        return min(1.0, self.done / float(self.total))
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "id": self.id,
+                "name": self.name,
+                "status": self.status,
+                "done": self.done,
+                "total": self.total,
+                "progress": self.progress,
+                "message": self.message,
+                "failures": list(self.failures),
+                "result": self.result,
+                "error": self.error,
+                "started_at": self.started_at,
+                "finished_at": self.finished_at,
+            }
+
+
+def _run(task, fn, args, kwargs):
+    task.status = "running"
+    try:
+        task.result = fn(task, *args, **kwargs)
+        task.status = "cancelled" if task.cancelled else "done"
+    except Exception as e:
+        task.error = f"{e}\n{traceback.format_exc()}"
+        task.status = "error"
+    finally:
+        task.finished_at = datetime.utcnow().isoformat()
+
+
+def _prune():
+    finished = [t for t in _tasks.values() if t.finished]
+    finished.sort(key=lambda t: t.finished_at or "")
+    for t in finished[:max(0, len(finished) - MAX_FINISHED_TASKS)]:
+        _tasks.pop(t.id, None)
+
+
+def start_task(name, fn, *args, total=0, **kwargs):
+    """Run fn(task, *args, **kwargs) in a background thread and return the Task."""
+    task = Task(name, total=total)
+    with _tasks_lock:
+        _prune()
+        _tasks[task.id] = task
+    th = threading.Thread(target=_run, args=(task, fn, args, kwargs), name=f"task-{name}-{task.id}", daemon=True)
+    th.start()
+    return task
+
+
+def get_task(task_id):
+    with _tasks_lock:
+        return _tasks.get(task_id)
+
+
+def list_tasks(name=None):
+    with _tasks_lock:
+        out = [t for t in _tasks.values() if name is None or t.name == name]
+    return sorted(out, key=lambda t: t.started_at, reverse=True)
@@ -0,0 +1,160 @@
+# backend/text_cache.py
+"""
+Disk-backed, zlib-compressed cache keyed by content hash.
+
+Entries live in <root>/<key[:2]>/<key>.z. A hit touches the file's mtime so the
+oldest-mtime entries are evicted first once the directory grows past max_bytes
+(LRU by access time). Safe to share between processes: writes are atomic
+renames and a missing/corrupt entry is just a miss.
+"""
+import os
+import zlib
+import hashlib
+import threading
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+CACHE_ROOT = os.path.join(BASE_DIR, "cache")
+
+# evict down to this fraction of max_bytes so we don't evict on every put
+EVICT_TARGET_RATIO = 0.9
+
+
+def sha256_file(path, chunk_size=1 << 20):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def sha256_bytes(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+class DiskCache:
+    def __init__(self, root, max_bytes, level=6):
+        self.root = root
+        self.max_bytes = int(max_bytes)
+        self.level = level
+        self._lock = threading.Lock()
+        self._size = None  # lazily computed total size on disk
+        self._stats = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+
+    def _path(self, key):
+        return os.path.join(self.root, key[:2], f"{key}.z")
+
+    def get(self, key):
+        """Return the cached bytes for key or None."""
+        p = self._path(key)
+        try:
+            with open(p, "rb") as f:
+                data = zlib.decompress(f.read())
+        except (OSError, zlib.error):
+            with self._lock:
+                self._stats["misses"] += 1
+            return None
+        try:
+            os.utime(p, None)
+        except OSError:
+            pass
+        with self._lock:
+            self._stats["hits"] += 1
+        return data
+
+    def put(self, key, data):
+        blob = zlib.compress(data, self.level)
+        p = self._path(key)
+        os.makedirs(os.path.dirname(p), exist_ok=True)
+        tmp = f"{p}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp, "wb") as f:
+                f.write(blob)
+            os.replace(tmp, p)
+        except OSError:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            return
+        with self._lock:
+            self._stats["writes"] += 1
+            if self._size is not None:
+                self._size += len(blob)
+            over = self._current_size() > self.max_bytes
+        if over:
+            self.evict()
+
+    def get_text(self, key):
+        data = self.get(key)
+        return data.decode("utf-8") if data is not None else None
+
+    def put_text(self, key, text):
+        self.put(key, (text or "").encode("utf-8"))
+
+    def _entries(self):
+        out = []
+        if not os.path.isdir(self.root):
+            return out
+        for shard in os.listdir(self.root):
+            d = os.path.join(self.root, shard)
+            if not os.path.isdir(d):
+                continue
+            for name in os.listdir(d):
+                if not name.endswith(".z"):
+                    continue
+                p = os.path.join(d, name)
+                try:
+                    st = os.stat(p)
+                except OSError:
+                    continue
+                out.append((st.st_mtime, st.st_size, p))
+        return out
+
+    def _current_size(self):
+        if self._size is None:
+            self._size = sum(e[1] for e in self._entries())
+        return self._size
+
+    def evict(self):
+        """Drop least recently used entries until the cache is under its cap."""
+        with self._lock:
+            entries = sorted(self._entries())
+            total = sum(e[1] for e in entries)
+            target = int(self.max_bytes * EVICT_TARGET_RATIO)
+            for _mtime, size, p in entries:
+                if total <= target:
+                    break
+                try:
+                    os.remove(p)
+                except OSError:
+                    continue
+                total -= size
+                self._stats["evictions"] += 1
+            self._size = total
+
+    def clear(self):
+        with self._lock:
+            for _mtime, _size, p in self._entries():
+                try:
+                    os.remove(p)
+                except OSError:
+                    pass
+            self._size = 0
+
+    def stats(self):
+        with self._lock:
+            s = dict(self._stats)
+            lookups = s["hits"] + s["misses"]
+            s["hit_rate"] = round(s["hits"] / lookups, 3) if lookups else 0.0
+            s["bytes"] = self._current_size()
+            s["max_bytes"] = self.max_bytes
+        return s
+
+
+# extracted resume text, shared by every parse of the same file contents
+text_cache = DiskCache(os.path.join(CACHE_ROOT, "text"),
+                       max_bytes=int(os.environ.get("TEXT_CACHE_MAX_BYTES", 256 * 1024 * 1024)))
+
+# job-agnostic resume profiles (see resume_parser.build_profile)
+profile_cache = DiskCache(os.path.join(CACHE_ROOT, "profiles"),
+                          max_bytes=int(os.environ.get("PROFILE_CACHE_MAX_BYTES", 512 * 1024 * 1024)))
@@ -0,0 +1,386 @@
+# backend/uploads_store.py
+"""
+Content-addressed storage for uploaded resumes.
+
+A file is stored once under the sha256 of its bytes, sharded two levels deep
+so no directory grows too large:
+
+    uploads/blobs/ab/cd/abcd1234...   (sha256 hex, no extension)
+
+Applications keep resume_path (the blob path), resume_sha256 and resume_name
+(the name the file was uploaded under, used for downloads). The blobs table
+counts how many applications point at each blob; blobs that end up with no
+references (e.g. a submit rejected because the job was full) are removed by
+collect_garbage() after a grace period, so an upload in flight is never
+deleted under its application.
+
+Identical resumes are stored once and, because the parser's profile cache is
+keyed by the same content hash, parsed once.
+
+Storage tiers: blobs referenced only by archived applications, or not used for
+COMPRESS_AFTER_DAYS, are recompressed in the background (zstd when the
+zstandard package is installed, gzip otherwise) as <sha256>.zst / .gz and the
+plain file is removed. read_resume() / resume_source() decompress on demand,
+and a compressed blob that is uploaded again goes back to a plain file.
+"""
+import os
+import re
+import gzip
+import uuid
+import shutil
+import hashlib
+import time
+from datetime import datetime, timedelta
+
+from backend import db, tasks
+
+# optional: better ratio and much faster decompression than gzip
+try:
+    import zstandard
+except Exception:
+    zstandard = None
+
+BLOBS_DIR = os.path.join(db.UPLOADS_DIR, "blobs")
+# unreferenced blobs younger than this are kept (their application may still be
+# being created)
+GC_GRACE_S = int(os.environ.get("UPLOADS_GC_GRACE_S", 3600))
+# largest resume accepted (Streamlit's own server.maxUploadSize is far higher)
+MAX_UPLOAD_BYTES = int(os.environ.get("UPLOAD_MAX_MB", 10)) * 1024 * 1024
+CHUNK_SIZE = 1 << 20
+
+# cold-tier policy
+COMPRESS_AFTER_DAYS = int(os.environ.get("UPLOADS_COMPRESS_AFTER_DAYS", 90))
+CODEC = os.environ.get("UPLOADS_CODEC") or ("zst" if zstandard is not None else "gz")
+# keep the plain file unless compression saves at least this fraction (most
+# PDFs are already deflate-compressed internally)
+MIN_SAVING = 0.05
+# how often the admin dashboard kicks off a background compaction pass
+COMPACT_INTERVAL_S = int(os.environ.get("UPLOADS_COMPACT_INTERVAL_S", 6 * 3600))
+COMPACT_LAST_RUN_KEY = "uploads_compaction_last_run"
+
+CODECS = ("zst", "gz")
+_SHA_RE = re.compile(r"^[0-9a-f]{64}$")
+
+
+def blob_path(sha256, codec=None):
+    """Path of the plain blob, or of its compressed form for `codec`."""
+    if not _SHA_RE.match(sha256 or ""):
+        raise ValueError("Invalid content hash")
+    path = os.path.join(BLOBS_DIR, sha256[:2], sha256[2:4], sha256)
+    return f"{path}.{codec}" if codec else path
+
+
+def _compressed_path(sha256):
+    for codec in CODECS:
+        path = blob_path(sha256, codec)
+        if os.path.exists(path):
+            return codec, path
+    return None, None
+
+
+def exists(sha256):
+    return os.path.exists(blob_path(sha256)) or _compressed_path(sha256)[1] is not None
+
+
+def _commit(tmp_path, sha256, size):
+    """Move a fully written temp file into place (or drop it if the blob exists)."""
+    dest = blob_path(sha256)
+    if os.path.exists(dest):
+        os.remove(tmp_path)
+        db.register_blob(sha256, size)
+        return dest
+    os.makedirs(os.path.dirname(dest), exist_ok=True)
+    os.replace(tmp_path, dest)
+    db.register_blob(sha256, size)
+    _codec, packed = _compressed_path(sha256)
+    if packed:
+        # uploaded again while in the cold tier: the plain copy is back
+        db.set_blob_storage(sha256, None, None)
+        os.remove(packed)
+    return dest
+
+
+def _tmp_path():
+    os.makedirs(BLOBS_DIR, exist_ok=True)
+    return os.path.join(BLOBS_DIR, f".tmp-{uuid.uuid4().hex}")
+
+
+def put_upload(upload, max_bytes=None):
+    """
+    Store an uploaded file (Streamlit UploadedFile, BytesIO or bytes). The
+    in-memory buffer is hashed first (no I/O) after the size limit has been
+    checked; a resume that is already stored is only registered again, anything
+    else is written in chunks. Returns (sha256, blob path, buffer); the buffer
+    is a zero-copy memoryview of the upload, to be handed to build_profile()
+    instead of re-reading the blob. Raises ValueError if the file is too large.
+    """
+    max_bytes = MAX_UPLOAD_BYTES if max_bytes is None else max_bytes
+    buf = memoryview(upload.getbuffer() if hasattr(upload, "getbuffer") else upload)
+    if len(buf) > max_bytes:
+        raise ValueError(f"The resume is larger than {max_bytes / (1024 * 1024):g} MB.")
+    sha = hashlib.sha256(buf).hexdigest()
+    dest = blob_path(sha)
+    if os.path.exists(dest):
+        db.register_blob(sha, len(buf))
+        return sha, dest, buf
+    # new, or only in the cold tier (writing it brings the plain copy back)
+    tmp = _tmp_path()
+    try:
+        with open(tmp, "wb") as out:
+            for start in range(0, len(buf), CHUNK_SIZE):
+                out.write(buf[start:start + CHUNK_SIZE])
+    except Exception:
+        os.remove(tmp)
+        raise
+    return sha, _commit(tmp, sha, len(buf)), buf
+
+
+def put_file(path, sha256=None):
+    """
+    Store a file from disk; returns (sha256, blob path). Pass sha256 when the
+    content hash is already known to skip re-hashing a file that is stored.
+    """
+    if sha256 and exists(sha256):
+        db.register_blob(sha256, os.path.getsize(path))
+        return sha256, blob_path(sha256)
+    tmp = _tmp_path()
+    h = hashlib.sha256()
+    size = 0
+    try:
+        with open(path, "rb") as src, open(tmp, "wb") as out:
+            for chunk in iter(lambda: src.read(CHUNK_SIZE), b""):
+                h.update(chunk)
+                out.write(chunk)
+                size += len(chunk)
+    except Exception:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    return h.hexdigest(), _commit(tmp, h.hexdigest(), size)
+
+
+# ---------- Reading ----------
+def _decompress(codec, path):
+    with open(path, "rb") as f:
+        if codec == "zst":
+            if zstandard is None:
+                raise ValueError("zstandard is required to read this resume")
+            return zstandard.ZstdDecompressor().stream_reader(f).read()
+        return gzip.decompress(f.read())
+
+
+def read_blob(sha256):
+    """The blob's bytes, decompressed if it is in the cold tier. Raises FileNotFoundError."""
+    path = blob_path(sha256)
+    for _ in range(2):
+        try:
+            with open(path, "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            pass
+        codec, packed = _compressed_path(sha256)
+        if packed:
+            try:
+                return _decompress(codec, packed)
+            except FileNotFoundError:
+                pass  # decompressed by a concurrent re-upload; retry the plain file
+    raise FileNotFoundError(path)
+
+
+def resume_source(app):
+    """
+    What to hand to resume_parser.build_profile for an application: the plain
+    file path when there is one, else the decompressed bytes.
+    """
+    sha = app.get('resume_sha256')
+    if not sha or os.path.exists(blob_path(sha)):
+        return app['resume_path']
+    try:
+        return read_blob(sha)
+    except FileNotFoundError:
+        return app['resume_path']
+
+
+def read_resume(app):
+    """An application's resume bytes for download, or None if the file is gone."""
+    try:
+        if app.get('resume_sha256'):
+            return read_blob(app['resume_sha256'])
+        with open(app['resume_path'], "rb") as f:
+            return f.read()
+    except (OSError, TypeError):
+        return None
+
+
+def display_name(app):
+    """File name to offer when downloading an application's resume."""
+    return app.get('resume_name') or os.path.basename(app.get('resume_path') or "") or "resume"
+
+
+def collect_garbage(grace_s=None):
+    """Delete blobs no application references (not stored or re-uploaded within the grace period). Returns (files, bytes)."""
+    cutoff = (datetime.utcnow() - timedelta(seconds=GC_GRACE_S if grace_s is None else grace_s)).isoformat()
+    removed = freed = 0
+    for b in db.get_unreferenced_blobs(cutoff):
+        if not db.delete_blob_if_unreferenced(b['sha256'], used_before=cutoff):
+            continue
+        for codec in (None,) + CODECS:
+            try:
+                os.remove(blob_path(b['sha256'], codec))
+                removed += 1
+                freed += b['stored_size'] or b['size'] or 0
+            except FileNotFoundError:
+                pass
+    return removed, freed
+
+
+def stats():
+    return db.get_blob_stats()
+
+
+# ---------- Cold tier (compression at rest) ----------
+def _compress_to(src_path, dst_path, codec):
+    with open(src_path, "rb") as src, open(dst_path, "wb") as out:
+        if codec == "zst":
+            zstandard.ZstdCompressor(level=19).copy_stream(src, out)
+        else:
+            with gzip.GzipFile(fileobj=out, mode="wb", compresslevel=9, mtime=0) as gz:
+                shutil.copyfileobj(src, gz, CHUNK_SIZE)
+
+
+def compress_blob(sha256, codec=None):
+    """
+    Move one plain blob to the cold tier. Returns the bytes saved (0 if it was
+    kept plain because it doesn't compress). Raises FileNotFoundError.
+    """
+    codec = codec or CODEC
+    if codec not in CODECS or (codec == "zst" and zstandard is None):
+        raise ValueError(f"Unsupported codec {codec!r}")
+    src = blob_path(sha256)
+    size = os.path.getsize(src)
+    tmp = _tmp_path()
+    try:
+        _compress_to(src, tmp, codec)
+        stored = os.path.getsize(tmp)
+        if stored > size * (1 - MIN_SAVING):
+            os.remove(tmp)
+            db.set_blob_storage(sha256, "raw", size)
+            return 0
+        os.replace(tmp, blob_path(sha256, codec))
+    except Exception:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    # the compressed copy is complete before the plain file goes away, so a
+    # reader always finds one of the two
+    db.set_blob_storage(sha256, codec, stored)
+    os.remove(src)
+    return size - stored
+
+
+def run_compaction(task, max_items=1000, codec=None):
+    """Compress cold blobs (archived-only or unused for COMPRESS_AFTER_DAYS)."""
+    cutoff = (datetime.utcnow() - timedelta(days=COMPRESS_AFTER_DAYS)).isoformat()
+    summary = {"compressed": 0, "kept_plain": 0, "saved_bytes": 0, "failed": 0}
+    after = ""
+    done = 0
+    while done < max_items and not task.cancelled:
+        batch = db.get_blobs_to_compress(cutoff, after_sha=after, limit=min(50, max_items - done))
+        if not batch:
+            break
+        task.set_total(task.total + len(batch))
+        for b in batch:
+            if task.cancelled:
+                break
+            after = b['sha256']
+            done += 1
+            try:
+                saved = compress_blob(b['sha256'], codec)
+            except (OSError, ValueError) as e:
+                task.fail(b['sha256'][:12], str(e))
+                summary["failed"] += 1
+                task.advance()
+                continue
+            if saved:
+                summary["compressed"] += 1
+                summary["saved_bytes"] += saved
+            else:
+                summary["kept_plain"] += 1
+            task.advance(message=f"{summary['saved_bytes'] // 1024} KB saved")
+    db.set_setting(COMPACT_LAST_RUN_KEY, str(time.time()))
+    return summary
+
+
+def start_compaction(max_items=1000):
+    for t in tasks.list_tasks("uploads_compaction"):
+        if not t.finished:
+            return t
+    return tasks.start_task("uploads_compaction", run_compaction, max_items=max_items)
+
+
+def maybe_start_compaction():
+    """Start a compaction pass if none ran in the last COMPACT_INTERVAL_S; returns the Task or None."""
+    try:
+        last = float(db.get_setting(COMPACT_LAST_RUN_KEY) or 0)
+    except ValueError:
+        last = 0
+    if time.time() - last < COMPACT_INTERVAL_S:
+        return None
+    # claim the slot now so concurrent page loads don't each start one
+    db.set_setting(COMPACT_LAST_RUN_KEY, str(time.time()))
+    return start_compaction()
+
+
+# ---------- Moving pre-store uploads ----------
+def _legacy_name(path):
+    # old uploads were saved as "<timestamp>_<original name>"
+    base = os.path.basename(path)
+    head, sep, rest = base.partition("_")
+    return rest if sep and head.isdigit() and rest else base
+
+
+def run_migration(task):
+    """Move resumes saved as flat files in uploads/ into the store."""
+    apps = db.get_legacy_upload_applications()
+    task.set_total(len(apps))
+    uploads_dir = os.path.abspath(db.UPLOADS_DIR)
+    moved = missing = 0
+    done_paths = {}
+    for app in apps:
+        if task.cancelled:
+            break
+        path = app['resume_path']
+        if path in done_paths:
+            sha, dest = done_paths[path]
+        elif os.path.exists(path):
+            sha, dest = put_file(path)
+            done_paths[path] = (sha, dest)
+        else:
+            task.fail(app['id'], "resume file missing")
+            missing += 1
+            task.advance()
+            continue
+        db.set_application_blob(app['id'], dest, sha, _legacy_name(path))
+        moved += 1
+        task.advance(message=f"{moved} moved")
+    # remove the flat copies only once every application using them points at the blob
+    still_used = {a['resume_path'] for a in db.get_legacy_upload_applications()}
+    for path in done_paths:
+        if path not in still_used and os.path.dirname(os.path.abspath(path)) == uploads_dir:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+    return {"moved": moved, "missing": missing}
+
+
+def start_migration():
+    for t in tasks.list_tasks("uploads_migration"):
+        if not t.finished:
+            return t
+    return tasks.start_task("uploads_migration", run_migration)
+
+
+def count_legacy():
+    """Legacy applications whose file is still there to be moved."""
+    return sum(1 for a in db.get_legacy_upload_applications() if os.path.exists(a['resume_path']))
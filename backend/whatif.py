@@ -0,0 +1,272 @@
+# backend/whatif.py
+"""
+Criteria what-if: how many of a job's applicants would be eligible under other
+required skills, degree or minimum thresholds, answered from an in-memory index
+instead of re-screening every application.
+
+A WhatIfIndex covers a job's screened, non-archived applications (position i =
+i-th application loaded) and keeps:
+  - skill  -> bitset of applicants that meet it as a required skill
+  - degree -> bitset of applicants that meet it as the required degree
+  - experience and publication values with their sort order, so a minimum is a
+    searchsorted plus a slice
+Bitsets are Python ints (bit i = position i), so a query is a few ANDs and a
+bit_count(). Skill and degree bitsets are computed with
+eligibility.check_eligibility_batch on the stored parse (the screening rules)
+the first time they are asked for. Skills are matched against the parse that
+was screened for the job, which only lists the skills the resume was searched
+for: a skill outside the job's skill list (and its synonyms) can count fewer
+matches than a re-screen with it would, so simulate() flags such constraints
+as approximate (a lower bound).
+
+Indexes are cached per job (LRU) and re-checked against the DB at most every
+REFRESH_CHECK_S seconds: newly screened applications are appended, re-screened
+ones are re-evaluated in place and archived ones are masked out. A synonym
+edit or eligibility version bump rebuilds the index.
+"""
+import os
+import json
+import time
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from backend import db, eligibility, synonyms
+
+INDEX_CACHE_SIZE = 8
+# cached skill bitsets per index
+SKILL_CACHE_SIZE = 256
+REFRESH_CHECK_S = float(os.environ.get("WHATIF_REFRESH_S", 5))
+# above this share of re-screened rows a refresh rebuilds the index instead
+REBUILD_FRACTION = 0.25
+
+
+def _bits(flags):
+    """Bitset (bit i set iff flags[i]) of a bool sequence."""
+    arr = np.asarray(flags, dtype=bool)
+    if not arr.size:
+        return 0
+    return int.from_bytes(np.packbits(arr, bitorder="little").tobytes(), "little")
+
+
+def _slim(parsed):
+    """The fields of a parse that eligibility reads."""
+    parsed = parsed or {}
+    return {k: parsed.get(k) for k in ("skills", "degrees", "experience_years", "publications")}
+
+
+def _skill_flags(parses, skills):
+    """{skill: [meets it as a required skill, per parse]}."""
+    if not skills or not parses:
+        return {s: [False] * len(parses) for s in skills}
+    checks = eligibility.check_eligibility_batch(parses, {"required_skills": list(skills)})
+    # a parse the check fails on counts as not meeting anything
+    return {s: [not isinstance(c, Exception) and s in c[2]["matched_required"] for c in checks] for s in skills}
+
+
+def _degree_flags(parses, degree):
+    """[meets `degree` as the required degree, per parse]."""
+    if not parses:
+        return []
+    checks = eligibility.check_eligibility_batch(parses, {"required_degree": degree})
+    return [not isinstance(c, Exception) and bool(c[2]["degree"].get("matched")) for c in checks]
+
+
+class _Threshold:
+    """Values per position, sorted once; at_least(m) is the bitset of positions with value >= m."""
+
+    def __init__(self, values):
+        self.values = np.asarray(values, dtype=np.float64)
+        self.order = np.argsort(self.values, kind="stable")
+        self.sorted = self.values[self.order]
+
+    def at_least(self, minimum):
+        flags = np.zeros(len(self.values), dtype=bool)
+        flags[self.order[np.searchsorted(self.sorted, minimum, side="left"):]] = True
+        return _bits(flags)
+
+
+class WhatIfIndex:
+    """Eligibility bitsets for one job's applications (see the module docstring)."""
+
+    def __init__(self, job_id, key):
+        self.job_id = job_id
+        self.key = key
+        self.lock = threading.Lock()
+        self.checked_at = 0.0
+        self.ids = []            # position -> application id
+        self.pos = {}            # application id -> position
+        self.parses = []         # slim parse per position
+        self.fingerprints = {}   # application id -> db fingerprint it was loaded at
+        self.active = 0
+        self.skills = OrderedDict()
+        self.degrees = {}
+        self._experience = None
+        self._publications = None
+
+    # ---------- loading ----------
+    def refresh(self, force=False):
+        """Bring the index up to date with the DB (at most every REFRESH_CHECK_S unless forced)."""
+        now = time.monotonic()
+        if not force and now - self.checked_at < REFRESH_CHECK_S:
+            return
+        self.checked_at = now
+        prints = db.get_screening_fingerprints(self.job_id)
+        changed = [app_id for app_id, fp in prints.items() if self.fingerprints.get(app_id) != fp]
+        gone = [app_id for app_id in self.fingerprints if app_id not in prints]
+        if not changed and not gone:
+            return
+        updated = [app_id for app_id in changed if app_id in self.pos]
+        if len(updated) > REBUILD_FRACTION * max(len(self.ids), 1):
+            self._reset()
+            changed, updated = list(prints), []
+        for app_id in gone:
+            self.fingerprints.pop(app_id, None)
+        parses = db.get_parsed_by_ids(changed)
+        for app_id in changed:
+            self.fingerprints[app_id] = prints[app_id]
+        start = len(self.ids)
+        for app_id in changed:
+            if app_id in self.pos:
+                self.parses[self.pos[app_id]] = _slim(parses.get(app_id))
+            else:
+                self.pos[app_id] = len(self.ids)
+                self.ids.append(app_id)
+                self.parses.append(_slim(parses.get(app_id)))
+        self._apply(list(range(start, len(self.ids))), [self.pos[app_id] for app_id in updated])
+        self.active = _bits([app_id in prints for app_id in self.ids])
+        self._experience = self._publications = None
+
+    def _reset(self):
+        self.ids, self.pos, self.parses, self.fingerprints = [], {}, [], {}
+        self.skills = OrderedDict((s, 0) for s in self.skills)
+        self.degrees = {d: 0 for d in self.degrees}
+
+    def _apply(self, appended, updated):
+        """(Re)compute every cached bitset at the appended (contiguous) and updated positions."""
+        positions = appended + updated
+        if not positions:
+            return
+        parses = [self.parses[p] for p in positions]
+        flags = _skill_flags(parses, list(self.skills))
+        for skill, f in flags.items():
+            self.skills[skill] = self._merge(self.skills[skill], f, appended, updated)
+        for degree in self.degrees:
+            self.degrees[degree] = self._merge(self.degrees[degree], _degree_flags(parses, degree), appended, updated)
+
+    @staticmethod
+    def _merge(bits, flags, appended, updated):
+        if appended:
+            bits |= _bits(flags[:len(appended)]) << appended[0]
+        for p, flag in zip(updated, flags[len(appended):]):
+            bits = bits | (1 << p) if flag else bits & ~(1 << p)
+        return bits
+
+    # ---------- lookups ----------
+    def skill_bits(self, skills):
+        """Bitsets for `skills`, computing the ones not cached yet in one batch."""
+        missing = [s for s in dict.fromkeys(skills) if s not in self.skills]
+        for skill, f in _skill_flags(self.parses, missing).items():
+            self.skills[skill] = _bits(f)
+        for s in skills:
+            self.skills.move_to_end(s)
+        out = [self.skills[s] for s in skills]
+        while len(self.skills) > SKILL_CACHE_SIZE:
+            self.skills.popitem(last=False)
+        return out
+
+    def degree_bits(self, degree):
+        if degree not in self.degrees:
+            self.degrees[degree] = _bits(_degree_flags(self.parses, degree))
+        return self.degrees[degree]
+
+    def experience_bits(self, minimum):
+        if self._experience is None:
+            self._experience = _Threshold([p.get("experience_years", 0) or 0 for p in self.parses])
+        return self._experience.at_least(minimum)
+
+    def publication_bits(self, minimum):
+        if self._publications is None:
+            self._publications = _Threshold([p.get("publications", 0) or 0 for p in self.parses])
+        return self._publications.at_least(minimum)
+
+    def simulate(self, required_skills=(), min_experience=0, min_publications=0, required_degree=None,
+                 searched=frozenset()):
+        """See the module-level simulate(); searched: normalized variants of the job's skills."""
+        skills = list(dict.fromkeys(s.strip() for s in required_skills or [] if s and s.strip()))
+        required_degree = (required_degree or "").strip() or None
+        constraints = [(f"Experience ≥ {min_experience} years", self.experience_bits(min_experience)),
+                       (f"Publications ≥ {min_publications}", self.publication_bits(min_publications)),
+                       (f"Degree: {required_degree or 'None'}", self.degree_bits(required_degree))]
+        constraints += [(f"Skill: {s}", bits) for s, bits in zip(skills, self.skill_bits(skills))]
+        approximate = [False] * (len(constraints) - len(skills))
+        approximate += [searched.isdisjoint(eligibility._variants_for_skill(s)) for s in skills]
+        eligible = self.active
+        for _label, bits in constraints:
+            eligible &= bits
+        breakdown = []
+        for i, (label, bits) in enumerate(constraints):
+            without = self.active
+            for j, (_label, other) in enumerate(constraints):
+                if j != i:
+                    without &= other
+            breakdown.append({"constraint": label, "meet": (self.active & bits).bit_count(),
+                              "eligible_without": without.bit_count(), "approximate": approximate[i]})
+        return {"eligible": eligible.bit_count(), "total": self.active.bit_count(), "constraints": breakdown,
+                "approximate": any(approximate)}
+
+
+_indexes = OrderedDict()
+_lock = threading.Lock()
+
+
+def _criteria(job_id):
+    job = db.get_job(job_id) or {}
+    return json.loads(job['criteria']) if job.get('criteria') else {}
+
+
+def _job_skills(criteria):
+    skills = (criteria.get("required_skills") or []) + (criteria.get("optional_skills") or [])
+    return [s.strip() for s in skills if s and s.strip()]
+
+
+def get_index(job_id, force=False):
+    """The job's WhatIfIndex, built on first use and refreshed from the DB (LRU of INDEX_CACHE_SIZE jobs)."""
+    key = (synonyms.version(), eligibility.ELIGIBILITY_VERSION)
+    with _lock:
+        index = _indexes.get(job_id)
+        if index is None or index.key != key:
+            index = _indexes[job_id] = WhatIfIndex(job_id, key)
+            criteria = _criteria(job_id)
+            # the job's own skills and degree are loaded with the first batch
+            for s in _job_skills(criteria):
+                index.skills[s] = 0
+            index.degrees[(criteria.get("required_degree") or "").strip() or None] = 0
+        _indexes.move_to_end(job_id)
+        while len(_indexes) > INDEX_CACHE_SIZE:
+            _indexes.popitem(last=False)
+    with index.lock:
+        index.refresh(force=force)
+    return index
+
+
+def simulate(job_id, required_skills=(), min_experience=0, min_publications=0, required_degree=None):
+    """
+    How many of the job's screened applicants would be eligible under these
+    criteria (same rules as eligibility.check_eligibility). Returns
+    {"eligible", "total", "constraints": [{"constraint", "meet", "eligible_without",
+     "approximate"}], "approximate", "elapsed_ms"}: per constraint, how many
+    applicants meet it and how many would be eligible if it alone were dropped.
+    A skill the resumes were not searched for at screening (not one of the
+    job's skills or their synonyms) is "approximate": its counts, and the
+    eligible total, are lower bounds.
+    """
+    t0 = time.perf_counter()
+    index = get_index(job_id)
+    # the job's current skills: re-screening after a criteria edit re-matches resumes against them
+    searched = frozenset(v for s in _job_skills(_criteria(job_id)) for v in eligibility._variants_for_skill(s))
+    with index.lock:
+        result = index.simulate(required_skills, min_experience, min_publications, required_degree, searched)
+    result["elapsed_ms"] = (time.perf_counter() - t0) * 1000
+    return result
@@ -0,0 +1,124 @@
+# benchmarks/bench_extractors.py
+"""
+Compare the registered text-extraction backends on a fixture corpus: throughput
+per backend and output parity against the reference backend of the same MIME
+type (token-set overlap, plus whether the parsed resume fields still match).
+
+    python -m benchmarks.bench_extractors [folder ...] [--passes N]
+
+Defaults to the uploads/ folder. A synthetic DOCX with a skills table is added
+when python-docx is installed, so both DOCX backends are exercised. Extraction
+runs in-process (no sandbox) so the numbers reflect the backend, not process
+startup.
+"""
+import argparse
+import glob
+import os
+import re
+import tempfile
+import time
+
+from backend import extraction
+from backend.field_extractor import extract_fields
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# parity is measured against these
+REFERENCE = {
+    extraction.MIME_PDF: "pdfminer-accurate",
+    extraction.MIME_DOCX: "docx-xml-stream",
+}
+
+_TOKEN_RE = re.compile(r"[a-z0-9\.\+\#]{2,}")
+
+
+def _docx_fixture(folder):
+    try:
+        from docx import Document
+    except Exception:
+        return None
+    d = Document()
+    d.add_paragraph("Dr. Priya Sharma  priya.sharma@univ.edu  +91 98765 43210")
+    d.add_paragraph("Ph.D in Mechanical Engineering, IIT Delhi; M.Tech Thermal Engg")
+    t = d.add_table(rows=4, cols=2)
+    for r, (k, v) in enumerate([("Skill", "Experience"), ("Python", "7 years"),
+                                ("MATLAB", "5 years"), ("ANSYS Fluent", "3 years")]):
+        t.cell(r, 0).text = k
+        t.cell(r, 1).text = v
+    for i in range(40):
+        d.add_paragraph(f"[{i + 1}] P. Sharma et al., Journal of Heat Transfer, doi:10.1000/{i}")
+    path = os.path.join(folder, "fixture_table.docx")
+    d.save(path)
+    return path
+
+
+def _corpus(folders, tmp):
+    files = []
+    for folder in folders:
+        for ext in ("pdf", "docx"):
+            files += glob.glob(os.path.join(folder, "**", f"*.{ext}"), recursive=True)
+    fixture = _docx_fixture(tmp)
+    if fixture:
+        files.append(fixture)
+    by_mime = {}
+    for f in sorted(files):
+        with open(f, "rb") as fh:
+            fmt = extraction.sniff_format(fh.read(8192))
+        mime = extraction.FORMAT_MIME.get(fmt)
+        if mime:
+            by_mime.setdefault(mime, []).append(f)
+    return by_mime
+
+
+def _tokens(text):
+    return set(_TOKEN_RE.findall(text.lower()))
+
+
+def _run(backend, files, passes):
+    texts = {}
+    best = None
+    for _ in range(passes):
+        t0 = time.perf_counter()
+        for f in files:
+            res = extraction.extract_text_safe(f, sandbox=False, backend=backend)
+            texts[f] = res.text if res.ok else ""
+        dt = time.perf_counter() - t0
+        best = dt if best is None else min(best, dt)
+    return best, texts
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("folders", nargs="*", default=[os.path.join(BASE_DIR, "uploads")])
+    ap.add_argument("--passes", type=int, default=3)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus = _corpus(args.folders, tmp)
+        print(f"{'backend':<20} {'speed':<7} {'fidelity':<9} {'files':>5} {'files/s':>8} {'MB/s':>7} "
+              f"{'tokens':>7} {'fields':>7}")
+        for mime, files in corpus.items():
+            mb = sum(os.path.getsize(f) for f in files) / (1024 * 1024)
+            backends = [b for b in extraction.list_backends(mime) if b["available"]]
+            ref_name = REFERENCE.get(mime, backends[0]["name"] if backends else None)
+            results = {b["name"]: _run(b["name"], files, args.passes) for b in backends}
+            ref_texts = results[ref_name][1] if ref_name in results else {}
+            for b in backends:
+                dt, texts = results[b["name"]]
+                tok_sim, field_eq = [], 0
+                for f in files:
+                    ref, got = _tokens(ref_texts.get(f, "")), _tokens(texts[f])
+                    union = ref | got
+                    tok_sim.append(len(ref & got) / len(union) if union else 1.0)
+                    field_eq += extract_fields(texts[f]) == extract_fields(ref_texts.get(f, ""))
+                print(f"{b['name']:<20} {b['speed']:<7} {b['fidelity']:<9} {len(files):>5} "
+                      f"{len(files) / dt:>8.1f} {mb / dt:>7.2f} "
+                      f"{sum(tok_sim) / len(tok_sim):>7.3f} {field_eq:>3}/{len(files):<3}")
+        print("\ntokens = mean token-set Jaccard vs the reference backend; "
+              "fields = files whose extract_fields() output matches the reference")
+        short = {m: f for f, m in extraction.FORMAT_MIME.items()}
+        print("reference: " + ", ".join(f"{short[m]}={n}" for m, n in REFERENCE.items()))
+
+
+if __name__ == "__main__":
+    main()
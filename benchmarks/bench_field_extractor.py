@@ -0,0 +1,90 @@
+# benchmarks/bench_field_extractor.py
+"""
+Compare the single-pass field extractor with the per-field regex passes it
+replaced, on synthetic CVs of growing size. Also checks the outputs match.
+
+    python -m benchmarks.bench_field_extractor
+"""
+import random
+import re
+import time
+
+from backend.field_extractor import TextViews, extract_fields
+
+LINES = [
+    "Dr. Priya Sharma  priya.sharma@univ.edu  +91 98765 43210",
+    "Ph.D in Mechanical Engineering, IIT Delhi; M.Tech Thermal Engg; B.Tech Mechanical",
+    "Bachelor of Design (B.Des) from NID, 2012",
+    "Assistant Professor with 7 years of teaching and 3 years industry experience",
+    "Published 14 journal papers and 9 conference papers (DOI listed below)",
+    "Reviewer for International Journal of Heat and Mass Transfer",
+    "Skills: Python, MATLAB, ANSYS Fluent, React.js, Git, LaTeX",
+    "Conference talk: Advances in CFD, 2019. doi:10.1000/xyz123",
+]
+
+
+def _normalize(s):
+    if not s:
+        return ""
+    s = s.lower().strip()
+    s = re.sub(r'[^a-z0-9\.\+\# ]', ' ', s)
+    s = re.sub(r'\s+', ' ', s)
+    return s
+
+
+def legacy_fields(t):
+    """The extraction code previously inlined in parse_resume."""
+    t_norm = _normalize(t)
+    email_m = re.search(r'[\w\.-]+@[\w\.-]+\.\w+', t)
+    phone_m = re.search(r'(\+?\d[\d\-\s]{7,}\d)', t)
+    degrees = []
+    deg_patterns = [r"\b(b\.?tech\b)", r"\b(b\.?des\b)", r"\b(bachelor of [a-z ]+)\b", r"\b(m\.?tech\b)", r"\b(ph\.?d\b)"]
+    for p in deg_patterns:
+        for m in re.findall(p, t, flags=re.I):
+            degrees.append(_normalize(m))
+    years = 0
+    for m in re.findall(r'(\d{1,2})\s+years', t.lower()):
+        years = max(years, int(m))
+    pubs = len(re.findall(r'\b(publication|published|journal|conference|doi)\b', t, flags=re.I))
+    tokens = {_normalize(tok) for tok in set(re.findall(r'[A-Za-z0-9\.\+\#]{2,}', t))}
+    fields = {
+        "email": email_m.group(0) if email_m else None,
+        "phone": phone_m.group(0) if phone_m else None,
+        "degrees": degrees,
+        "experience_years": years,
+        "publications": pubs,
+    }
+    return fields, t_norm, tokens
+
+
+def new_fields(t):
+    views = TextViews(t)
+    return extract_fields(t, views), views.norm, set(views.tokens)
+
+
+def make_cv(n_lines, seed=0):
+    rnd = random.Random(seed)
+    return "\n".join(rnd.choice(LINES) for _ in range(n_lines))
+
+
+def _best_of(fn, arg, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(arg)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    print(f"{'lines':>8} {'chars':>10} {'legacy ms':>10} {'new ms':>8} {'speedup':>8}")
+    for n_lines in (50, 500, 5000, 20000):
+        cv = make_cv(n_lines)
+        assert legacy_fields(cv) == new_fields(cv), "output mismatch"
+        old = _best_of(legacy_fields, cv)
+        new = _best_of(new_fields, cv)
+        print(f"{n_lines:>8} {len(cv):>10} {old * 1000:>10.1f} {new * 1000:>8.1f} {old / new:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+# benchmarks/bench_pdf_parallel.py
+"""
+Page-parallel PDF extraction: wall time for a long synthetic academic CV
+(mostly publication list) with 1..N page workers, through the real sandbox.
+Also checks that every run returns exactly the sequential text.
+
+    python -m benchmarks.bench_pdf_parallel [--pages 60] [--workers 1,2,4,8]
+
+Scaling is bounded by the host's cores (os.cpu_count()); on a single-core
+host all worker counts take about the same time.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from backend import extraction
+
+LINES_PER_PAGE = 48
+
+
+def _pdf_escape(s):
+    return s.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def write_cv_pdf(path, pages):
+    """Minimal valid PDF (Helvetica text, one content stream per page)."""
+    objs = ["<< /Type /Catalog /Pages 2 0 R >>", None,
+            "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    n = 0
+    for p in range(pages):
+        lines = []
+        for _ in range(LINES_PER_PAGE):
+            n += 1
+            if p == 0 and n <= 6:
+                text = ["Dr. Priya Sharma, Professor of Mechanical Engineering",
+                        "priya.sharma@univ.edu  +91 98765 43210",
+                        "Ph.D IIT Delhi; M.Tech Thermal Engineering; B.Tech Mechanical",
+                        "22 years of teaching and research experience",
+                        "Skills: Python, MATLAB, ANSYS Fluent, OpenFOAM, LaTeX",
+                        "Publications"][n - 1]
+            else:
+                text = (f"[{n}] P. Sharma, A. Rao and K. Iyer, \"Conjugate heat transfer in ribbed "
+                        f"channels, part {n}\", Journal of Heat Transfer, vol. {n % 40 + 1}, 20{n % 24:02d}.")
+            lines.append(f"({_pdf_escape(text)}) Tj T*")
+        stream = "BT /F1 8 Tf 10 TL 36 806 Td\n" + "\n".join(lines) + "\nET"
+        objs.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        content_id = len(objs)
+        objs.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+                    f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>")
+        kids.append(f"{len(objs)} 0 R")
+    objs[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {pages} >>"
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for i, body in enumerate(objs, start=1):
+        offsets.append(len(out))
+        out += f"{i} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objs) + 1}\n0000000000 65535 f \n".encode()
+    out += "".join(f"{o:010d} 00000 n \n" for o in offsets).encode()
+    out += f"trailer\n<< /Size {len(objs) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    with open(path, "wb") as f:
+        f.write(out)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--pages", type=int, default=60)
+    ap.add_argument("--workers", default="1,2,4,8")
+    ap.add_argument("--passes", type=int, default=2)
+    args = ap.parse_args()
+    workers = [int(w) for w in args.workers.split(",")]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "long_cv.pdf")
+        write_cv_pdf(path, args.pages)
+        # warm the forkserver so its start-up isn't charged to the first run
+        extraction.extract_text_safe(path, max_pages=1, page_workers=0)
+
+        print(f"{args.pages} pages, {os.cpu_count()} CPUs, parallel from "
+              f"{extraction.PARALLEL_MIN_PAGES} pages")
+        print(f"{'workers':>7} {'seconds':>8} {'speedup':>8} {'same text':>10}")
+        base_text = base_time = None
+        for w in workers:
+            best = None
+            for _ in range(args.passes):
+                t0 = time.perf_counter()
+                res = extraction.extract_text_safe(path, page_workers=w, timeout_s=600, max_chars=10 ** 8)
+                dt = time.perf_counter() - t0
+                best = dt if best is None else min(best, dt)
+            if not res.ok:
+                print(f"{w:>7} failed: {res.reason} {res.detail}")
+                continue
+            if base_text is None:
+                base_text, base_time = res.text, best
+            print(f"{w:>7} {best:>8.2f} {base_time / best:>7.2f}x {str(res.text == base_text):>10}")
+
+
+if __name__ == "__main__":
+    main()
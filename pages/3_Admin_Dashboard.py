@@ -1,6 +1,6 @@
 # pages/1_Admin_Dashboard.py
 import streamlit as st
-from backend import db, resume_parser, eligibility, scoring, report_generator
+from backend import db, resume_parser, eligibility, scoring, report_generator, ingestion, tasks, synonyms, rescreen, uploads_store, whatif
 import os, json, time
 from datetime import datetime
 import bcrypt
@@ -82,6 +82,31 @@ with st.form("panel_secret_form"):
 
 st.markdown("---")
 
+# ===== SKILL SYNONYMS =====
+with st.expander("Skill Synonyms", expanded=False):
+    st.markdown("Synonyms used by resume parsing and eligibility checks. Changes apply to new screenings within a few seconds.")
+    groups = synonyms.list_groups()
+    st.caption(f"Synonym table version {synonyms.version()} — {len(groups)} skills")
+    if groups:
+        st.table([{"Skill": c, "Synonyms": ", ".join(v)} for c, v in sorted(groups.items())])
+    with st.form("synonym_form"):
+        syn_canon = st.text_input("Skill (canonical name)")
+        syn_vals = st.text_input("Synonyms (comma separated; replaces the existing list)")
+        syn_save = st.form_submit_button("Save synonyms")
+        if syn_save:
+            try:
+                synonyms.set_group(syn_canon, [v.strip() for v in syn_vals.split(",") if v.strip()])
+                st.success(f"Saved synonyms for '{syn_canon.strip()}'.")
+            except ValueError as e:
+                st.error(str(e))
+    if groups:
+        del_canon = st.selectbox("Remove skill", options=sorted(groups), key="syn_delete_select")
+        if st.button("Remove synonyms"):
+            synonyms.delete_group(del_canon)
+            st.success(f"Removed synonyms for '{del_canon}'.")
+
+st.markdown("---")
+
 # ===== CREATE JOB =====
 with st.expander("Create Job Posting", expanded=True):
     col1, col2 = st.columns(2)
@@ -140,7 +165,8 @@ for job in jobs:
     with col2:
         if job.get('status') != 'archived':
             if st.button("Upload Resumes", key=f"upload_{job_id}"):
-                st.info("Use 'Upload Resumes' below and select this job to upload files.")
+                st.session_state['bulk_upload_job'] = job_id
+                st.info("Use 'Bulk Upload Resumes' below to upload files for this job.")
         else:
             st.info("Archived")
     with col3:
@@ -151,6 +177,78 @@ for job in jobs:
             if st.button("Unarchive", key=f"unarchive_{job_id}"):
                 db.update_job_status(job_id, 'active')
                 st.success("Job unarchived")
+    if job.get('status') != 'archived':
+        with st.expander(f"Edit criteria (version {job.get('criteria_version') or 1})", expanded=False):
+            with st.form(key=f"criteria_form_{job_id}"):
+                ec1, ec2 = st.columns(2)
+                with ec1:
+                    e_min_exp = st.number_input("Min Experience (years)", min_value=0, value=int(crit.get('min_experience') or 0), key=f"crit_exp_{job_id}")
+                with ec2:
+                    e_min_pubs = st.number_input("Min Publications", min_value=0, value=int(crit.get('min_publications') or 0), key=f"crit_pubs_{job_id}")
+                e_degree = st.text_input("Required Degree - optional", value=crit.get('required_degree') or "", key=f"crit_deg_{job_id}")
+                e_req = st.text_input("Required Skills (comma separated)", value=", ".join(crit.get('required_skills') or []), key=f"crit_req_{job_id}")
+                e_opt = st.text_input("Optional Skills (comma separated)", value=", ".join(crit.get('optional_skills') or []), key=f"crit_opt_{job_id}")
+                if st.form_submit_button("Save and re-screen applications"):
+                    new_crit = {
+                        "min_experience": int(e_min_exp),
+                        "min_publications": int(e_min_pubs),
+                        "required_degree": e_degree.strip() or None,
+                        "required_skills": [s.strip() for s in e_req.split(",") if s.strip()],
+                        "optional_skills": [s.strip() for s in e_opt.split(",") if s.strip()]
+                    }
+                    try:
+                        changes, _ = rescreen.update_job_criteria(job_id, new_crit, changed_by=st.session_state['user'].get('full_name') or "Admin")
+                    except ValueError as e:
+                        st.error(str(e))
+                    else:
+                        if not changes:
+                            st.info("Criteria unchanged.")
+                        else:
+                            st.success(f"Criteria saved ({', '.join(changes)} changed). Re-screening applications in the background.")
+            ctask = rescreen.criteria_rescreen_task(job_id)
+            if ctask and not ctask.finished:
+                snap = ctask.snapshot()
+                st.progress(snap['progress'])
+                st.write(f"Re-screening: {snap['done']} / {snap['total']} applications. {snap['message']}")
+            else:
+                outdated = rescreen.count_outdated_criteria(job_id)
+                if outdated and st.button(f"Re-screen {outdated} applications against the current criteria", key=f"crit_rescreen_{job_id}"):
+                    rescreen.start_criteria_rescreen(job_id)
+                    st.info("Re-screening in the background.")
+            history = db.get_job_criteria_history(job_id)
+            if history:
+                hist_rows = []
+                for h in history:
+                    hs = json.loads(h['summary']) if h.get('summary') else {}
+                    hist_rows.append({
+                        "Version": h['version'],
+                        "Changed": (h.get('changed_at') or '')[:16].replace('T', ' '),
+                        "By": h.get('changed_by') or "—",
+                        "Eligible before → after": f"{hs['eligible_before']} → {hs['eligible_after']}" if hs else "—",
+                        "Newly eligible": hs.get('became_eligible', "—"),
+                        "No longer eligible": hs.get('became_ineligible', "—"),
+                    })
+                st.table(hist_rows)
+        with st.expander("Score weights", expanded=False):
+            cur_weights = scoring.job_weights(job)
+            with st.form(key=f"weights_form_{job_id}"):
+                wcols = st.columns(len(scoring.COMPONENTS))
+                new_weights = {}
+                for wcol, comp in zip(wcols, scoring.COMPONENTS):
+                    with wcol:
+                        new_weights[comp] = st.number_input(comp.replace("_", " ").capitalize(), min_value=0.0,
+                                                            value=float(cur_weights.get(comp, 0)), step=5.0,
+                                                            key=f"weight_{comp}_{job_id}")
+                st.caption("Weights are relative: they are scaled to sum to 100.")
+                if st.form_submit_button("Save weights and re-rank"):
+                    try:
+                        res = rescreen.reweight_job(job_id, new_weights)
+                    except ValueError as e:
+                        st.error(str(e))
+                    else:
+                        st.success(f"Re-ranked {res['rescored']} applications ({res['rank_ms']:.1f} ms)."
+                                   + (f" {res['without_components']} unscored or older results keep their score until re-screened."
+                                      if res['without_components'] else ""))
     st.markdown("</div>", unsafe_allow_html=True)
 
 # pending archive job form
@@ -175,6 +273,158 @@ if st.session_state.get('pending_archive_job'):
 
 st.markdown("---")
 
+# ===== CRITERIA WHAT-IF =====
+st.header("Criteria What-If")
+whatif_jobs = [j for j in db.get_jobs() if j.get('status') != 'archived']
+if not whatif_jobs:
+    st.info("Create a job first.")
+else:
+    wi_titles = {j['id']: j['title'] for j in whatif_jobs}
+    wi_job_id = st.selectbox("Job", options=list(wi_titles), format_func=lambda i: f"{i} - {wi_titles[i]}", key="whatif_job")
+    wi_job = next(j for j in whatif_jobs if j['id'] == wi_job_id)
+    wi_crit = json.loads(wi_job['criteria']) if wi_job.get('criteria') else {}
+    wc1, wc2, wc3 = st.columns([3, 1, 1])
+    with wc1:
+        wi_skills = st.text_input("Required Skills (comma separated)", value=", ".join(wi_crit.get('required_skills') or []),
+                                  key=f"whatif_skills_{wi_job['id']}")
+        wi_degree = st.text_input("Required Degree", value=wi_crit.get('required_degree') or "", key=f"whatif_deg_{wi_job['id']}")
+    with wc2:
+        wi_exp = st.number_input("Min Experience (years)", min_value=0, value=int(wi_crit.get('min_experience') or 0),
+                                 key=f"whatif_exp_{wi_job['id']}")
+    with wc3:
+        wi_pubs = st.number_input("Min Publications", min_value=0, value=int(wi_crit.get('min_publications') or 0),
+                                  key=f"whatif_pubs_{wi_job['id']}")
+    wi_current = whatif.simulate(wi_job['id'], wi_crit.get('required_skills') or [], wi_crit.get('min_experience') or 0,
+                              wi_crit.get('min_publications') or 0, wi_crit.get('required_degree'))
+    sim = whatif.simulate(wi_job['id'], [s.strip() for s in wi_skills.split(",") if s.strip()], wi_exp, wi_pubs,
+                          wi_degree.strip() or None)
+    m1, m2 = st.columns(2)
+    m1.metric("Eligible with these criteria", f"{'≥ ' if sim['approximate'] else ''}{sim['eligible']} / {sim['total']}",
+              delta=sim['eligible'] - wi_current['eligible'])
+    m2.metric("Eligible with the current criteria", f"{wi_current['eligible']} / {wi_current['total']}")
+    st.table([{"Requirement": c['constraint'] + (" *" if c['approximate'] else ""),
+               "Applicants meeting it": f"≥ {c['meet']}" if c['approximate'] else c['meet'],
+               "Eligible if dropped": c['eligible_without']} for c in sim['constraints']])
+    if sim['approximate']:
+        st.warning("* Resumes were not searched for these skills at screening (they are not among the job's skills), "
+                   "so applicants may be missed: counts for them are lower bounds, as is the eligible total. "
+                   "Save the criteria to re-screen the applications for exact numbers.")
+    st.caption(f"Answered in {sim['elapsed_ms']:.1f} ms from the in-memory index of screened applications.")
+
+st.markdown("---")
+
+# ===== BULK UPLOAD / SCREENING =====
+st.header("Bulk Upload Resumes")
+active_jobs = [j for j in db.get_jobs() if j.get('status') != 'archived']
+if not active_jobs:
+    st.info("Create a job first.")
+else:
+    bulk_labels = [f"{j['id']} - {j['title']}" for j in active_jobs]
+    bulk_ids = [j['id'] for j in active_jobs]
+    pre = st.session_state.get('bulk_upload_job')
+    bulk_idx = bulk_ids.index(pre) if pre in bulk_ids else 0
+    with st.form("bulk_upload_form"):
+        bulk_job = st.selectbox("Job", options=bulk_labels, index=bulk_idx)
+        bulk_files = st.file_uploader("Resumes (PDF/DOCX)", type=["pdf", "docx"], accept_multiple_files=True)
+        bulk_folder = st.text_input("...or a folder on the server containing resumes (optional)")
+        bulk_triage = st.checkbox("Fast triage (stop at the first unmet requirement; rejections are explained on demand)",
+                                  value=False)
+        bulk_start = st.form_submit_button("Start screening")
+        if bulk_start:
+            bulk_job_id = int(bulk_job.split(" - ")[0])
+            bulk_paths, bulk_names, bulk_errors = ingestion.save_uploaded_files(bulk_files)
+            for err in bulk_errors:
+                st.error(err)
+            if bulk_folder.strip():
+                if os.path.isdir(bulk_folder.strip()):
+                    bulk_paths += ingestion.collect_folder(bulk_folder.strip())
+                else:
+                    st.error("Folder not found on server.")
+            if not bulk_paths:
+                st.error("No resumes selected.")
+            else:
+                task = ingestion.start_ingestion(bulk_job_id, bulk_paths, names=bulk_names,
+                                                 mode="triage" if bulk_triage else "full")
+                st.session_state['bulk_task_id'] = task.id
+                st.success(f"Screening {len(bulk_paths)} resumes in the background.")
+
+    bulk_task = tasks.get_task(st.session_state.get('bulk_task_id')) if st.session_state.get('bulk_task_id') else None
+    if bulk_task:
+        snap = bulk_task.snapshot()
+        st.progress(snap['progress'])
+        st.write(f"Status: **{snap['status']}** — {snap['done']} / {snap['total']} files processed. {snap['message']}")
+        cb1, cb2 = st.columns(2)
+        with cb1:
+            if not bulk_task.finished and st.button("Cancel screening"):
+                bulk_task.cancel()
+                st.warning("Cancelling — chunks already running will finish first.")
+        with cb2:
+            st.button("Refresh progress")
+        if snap['result']:
+            r = snap['result']
+            st.success(f"Inserted {r['inserted']} applications ({r['eligible']} eligible), {r['failed']} failed, {r['skipped_capacity']} skipped (job full).")
+        if snap['error']:
+            st.error(f"Screening failed: {snap['error'].splitlines()[0]}")
+        if snap['failures']:
+            with st.expander(f"Failed files ({len(snap['failures'])})"):
+                for f in snap['failures']:
+                    st.write(f"- {f['item']}: {f['reason']}")
+    tcs = resume_parser.text_cache_stats()
+    pcs = resume_parser.profile_cache_stats()
+    st.caption(f"Extracted-text cache: {tcs['bytes'] // 1024} KB on disk, {tcs['hits']} hits / {tcs['misses']} misses this process. "
+               f"Resume profile cache: {pcs['bytes'] // 1024} KB, {pcs['hits']} hits / {pcs['misses']} misses.")
+
+    # submits that hit the latency budget are normally completed right away in
+    # the background; this picks up any left behind (e.g. by a restart)
+    partial_ids = db.get_partial_application_ids()
+    running = [t for t in tasks.list_tasks("complete_screening") if not t.finished]
+    if partial_ids and not running:
+        if st.button(f"Complete {len(partial_ids)} partially screened applications"):
+            ingestion.start_completion(partial_ids)
+            st.success("Completing partial screenings in the background.")
+    elif running:
+        snap = running[0].snapshot()
+        st.caption(f"Completing partial screenings: {snap['done']}/{snap['total']}")
+
+    # results screened by an older parser / synonym table / scoring version
+    stale = rescreen.count_stale()
+    rs_running = [t for t in tasks.list_tasks("rescreen") if not t.finished]
+    if rs_running:
+        snap = rs_running[0].snapshot()
+        st.progress(snap['progress'])
+        st.caption(f"Re-screening outdated applications: {snap['done']}/{snap['total']} {snap['message']}")
+    elif stale:
+        if st.button(f"Re-screen {stale}{'+' if stale >= 1000 else ''} outdated applications"):
+            rescreen.start_rescreen()
+            st.success("Re-screening outdated applications in the background.")
+
+    # content-addressed resume store; cold files are compressed in the background
+    uploads_store.maybe_start_compaction()
+    bs = uploads_store.stats()
+    st.caption(f"Resume store: {bs['blobs']} files, {bs['bytes'] // 1024} KB of resumes in {bs['stored_bytes'] // 1024} KB on disk; "
+               f"{bs['compression_saved_bytes'] // 1024} KB saved by compressing {bs['compressed']} archived/old files, "
+               f"{bs['dedup_bytes'] // 1024} KB by deduplication; {bs['unreferenced']} unreferenced.")
+    comp_running = [t for t in tasks.list_tasks("uploads_compaction") if not t.finished]
+    if comp_running:
+        snap = comp_running[0].snapshot()
+        st.caption(f"Compressing archived/old resumes: {snap['done']}/{snap['total']} {snap['message']}")
+    sc1, sc2 = st.columns(2)
+    with sc1:
+        if bs['unreferenced'] and st.button("Remove unreferenced resume files"):
+            n, freed = uploads_store.collect_garbage()
+            st.success(f"Removed {n} files ({freed // 1024} KB).")
+    with sc2:
+        legacy = uploads_store.count_legacy()
+        mig_running = [t for t in tasks.list_tasks("uploads_migration") if not t.finished]
+        if mig_running:
+            snap = mig_running[0].snapshot()
+            st.caption(f"Moving old uploads into the store: {snap['done']}/{snap['total']}")
+        elif legacy and st.button(f"Move {legacy} old uploads into the store"):
+            uploads_store.start_migration()
+            st.success("Moving old uploads in the background.")
+
+st.markdown("---")
+
 # ===== Manage Applications — Filters + Table + Expandable Cards (two-tab detail) =====
 st.header("Manage Applications")
 # Filters
@@ -195,6 +445,8 @@ else:
     # all jobs (include archived to allow admin actions)
     for j in jobs_all:
         apps += db.get_applications_by_job(j['id'], include_archived=True)
+# bring rows screened by older versions up to date (the rest go to the background task)
+apps = rescreen.refresh_for_view(apps)
 
 # apply filters
 def app_matches(a):
@@ -252,14 +504,20 @@ if filtered:
             col1, col2, col3 = st.columns([3,1,2])
             with col1:
                 st.markdown(f"**Status:** `{a['status']}`   |   **Eligible:** `{bool(a.get('eligible'))}`")
-                st.markdown(f"**Score:** {a.get('score')}")
+                st.markdown(f"**Score:** {a.get('score') if a.get('score') is not None else '— (not scored yet)'}")
                 st.markdown(f"**Email:** {a.get('email') or parsed.get('email')}")
                 st.markdown(f"**Phone:** {a.get('phone') or parsed.get('phone')}")
             with col2:
-                if os.path.exists(a['resume_path']):
-                    st.markdown(f"[Download Resume]({a['resume_path']})")
-                else:
+                # read (and decompressed, for cold-tier files) only when asked for
+                if not (uploads_store.exists(a['resume_sha256']) if a.get('resume_sha256') else os.path.exists(a['resume_path'] or "")):
                     st.write("Resume not found")
+                elif st.button("Prepare resume download", key=f"resume_{a['id']}"):
+                    resume_bytes = uploads_store.read_resume(a)
+                    if resume_bytes is None:
+                        st.write("Resume not found")
+                    else:
+                        st.download_button("Download Resume", data=resume_bytes, file_name=uploads_store.display_name(a),
+                                           key=f"resume_dl_{a['id']}")
                 # generate candidate PDF report
                 if st.button("Download Candidate PDF", key=f"candpdf_{a['id']}"):
                     # create simple PDF in reports folder
@@ -321,6 +579,13 @@ if filtered:
                 st.subheader("Overview")
                 st.markdown("**Eligibility & Match Info**")
                 mi = parsed.get('match_info', {})
+                if mi.get('triage'):
+                    st.caption("Screened in triage mode: checking stopped at the first unmet requirement, "
+                               "so the application is not scored until explained in full.")
+                    if st.button("Explain in full", key=f"explain_{a['id']}"):
+                        a = rescreen.explain_application(a, jobinfo)
+                        parsed = json.loads(a['parsed_json']) if a['parsed_json'] else {}
+                        mi = parsed.get('match_info', {})
                 if mi:
                     # degree
                     if mi.get('degree'):
@@ -1,7 +1,8 @@
 # pages/3_Candidate_Portal.py
 import streamlit as st
-from backend import db, resume_parser, eligibility, scoring
-import os, json, time
+from backend import db, resume_parser, ingestion, uploads_store, scoring
+from backend.deadline import Deadline
+import json
 
 st.set_page_config(page_title="Candidate Portal")
 db.init_db()
@@ -64,61 +65,82 @@ if 'show_apply_form' in st.session_state and st.session_state['show_apply_form']
             if not name or not resume:
                 st.error("⚠️ Please fill your name and upload your resume.")
             else:
-                save_path = os.path.join(db.UPLOADS_DIR, f"{int(time.time())}_{resume.name}")
-                with open(save_path, "wb") as out:
-                    out.write(resume.getbuffer())
+                # one latency budget for the whole submit; anything that doesn't
+                # fit is finished in the background
+                deadline = Deadline(ingestion.SUBMIT_SLO_S)
+                # hashed in memory, written only if new (by content hash) and read
+                # straight from the upload buffer; a resume submitted before is
+                # neither stored nor parsed again
+                app_id = None
                 try:
-                    app_id = db.insert_application(name, email, phone, selected_job_id, save_path)
+                    resume_sha, save_path, resume_buf = uploads_store.put_upload(resume)
                 except ValueError as e:
-                    st.error(str(e))
-                    try:
-                        os.remove(save_path)
-                    except:
-                        pass
+                    st.error(f"⚠️ {e}")
                 else:
+                    # read the resume (sandboxed) before creating the application
+                    profile = resume_parser.build_profile(resume_buf, budget_s=deadline, sha256=resume_sha)
+                    # a deferred profile (extraction out of budget) is applied and finished in the background
+                    if not profile.ok and not profile.deferred:
+                        st.error(f"⚠️ We could not read your resume: {profile.extraction['message']}")
+                    else:
+                        try:
+                            app_id = db.insert_application(name, email, phone, selected_job_id, save_path,
+                                                           resume_sha256=resume_sha, resume_name=resume.name)
+                        except ValueError as e:
+                            st.error(str(e))
+                if app_id is not None:
                     # Call parser with job skills and debug ON (for now)
                     crit = json.loads(job['criteria']) if job['criteria'] else {}
-                    job_skill_list = crit.get('required_skills', []) + crit.get('optional_skills', [])
-                    parsed = resume_parser.parse_resume(save_path, job_skills=job_skill_list, extra_synonyms=None, debug=True)
-                    eligible, reasons, match_info = eligibility.check_eligibility(parsed, crit, debug=True)
-                    score = scoring.compute_score(parsed, crit, match_info)
-                    parsed_with_match = parsed.copy()
-                    parsed_with_match['match_info'] = match_info
-                    db.update_application_parsed(app_id, parsed_with_match, eligible, score)
+                    parsed, eligible, reasons, score = ingestion.screen_profile(profile, crit, budget_s=deadline, debug=True,
+                                                                                 weights=scoring.job_weights(job))
+                    match_info = parsed['match_info']
+                    db.update_application_parsed(app_id, parsed, eligible, score,
+                                                 status='received' if profile.deferred else None,
+                                                 criteria_version=job.get('criteria_version'))
+                    if parsed.get("partial"):
+                        ingestion.start_completion([app_id])
 
                     st.success(f"Application ID: {app_id}")
-                    st.markdown(f"**Auto-screen result:** {'✅ Eligible' if eligible else '❌ Not Eligible'}  — **Score:** {score}")
-                    if reasons:
-                        st.warning("⚠️ Reasons for non-eligibility:")
-                        for r in reasons:
-                            st.write("- " + r)
+                    if profile.deferred:
+                        st.info("Your resume is taking longer than usual to read. It will be screened in the "
+                                "background; check back shortly for the result.")
+                    else:
+                        if parsed.get("partial"):
+                            st.info("Your resume is still being analysed in detail; the result below may improve shortly.")
+                        if parsed.get("extraction", {}).get("truncated"):
+                            st.info("Your resume is very long; only the first part was screened automatically.")
+                        st.markdown(f"**Auto-screen result:** {'✅ Eligible' if eligible else '❌ Not Eligible'}  — **Score:** {score}")
+                        if reasons:
+                            st.warning("⚠️ Reasons for non-eligibility:")
+                            for r in reasons:
+                                st.write("- " + r)
 
-                    st.markdown("**Match details:**")
-                    deg_info = match_info.get("degree", {})
-                    if deg_info:
-                        st.write("**Degree Matching**")
-                        if deg_info.get("required"):
-                            if deg_info.get("matched"):
-                                st.write(f"- Required degree `{deg_info.get('required')}` matched with `{deg_info.get('matched_with')}` (method: {deg_info.get('method')}, score: {deg_info.get('score')})")
+                        st.markdown("**Match details:**")
+                        deg_info = match_info.get("degree", {})
+                        if deg_info:
+                            st.write("**Degree Matching**")
+                            if deg_info.get("required"):
+                                if deg_info.get("matched"):
+                                    st.write(f"- Required degree `{deg_info.get('required')}` matched with `{deg_info.get('matched_with')}` (method: {deg_info.get('method')}, score: {deg_info.get('score')})")
+                                else:
+                                    st.write(f"- Required degree `{deg_info.get('required')}` NOT matched")
                             else:
-                                st.write(f"- Required degree `{deg_info.get('required')}` NOT matched")
-                        else:
-                            st.write("- No required degree for this job")
+                                st.write("- No required degree for this job")
 
-                    if match_info.get("matched_required"):
-                        st.write("**Matched Required Skills:**")
-                        for k,v in match_info["matched_required"].items():
-                            st.write(f"- {k} → matched with '{v.get('matched_with')}' (score {v.get('score')})")
-                    if match_info.get("missing_required"):
-                        st.write("**Missing Required Skills:**")
-                        for m in match_info["missing_required"]:
-                            st.write(f"- {m}")
+                        if match_info.get("matched_required"):
+                            st.write("**Matched Required Skills:**")
+                            for k,v in match_info["matched_required"].items():
+                                st.write(f"- {k} → matched with '{v.get('matched_with')}' (score {v.get('score')})")
+                        if match_info.get("missing_required"):
+                            st.write("**Missing Required Skills:**")
+                            for m in match_info["missing_required"]:
+                                st.write(f"- {m}")
 
-                    if match_info.get("matched_optional"):
-                        st.write("**Matched Optional Skills (bonus):**")
-                        for k,v in match_info["matched_optional"].items():
-                            st.write(f"- {k} → matched with '{v.get('matched_with')}' (score {v.get('score')})")
-                    st.write(f"Optional skill bonus count: {match_info.get('optional_bonus_count',0)}")
+                        if match_info.get("matched_optional"):
+                            st.write("**Matched Optional Skills (bonus):**")
+                            for k,v in match_info["matched_optional"].items():
+                                st.write(f"- {k} → matched with '{v.get('matched_with')}' (score {v.get('score')})")
+                        st.write(f"Optional skill bonus count: {match_info.get('optional_bonus_count',0)}")
 
     if st.button("🔙 Back to Job List"):
         st.session_state['show_apply_form'] = False
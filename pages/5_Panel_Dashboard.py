@@ -1,7 +1,6 @@
 import streamlit as st
-from backend import db
+from backend import db, uploads_store
 import json
-import os
 import mimetypes
 
 st.set_page_config(page_title="Panel Evaluation")
@@ -44,18 +43,19 @@ if job_id:
             st.markdown(f"**Experience (yrs)**: {parsed.get('experience_years')}")
             st.markdown(f"**Publications:** {parsed.get('publications')}")
             st.markdown(f"**Skills:** {', '.join(parsed.get('skills', []))}")
-            # Resume download using st.download_button (safe for deployed apps)
-            resume_path = a.get("resume_path")
-            if resume_path and os.path.exists(resume_path):
-                mime_type, _ = mimetypes.guess_type(resume_path)
+            # Resume download using st.download_button (safe for deployed apps);
+            # decompressed on demand if the file is in the cold storage tier
+            resume_bytes = uploads_store.read_resume(a)
+            if resume_bytes is not None:
+                file_name = uploads_store.display_name(a)
+                mime_type, _ = mimetypes.guess_type(file_name)
                 mime_type = mime_type or "application/octet-stream"
-                with open(resume_path, "rb") as fh:
-                    st.download_button(
-                        label="Download resume",
-                        data=fh.read(),
-                        file_name=os.path.basename(resume_path),
-                        mime=mime_type,
-                    )
+                st.download_button(
+                    label="Download resume",
+                    data=resume_bytes,
+                    file_name=file_name,
+                    mime=mime_type,
+                )
             else:
                 st.markdown("Resume file missing or unavailable.")
 
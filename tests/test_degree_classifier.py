@@ -0,0 +1,115 @@
+"""
+Parity of the single-pass degree classifier (eligibility._classify_degree) and
+the memoized subject matcher with the implementations they replaced, kept
+below as references: one word-boundary regex per DEGREE_LEVELS key followed by
+the master / bachelor / doctor heuristics, and extractOne over the normalized
+degree phrases.
+
+Run from the repository root: python -m pytest tests
+"""
+import itertools
+import re
+
+import pytest
+from rapidfuzz import process, fuzz
+
+from backend import eligibility
+from backend.eligibility import DEGREE_LEVELS, FUZZY_THRESHOLD, _normalize_text, _degree_subtokens
+
+# ---------- references (the previous implementation) ----------
+_LEGACY_LEVEL_RES = [(re.compile(r'\b' + re.escape(key) + r'\b'), lvl) for key, lvl in DEGREE_LEVELS.items()]
+_LEGACY_MASTER_RE = re.compile(r'\b(m(\.?)tech|master|ms|m.sc|m\.?e)\b')
+_LEGACY_BACHELOR_RE = re.compile(r'\b(b(\.?)tech|btech|bachelor|b\.?des|bdes|b\.?sc)\b')
+_LEGACY_DOCTOR_RE = re.compile(r'\b(ph\.?|phd|doctor)\b')
+
+
+def legacy_degree_level(s):
+    if not s:
+        return 0
+    t = _normalize_text(s)
+    for pattern, lvl in _LEGACY_LEVEL_RES:
+        if pattern.search(t):
+            return lvl
+    if _LEGACY_MASTER_RE.search(t):
+        return 2
+    if _LEGACY_BACHELOR_RE.search(t):
+        return 1
+    if _LEGACY_DOCTOR_RE.search(t):
+        return 3
+    return 0
+
+
+def legacy_subject_matches(req_subject, parsed_degrees_list, allow_fuzzy=True, req_subtokens=None):
+    if req_subtokens is None:
+        req_subtokens = _degree_subtokens(req_subject)
+    parsed_norm = [_normalize_text(d) for d in (parsed_degrees_list or [])]
+    for d_orig, d_norm in zip(parsed_degrees_list or [], parsed_norm):
+        for req_sub in req_subtokens:
+            if req_sub and (req_sub in d_norm or d_norm in req_sub):
+                return True, d_orig, 100.0, "exact"
+    if parsed_norm and req_subtokens and not allow_fuzzy:
+        if any(len(req_sub) >= 3 for req_sub in req_subtokens):
+            return False, None, 0.0, "deadline"
+    elif parsed_norm and req_subtokens:
+        for req_sub in req_subtokens:
+            if len(req_sub) < 3:
+                continue
+            best = process.extractOne(req_sub, parsed_norm, scorer=fuzz.partial_ratio)
+            if best and best[1] >= FUZZY_THRESHOLD:
+                for d_orig, d_norm in zip(parsed_degrees_list or [], parsed_norm):
+                    if d_norm == best[0]:
+                        return True, d_orig, float(best[1]), "fuzzy"
+    return False, None, 0.0, "none"
+
+
+# ---------- corpus ----------
+DEGREES = [
+    "", None, "   ",
+    "Ph.D. in Computer Science", "PhD (pursuing)", "Ph. D", "ph.d", "Doctor of Philosophy", "Doctorate",
+    "Post-doctoral fellow", "M.Tech Mechanical Engineering", "M.Tech.", "m tech", "MTech (CSE)",
+    "M.E. Electrical", "ME", "M.E", "MS in Data Science", "ms", "M.Sc Physics", "MSc", "m.sc.",
+    "Master of Science", "Masters in Design", "MBA", "MCA", "M.Phil", "B.Tech in Computer Science",
+    "B.Tech.", "BTech CSE", "B.E. Mechanical", "BE", "B.E", "B.Sc (Hons) Mathematics", "BSc", "b.sc.",
+    "B.Des", "BDes Communication Design", "b des", "Bachelor of Engineering", "Bachelors",
+    "BCA", "Diploma in Electrical", "Higher Secondary (CBSE)", "Class XII", "mechanical engineering",
+    "computer science engineering", "EEE", "B.Tech + M.Tech dual degree", "BSc and MSc", "MSc / PhD",
+    "M.S.", "me, myself", "Some degree", "Member of IEEE", "Messrs & Co.", "B.Tech (2016-2020), GPA 8.1",
+    "PhD, M.Tech, B.Tech", "Bachelor + Master", "doctoral student", "phd-candidate", "M.Sc.(Tech)",
+]
+# every level key alone and in pairs, so the priority between keys is exercised
+DEGREES += list(DEGREE_LEVELS)
+DEGREES += [f"{a} {b}" for a, b in itertools.permutations(DEGREE_LEVELS, 2)]
+
+REQUIRED_SUBJECTS = [
+    "", "M.Tech Mechanical Engineering", "B.Tech Computer Science", "M.Tech", "B.Des", "Electrical Engineering",
+    "PhD Physics", "Master of Design", "B.E. Civil", "MSc Chemistry", "m", "ai",
+]
+
+DEGREE_LISTS = [
+    [], [""], ["B.Tech in Computer Science"], ["M.Tech Mechanical Engineering", "B.E. Mechanical"],
+    ["B.Sc Physics", "M.Sc Physics", "PhD Physics"], ["BDes Communication Design"], ["Diploma in Electrical"],
+    ["MS in Data Science", "BTech CSE"], ["Mechanica engg"], ["Civil Enginering", "Chemstry"],
+    ["B.Tech", "B.Tech"], ["EEE", "electrical engg"], ["Master of Design", "bachelor of design"],
+    ["B.Tech Mechancal", "M.Tech Mechanicl"], ["Computr Sci", "Physcs"], ["Electrcal Engg", "Chemistri"],
+]
+
+
+@pytest.mark.parametrize("degree", DEGREES)
+def test_degree_level_matches_legacy(degree):
+    assert eligibility._get_degree_level_from_string(degree) == legacy_degree_level(degree)
+
+
+@pytest.mark.parametrize("degree", [d for d in DEGREES if d])
+def test_classify_degree_normalizes_like_legacy(degree):
+    assert eligibility._classify_degree(degree)[0] == _normalize_text(degree)
+
+
+@pytest.mark.parametrize("allow_fuzzy", [True, False])
+@pytest.mark.parametrize("req_subject", REQUIRED_SUBJECTS)
+def test_subject_matches_matches_legacy(req_subject, allow_fuzzy):
+    for degrees in DEGREE_LISTS:
+        expected = legacy_subject_matches(req_subject, degrees, allow_fuzzy)
+        assert eligibility._subject_matches(req_subject, degrees, allow_fuzzy) == expected, degrees
+        # the per-job precomputed tokens give the same answer
+        subtokens = tuple(_degree_subtokens(req_subject))
+        assert eligibility._subject_matches(req_subject, degrees, allow_fuzzy, req_subtokens=subtokens) == expected
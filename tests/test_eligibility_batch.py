@@ -0,0 +1,136 @@
+"""
+Parity of eligibility.check_eligibility_batch (one rapidfuzz cdist per chunk of
+candidates) with check_eligibility run candidate by candidate (extractOne per
+skill variant), in "full" and "triage" mode, over a generated corpus: typo'd
+skills, c++ / c# style tokens, blacklisted tokens, missing degrees, empty or
+missing skill lists, and parses that make the check raise.
+
+Run from the repository root: python -m pytest tests
+"""
+import random
+
+import pytest
+
+from backend import eligibility
+from backend.eligibility import check_eligibility, check_eligibility_batch
+
+SKILLS = [
+    "python", "java", "javascript", "c++", "c#", "c", "go", "rust", "machine learning", "deep learning",
+    "tensorflow", "pytorch", "react", "node.js", ".net", "sql", "mysql", "docker", "kubernetes", "aws",
+    "matlab", "autocad", "solidworks", "ansys", "verilog", "vhdl", "embedded c", "data structures",
+    "algorithms", "figma", "photoshop", "excel", "git", "linux", "ci/cd", "objective-c",
+]
+NOISE = ["team player", "cbse", "class", "school", "communication", "leadership", "b", "x", "r&d", "c/c++",
+         "c + +", "c sharp", "f#", "ml", "ai", "js", "nodejs", "py"]
+DEGREES = [
+    "B.Tech in Computer Science", "M.Tech Mechanical Engineering", "PhD Physics", "B.E. Electrical",
+    "M.Sc Computer Science", "BDes Communication Design", "Diploma in Electrical", "MBA", "B.Sc Mathematics",
+    "Mechanical Enginering", "Ph.D", "",
+]
+JOBS = [
+    {"required_skills": ["python", "machine learning"], "optional_skills": ["pytorch", "docker"],
+     "min_experience": 2, "min_publications": 0, "required_degree": "M.Tech Computer Science"},
+    {"required_skills": ["c++", "c#"], "optional_skills": ["embedded c", ".net"], "min_experience": 0,
+     "min_publications": 0, "required_degree": None},
+    {"required_skills": ["solidworks", "ansys"], "optional_skills": ["autocad", "matlab"], "min_experience": 1,
+     "min_publications": 1, "required_degree": "M.Tech Mechanical Engineering"},
+    {"required_skills": ["javascrpt", "reactt"], "optional_skills": ["node.js", "figma"], "min_experience": 0,
+     "min_publications": 0, "required_degree": "B.Tech"},
+    {"required_skills": [], "optional_skills": [], "min_experience": 3, "min_publications": 2,
+     "required_degree": "PhD"},
+    {"required_skills": ["verilog", "vhdl", "data structures"], "optional_skills": ["algorithms", "linux"],
+     "min_experience": 0, "min_publications": 0, "required_degree": "Electrical Engineering"},
+    {"required_skills": ["kubernetes", "ci/cd", "aws"], "optional_skills": ["objective-c", "go", "rust"],
+     "min_experience": 0, "min_publications": 0},
+    {"required_skills": ["class", "excel"], "optional_skills": ["photoshop"], "required_degree": "B.Des"},
+]
+
+
+def _typo(rng, word):
+    """word with one random deletion, swap, duplication or substitution (sometimes unchanged)."""
+    if len(word) < 3 or rng.random() < 0.4:
+        return word
+    i = rng.randrange(len(word) - 1)
+    op = rng.randrange(4)
+    if op == 0:
+        return word[:i] + word[i + 1:]
+    if op == 1:
+        return word[:i] + word[i + 1] + word[i] + word[i + 2:]
+    if op == 2:
+        return word[:i] + word[i] + word[i:]
+    return word[:i] + rng.choice("abcdefghijklmnopqrstuvwxyz+#") + word[i + 1:]
+
+
+def _parse(rng):
+    shape = rng.random()
+    parsed = {"experience_years": rng.choice([0, 0.5, 1, 2, 3, 5, 10]), "publications": rng.choice([0, 1, 2, 4])}
+    if shape < 0.05:
+        parsed["skills"] = []
+    elif shape < 0.08:
+        parsed["skills"] = None
+    elif shape < 0.1:
+        pass  # no skills key at all
+    else:
+        n = rng.randrange(1, 30)
+        parsed["skills"] = [_typo(rng, rng.choice(SKILLS)) if rng.random() < 0.75 else rng.choice(NOISE)
+                            for _ in range(n)]
+    if rng.random() < 0.15:
+        parsed["degrees"] = []
+    elif rng.random() < 0.1:
+        pass  # no degrees key
+    else:
+        parsed["degrees"] = rng.sample(DEGREES, rng.randrange(1, 3))
+    return parsed
+
+
+def _corpus(n=400, seed=44):
+    rng = random.Random(seed)
+    parses = [_parse(rng) for _ in range(n)]
+    # parses the check can't handle: failing while compacting skills, while
+    # evaluating the degree, and not a dict at all
+    parses[7] = {"skills": 5}
+    parses[101] = {"skills": ["python"], "degrees": 7}
+    parses[250] = None
+    return parses
+
+
+CORPUS = _corpus()
+
+
+def _single(parsed, criteria, mode):
+    try:
+        return check_eligibility(parsed, criteria, mode=mode)
+    except Exception as e:
+        return e
+
+
+@pytest.mark.parametrize("chunk", [eligibility.BATCH_CHUNK, 37])
+@pytest.mark.parametrize("mode", eligibility.MODES)
+@pytest.mark.parametrize("criteria", JOBS, ids=[f"job{i}" for i in range(len(JOBS))])
+def test_batch_matches_per_candidate(criteria, mode, chunk, monkeypatch):
+    monkeypatch.setattr(eligibility, "BATCH_CHUNK", chunk)
+    batch = check_eligibility_batch(CORPUS, criteria, mode=mode, workers=1)
+    assert len(batch) == len(CORPUS)
+    for i, (parsed, got) in enumerate(zip(CORPUS, batch)):
+        expected = _single(parsed, criteria, mode)
+        if isinstance(expected, Exception):
+            # the batch keeps the failure in the candidate's slot
+            assert type(got) is type(expected), i
+        else:
+            assert got == expected, (i, parsed)
+
+
+def test_corpus_exercises_fuzzy_and_failures():
+    """Guard against a corpus that no longer reaches the fuzzy path or the per-candidate failures."""
+    methods = set()
+    failures = 0
+    for criteria in JOBS:
+        for got in check_eligibility_batch(CORPUS, criteria, workers=1):
+            if isinstance(got, Exception):
+                failures += 1
+                continue
+            info = got[2]
+            methods.update(m["method"] for m in info["matched_required"].values())
+            methods.update(m["method"] for m in info["matched_optional"].values())
+    assert {"exact", "fuzzy", "loose_substr"} <= methods
+    assert failures == 3 * len(JOBS)
@@ -0,0 +1,149 @@
+"""
+The fuzzy prefilter (eligibility._FuzzyIndex, used for candidates with at least
+PREFILTER_MIN_TOKENS skill tokens) only skips tokens that can't reach
+FUZZY_THRESHOLD, so it must not change any match; it must also send fewer
+tokens to rapidfuzz than a full scan.
+
+check_eligibility is compared with the prefilter on and off (PREFILTER_MIN_TOKENS
+set out of reach). Parsed tokens are normalized to [a-z0-9+#] before they get
+there, so _FuzzyIndex is also checked directly on raw tokens with characters
+outside _CHAR_ALPHABET (they share its last count column) and on ties, at
+several thresholds.
+
+Run from the repository root: python -m pytest tests
+"""
+import random
+
+import pytest
+from rapidfuzz import process, fuzz
+
+from backend import eligibility
+from backend.eligibility import check_eligibility, _FuzzyIndex, _FuzzyVariants
+
+SKILLS = [
+    "python", "java", "javascript", "typescript", "machine learning", "deep learning", "tensorflow", "pytorch",
+    "kubernetes", "docker", "solidworks", "autocad", "ansys", "matlab", "verilog", "embedded systems",
+    "data structures", "algorithms", "photoshop", "illustrator", "postgresql", "mongodb", "react native",
+]
+NOISE = ["communication", "leadership", "teamwork", "c++", "c#", "r&d", "ms office", "cbse", "class", "x"]
+# every candidate meets the degree and thresholds, so triage mode reaches the skills too
+DEGREE = "B.Tech Computer Science"
+JOBS = [
+    {"required_skills": ["python", "machine learning"], "optional_skills": ["pytorch", "tensorflow", "docker"]},
+    {"required_skills": ["solidworks", "ansys"], "optional_skills": ["autocad", "matlab"]},
+    {"required_skills": ["javascrpt", "react native", "postgres"], "optional_skills": ["typescript", "mongodb"]},
+    {"required_skills": ["verilog", "embedded system"], "optional_skills": ["data structure", "algorithm"]},
+    {"required_skills": ["photoshop", "class"], "optional_skills": ["illustrator", "communication"]},
+]
+JOBS = [dict(job, required_degree=DEGREE) for job in JOBS]
+
+
+def _typo(rng, word):
+    """word with one random edit (sometimes unchanged)."""
+    if len(word) < 3 or rng.random() < 0.3:
+        return word
+    i = rng.randrange(len(word) - 1)
+    op = rng.randrange(4)
+    if op == 0:
+        return word[:i] + word[i + 1:]
+    if op == 1:
+        return word[:i] + word[i + 1] + word[i] + word[i + 2:]
+    if op == 2:
+        return word[:i] + word[i] + word[i:]
+    return word[:i] + rng.choice("abcdefghijklmnopqrstuvwxyz0123456789") + word[i + 1:]
+
+
+def _corpus(n=300, seed=45):
+    rng = random.Random(seed)
+    parses = []
+    for _ in range(n):
+        skills = [_typo(rng, rng.choice(SKILLS)) if rng.random() < 0.6 else rng.choice(NOISE)
+                  for _ in range(rng.randrange(eligibility.PREFILTER_MIN_TOKENS, 60))]
+        parses.append({"skills": skills, "degrees": [DEGREE], "experience_years": 5, "publications": 5})
+    return parses
+
+
+CORPUS = _corpus()
+
+
+class _CountingExtractOne:
+    """process.extractOne that counts the choices it compares against."""
+
+    def __init__(self):
+        self.compared = 0
+
+    def __call__(self, query, choices, **kwargs):
+        choices = list(choices)
+        self.compared += len(choices)
+        return _EXTRACT_ONE(query, choices, **kwargs)
+
+
+_EXTRACT_ONE = process.extractOne
+
+
+def _run(criteria, mode):
+    return [check_eligibility(p, criteria, mode=mode) for p in CORPUS]
+
+
+@pytest.mark.parametrize("mode", eligibility.MODES)
+@pytest.mark.parametrize("criteria", JOBS, ids=[f"job{i}" for i in range(len(JOBS))])
+def test_prefilter_keeps_matches_and_compares_less(criteria, mode, monkeypatch):
+    counter = _CountingExtractOne()
+    monkeypatch.setattr(process, "extractOne", counter)
+    filtered = _run(criteria, mode)
+    compared_filtered = counter.compared
+
+    counter.compared = 0
+    monkeypatch.setattr(eligibility, "PREFILTER_MIN_TOKENS", 10 ** 9)
+    scanned = _run(criteria, mode)
+    compared_scanned = counter.compared
+
+    for i, (got, expected) in enumerate(zip(filtered, scanned)):
+        assert got == expected, (i, CORPUS[i]["skills"])
+    assert compared_scanned > 0
+    # the bound should skip most tokens, not just a few
+    assert compared_filtered * 2 <= compared_scanned
+
+
+def test_corpus_reaches_fuzzy_matches():
+    """Guard against a corpus that no longer exercises the fuzzy path the prefilter sits in."""
+    methods = set()
+    for criteria in JOBS:
+        for _eligible, _reasons, info in _run(criteria, "full"):
+            methods.update(m["method"] for m in info["matched_required"].values())
+            methods.update(m["method"] for m in info["matched_optional"].values())
+    assert "fuzzy" in methods
+
+
+VARIANTS = ["python", "machinelearning", "solidworks", "c++builder", "objc#", "postgresql"]
+RAW_TOKENS = [
+    # outside the alphabet: accents, punctuation, symbols, non-Latin scripts
+    "pythön", "pyth-on", "py_thon", "pytho/n", "machine-learning", "machïnelearning", "sölidworks",
+    "solid_works", "c++bυilder", "c++-builder", "objc♯", "obj-c#", "postgre§ql", "пайтон", "機械学習", "",
+    # ties: several tokens reaching the same best score, the first must win
+    "xpython", "pythonx", "python3", "python", "python", "solidworksx", "xsolidworks",
+    # near misses and unrelated tokens
+    "pyton", "pthon", "machinlearning", "learning", "machine", "works", "solid", "sql", "postgres",
+    "c++", "builder", "objc", "aaaaaaa", "zzzz", "0123456789",
+]
+
+
+@pytest.mark.parametrize("threshold", sorted({eligibility.FUZZY_THRESHOLD, 50, 70, 90, 100}))
+@pytest.mark.parametrize("seed", range(20))
+def test_index_matches_full_scan_on_raw_tokens(threshold, seed, monkeypatch):
+    monkeypatch.setattr(eligibility, "FUZZY_THRESHOLD", threshold)
+    rng = random.Random(seed)
+    tokens = rng.sample(RAW_TOKENS, rng.randrange(eligibility.PREFILTER_MIN_TOKENS, len(RAW_TOKENS) + 1))
+    index = _FuzzyIndex(tokens, _FuzzyVariants(VARIANTS))
+    for variant in VARIANTS:
+        kept = set(index.candidates(variant))
+        # only tokens that can't reach the threshold are skipped
+        for i, token in enumerate(tokens):
+            if fuzz.partial_ratio(variant, token) >= threshold:
+                assert i in kept, (variant, token)
+        full = process.extractOne(variant, tokens, scorer=fuzz.partial_ratio)
+        got = index.best(variant)
+        if full and full[1] >= threshold:
+            assert got == full, variant
+        else:
+            assert got is None or got[1] < threshold, variant